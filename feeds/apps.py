@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class FeedsConfig(AppConfig):
     name = 'feeds'
+
+    def ready(self) -> None:
+        """
+        Connect signal receivers of feeds.
+        """
+        from feeds import signals  # noqa: F401
@@ -0,0 +1,125 @@
+from pathlib import Path
+from typing import Any, Tuple
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser
+)
+
+from feeds.models import FeedSubscription
+from feeds.utils.feedbenchmark import BASELINE_PATH, FeedBenchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark feed ingestion with recorded feeds, synthetic feeds and '
+        'archived fetches and compare results with a stored baseline.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--no-corpus',
+            action='store_true',
+            help='Don\'t ingest recorded feeds of the committed corpus.'
+        )
+        parser.add_argument(
+            '--sizes',
+            default=[],
+            help='Numbers of items of synthetic feeds.',
+            nargs='*',
+            type=int
+        )
+        parser.add_argument(
+            '--payloads',
+            default=[],
+            help='FeedPayload ids of archived fetches to replay.',
+            nargs='*',
+            type=int
+        )
+        parser.add_argument(
+            '--parser',
+            choices=[choice for choice, _ in FeedSubscription.PARSER_CHOICES],
+            help='Parser backend, FEED_PARSER setting if not set.'
+        )
+        parser.add_argument(
+            '--repeat',
+            default=FeedBenchmark.REPEAT,
+            help='Number of timed runs of every feed.',
+            type=int
+        )
+        parser.add_argument(
+            '--baseline',
+            default=BASELINE_PATH,
+            help='JSON file with results to compare with, the committed '
+                 'baseline of recorded feeds by default.',
+            type=Path
+        )
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Store results to --baseline file instead of comparing.'
+        )
+        parser.add_argument(
+            '--tolerance',
+            default=FeedBenchmark.TOLERANCE,
+            help='Allowed growth share of times and memory.',
+            type=float
+        )
+
+    def handle(self, *args: Tuple, **options: Any) -> None:
+        corpus = FeedBenchmark.get_corpus(
+            options['sizes'],
+            options['payloads'],
+            not options['no_corpus']
+        )
+        results = FeedBenchmark.run(
+            corpus,
+            options['repeat'],
+            options['parser']
+        )
+        self.stdout.write(
+            '{:<24} {:>7} {:>9} {:>9} {:>9} {:>8} {:>10} {:>10}'.format(
+                'feed',
+                'items',
+                'parse ms',
+                'feed ms',
+                'items ms',
+                'queries',
+                'items/s',
+                'peak KiB'
+            )
+        )
+
+        for result in results:
+            self.stdout.write(
+                '{:<24} {:>7} {:>9.1f} {:>9.1f} {:>9.1f} {:>8} {:>10.0f} '
+                '{:>10.0f}'.format(
+                    result.name,
+                    result.items,
+                    result.parse_time * 1000,
+                    result.feed_time * 1000,
+                    result.items_time * 1000,
+                    result.queries,
+                    result.items_per_second,
+                    result.peak_memory / 1024
+                )
+            )
+
+        if options['save_baseline']:
+            FeedBenchmark.save_baseline(options['baseline'], results)
+            self.stdout.write(
+                'Baseline is saved to {}.'.format(options['baseline'])
+            )
+            return
+
+        regressions = FeedBenchmark.compare(
+            results,
+            FeedBenchmark.load_baseline(options['baseline']),
+            options['tolerance']
+        )
+
+        if regressions:
+            raise CommandError('\n'.join(regressions))
+
+        self.stdout.write(self.style.SUCCESS('No regressions.'))
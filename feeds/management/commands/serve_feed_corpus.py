@@ -0,0 +1,112 @@
+from typing import Any, Tuple
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from feeds.utils.feedcorpus import (
+    FeedCorpus,
+    FeedCorpusOptions,
+    FeedCorpusServer
+)
+from feeds.utils.feedhttpserver import ENCODINGS
+
+
+class Command(BaseCommand):
+    help = (
+        'Serve synthetic RSS and Atom feeds at /feeds/<number> for load '
+        'tests.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        defaults = FeedCorpusOptions()
+        parser.add_argument('--host', default='0.0.0.0')
+        parser.add_argument('--port', default=8001, type=int)
+        parser.add_argument(
+            '--size',
+            default=defaults.size,
+            help='Number of items of every feed.',
+            type=int
+        )
+        parser.add_argument(
+            '--item-size',
+            default=defaults.item_size,
+            help='Approximate size of every item description in bytes.',
+            type=int
+        )
+        parser.add_argument(
+            '--churn',
+            default=defaults.churn,
+            help='New items of every feed per hour, 0 keeps feeds unchanged.',
+            type=float
+        )
+        parser.add_argument(
+            '--atom-share',
+            default=defaults.atom_share,
+            help='Share of feeds served as Atom.',
+            type=float
+        )
+        parser.add_argument(
+            '--min-latency',
+            default=defaults.min_latency,
+            help='Min seconds before response.',
+            type=float
+        )
+        parser.add_argument(
+            '--max-latency',
+            default=defaults.max_latency,
+            help='Max seconds before response.',
+            type=float
+        )
+        parser.add_argument(
+            '--error-rate',
+            default=defaults.error_rate,
+            help='Share of requests failed with 500 (Internal Server Error).',
+            type=float
+        )
+        parser.add_argument(
+            '--no-etag',
+            action='store_false',
+            dest='etag',
+            help='Don\'t send ETag and never respond with 304.'
+        )
+        parser.add_argument(
+            '--redirects',
+            default=defaults.redirects,
+            help='Number of temporary redirects before a feed is served.',
+            type=int
+        )
+        parser.add_argument(
+            '--encodings',
+            choices=ENCODINGS,
+            default=ENCODINGS,
+            help='Content encodings in preference order, body is sent as '
+                 'is to clients which accept none of them.',
+            nargs='*'
+        )
+        parser.add_argument(
+            '--seed',
+            default=defaults.seed,
+            help='Seed of per-feed values, e.g. format and churn offset.',
+            type=int
+        )
+
+    def handle(self, *args: Tuple, **options: Any) -> None:
+        corpus = FeedCorpus(FeedCorpusOptions(**{
+            name: options[name]
+            for name in FeedCorpusOptions._fields
+        }))
+        server = FeedCorpusServer(
+            (options['host'], options['port']),
+            corpus,
+            tuple(options['encodings'])
+        )
+        self.stdout.write(
+            'Serving feeds at http://{}:{}/feeds/<number>.'
+            .format(*server.server_address)
+        )
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
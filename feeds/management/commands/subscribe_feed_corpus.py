@@ -0,0 +1,68 @@
+from typing import Any, Tuple
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser
+)
+
+from feeds.models import FeedSubscription
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Subscribe a user to feeds of serve_feed_corpus server, so they are '
+        'updated by update_feeds task.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('username', help='Owner of subscriptions.')
+        parser.add_argument(
+            '--url',
+            default='http://localhost:8001',
+            help='Base url of the corpus server as workers reach it.'
+        )
+        parser.add_argument(
+            '--count',
+            default=1000,
+            help='Number of feeds to subscribe.',
+            type=int
+        )
+        parser.add_argument(
+            '--start',
+            default=0,
+            help='Number of the first feed.',
+            type=int
+        )
+
+    def handle(self, *args: Tuple, **options: Any) -> None:
+        try:
+            owner = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(
+                'User {} does not exist.'.format(options['username'])
+            )
+
+        FeedSubscription.objects.bulk_create(
+            (
+                # Ready subscriptions are due right away
+                FeedSubscription(
+                    owner=owner,
+                    status=FeedSubscription.STATUS_READY,
+                    url='{}/feeds/{}'.format(options['url'].rstrip('/'), i)
+                )
+                for i in range(
+                    options['start'],
+                    options['start'] + options['count']
+                )
+            ),
+            batch_size=1000,
+            ignore_conflicts=True
+        )
+        self.stdout.write(
+            'Subscribed {} to {} feeds.'
+            .format(options['username'], options['count'])
+        )
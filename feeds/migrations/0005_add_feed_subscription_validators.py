@@ -0,0 +1,23 @@
+# Generated by Django 3.1.2 on 2026-10-17 16:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0004_update_feed_subscription_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedsubscription',
+            name='etag',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='feedsubscription',
+            name='last_modified',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
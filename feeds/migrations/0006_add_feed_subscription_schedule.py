@@ -0,0 +1,38 @@
+# Generated by Django 3.1.2 on 2026-10-17 16:17
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0005_add_feed_subscription_validators'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feed',
+            name='skip_days',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='feed',
+            name='skip_hours',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='feedsubscription',
+            name='fetch_interval',
+            field=models.DurationField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='feedsubscription',
+            name='next_fetch_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='feedsubscription',
+            index=models.Index(condition=models.Q(('is_stopped', False), ('status', 'ready')), fields=['next_fetch_at'], name='feeds_feedsub_next_fetch_idx'),
+        ),
+    ]
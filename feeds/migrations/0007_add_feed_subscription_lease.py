@@ -0,0 +1,22 @@
+# Generated by Django 3.1.2 on 2026-10-17 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0006_add_feed_subscription_schedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedsubscription',
+            name='lease_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='feedsubscription',
+            index=models.Index(condition=models.Q(status='in_progress'), fields=['lease_expires_at'], name='feeds_feedsub_lease_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.2 on 2026-10-17 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0007_add_feed_subscription_lease'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedsubscription',
+            name='parser',
+            field=models.CharField(blank=True, choices=[('feedparser', 'feedparser'), ('stream', 'Streaming RSS parser')], max_length=10, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.1.2 on 2026-10-17 17:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0008_add_feed_subscription_parser'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedsubscription',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='feedsubscription',
+            name='fetch_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='feedsubscription',
+            name='unchanged_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.2 on 2026-10-17 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0009_add_feed_subscription_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feeditem',
+            name='fingerprint',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.1.2 on 2026-10-17 17:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0010_add_feed_item_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedsubscription',
+            name='next_retry_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='feedsubscription',
+            index=models.Index(condition=models.Q(status='ready'), fields=['next_retry_at'], name='feeds_feedsub_next_retry_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.2 on 2026-10-17 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0011_add_feed_subscription_next_retry_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedsubscription',
+            name='failure_reason',
+            field=models.CharField(blank=True, choices=[('dns', 'Host name is not resolved'), ('gone', 'Feed is gone'), ('http', 'Client HTTP error'), ('network', 'Network error'), ('not_feed', 'Not a feed'), ('not_found', 'Feed is not found'), ('parse', 'Invalid feed'), ('server', 'Server error'), ('unknown', 'Unknown error')], max_length=9, null=True),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 3.1.2 on 2026-10-17 19:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0014_add_feed_subscription_bytes_transferred'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedPayload',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('fetched_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('headers', models.JSONField(default=dict)),
+                ('size', models.BigIntegerField()),
+                ('status', models.PositiveSmallIntegerField()),
+                ('url', models.TextField()),
+                ('subscription', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payloads', to='feeds.feedsubscription')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='feedpayload',
+            index=models.Index(fields=['subscription', 'fetched_at'], name='feeds_feedpayload_fetched_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedpayload',
+            index=models.Index(fields=['content_hash'], name='feeds_feedpayload_hash_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 3.1.2 on 2026-10-17 20:10
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built without locking writes to feeds_feeditem
+    atomic = False
+
+    dependencies = [
+        ('feeds', '0015_add_feed_payload'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='feeditem',
+            index=models.Index(condition=models.Q(guid__isnull=False), fields=['feed', 'guid'], name='feeds_feeditem_guid_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='feeditem',
+            index=models.Index(fields=['feed', 'title'], name='feeds_feeditem_title_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='feeditem',
+            index=models.Index(fields=['feed', '-pub_date'], name='feeds_feeditem_pub_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='feeditem',
+            index=models.Index(condition=models.Q(is_read=False), fields=['feed', '-pub_date'], name='feeds_feeditem_unread_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='feeditem',
+            index=models.Index(fields=['feed', '-created'], name='feeds_feeditem_created_idx'),
+        ),
+    ]
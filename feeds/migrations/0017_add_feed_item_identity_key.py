@@ -0,0 +1,18 @@
+# Generated by Django 3.1.2 on 2026-10-17 20:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0016_add_feed_item_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feeditem',
+            name='identity_key',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 3.1.2 on 2026-10-17 20:45
+
+import hashlib
+
+from django.db import migrations, transaction
+
+FEED_BATCH_SIZE = 100
+
+
+def get_identity_key(guid, link, title):
+    if guid:
+        value = 'guid:{}'.format(guid)
+    elif link:
+        value = 'link:{}'.format(link)
+    else:
+        value = 'title:{}'.format(title or '')
+
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def fill_feeds_identity_keys(FeedItem, feed_ids):
+    feed_id = None
+    keys = set()
+    feed_items = []
+
+    # Rows stored by the running app already have a key and come first, so
+    # old duplicates of them keep an empty key
+    for feed_item in (
+            FeedItem
+            .objects
+            .filter(feed_id__in=feed_ids)
+            .only('feed_id', 'guid', 'identity_key', 'link', 'title')
+            .order_by('feed_id', 'identity_key', 'id')
+    ):
+        if feed_item.feed_id != feed_id:
+            feed_id = feed_item.feed_id
+            keys = set()
+
+        if feed_item.identity_key:
+            keys.add(feed_item.identity_key)
+            continue
+
+        key = get_identity_key(feed_item.guid, feed_item.link, feed_item.title)
+
+        # Duplicates of the first item keep an empty key
+        if key in keys:
+            continue
+
+        keys.add(key)
+        feed_item.identity_key = key
+        feed_items.append(feed_item)
+
+    FeedItem.objects.bulk_update(
+        feed_items,
+        ['identity_key'],
+        batch_size=1000
+    )
+
+
+def fill_identity_keys(apps, schema_editor):
+    Feed = apps.get_model('feeds', 'Feed')
+    FeedItem = apps.get_model('feeds', 'FeedItem')
+    feed_ids = list(Feed.objects.order_by('id').values_list('id', flat=True))
+
+    # Every batch of feeds is committed separately to keep locks short
+    for index in range(0, len(feed_ids), FEED_BATCH_SIZE):
+        with transaction.atomic():
+            fill_feeds_identity_keys(
+                FeedItem,
+                feed_ids[index:index + FEED_BATCH_SIZE]
+            )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('feeds', '0017_add_feed_item_identity_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_identity_keys, migrations.RunPython.noop),
+    ]
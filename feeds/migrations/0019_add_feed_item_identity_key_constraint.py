@@ -0,0 +1,45 @@
+# Generated by Django 3.1.2 on 2026-10-17 20:50
+
+from django.contrib.postgres.operations import RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Unique index is built without locking writes to feeds_feeditem
+    atomic = False
+
+    dependencies = [
+        ('feeds', '0018_fill_feed_item_identity_key'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS '
+                    'feeds_feeditem_feed_identity_key ON feeds_feeditem '
+                    '(feed_id, identity_key)',
+                    'DROP INDEX CONCURRENTLY IF EXISTS '
+                    'feeds_feeditem_feed_identity_key',
+                ),
+                # Constraint takes over the built index, no table scan
+                migrations.RunSQL(
+                    'ALTER TABLE feeds_feeditem '
+                    'ADD CONSTRAINT feeds_feeditem_feed_identity_key '
+                    'UNIQUE USING INDEX feeds_feeditem_feed_identity_key',
+                    'ALTER TABLE feeds_feeditem '
+                    'DROP CONSTRAINT feeds_feeditem_feed_identity_key',
+                ),
+            ],
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='feeditem',
+                    constraint=models.UniqueConstraint(fields=('feed', 'identity_key'), name='feeds_feeditem_feed_identity_key'),
+                ),
+            ],
+        ),
+        RemoveIndexConcurrently(
+            model_name='feeditem',
+            name='feeds_feeditem_guid_idx',
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.1.2 on 2026-10-17 21:20
+
+from django.contrib.postgres.operations import RemoveIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Indexes are built without locking writes to feeds_feeditem
+    atomic = False
+
+    dependencies = [
+        ('feeds', '0019_add_feed_item_identity_key_constraint'),
+    ]
+
+    operations = [
+        # Expression indexes can't be declared in FeedItem.Meta
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+            'feeds_feeditem_sort_date_idx ON feeds_feeditem '
+            '(feed_id, COALESCE(pub_date, created) DESC, id DESC)',
+            'DROP INDEX CONCURRENTLY IF EXISTS feeds_feeditem_sort_date_idx',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+            'feeds_feeditem_unread_sort_date_idx ON feeds_feeditem '
+            '(feed_id, COALESCE(pub_date, created) DESC, id DESC) '
+            'WHERE is_read = false',
+            'DROP INDEX CONCURRENTLY IF EXISTS '
+            'feeds_feeditem_unread_sort_date_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='feeditem',
+            name='feeds_feeditem_pub_date_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='feeditem',
+            name='feeds_feeditem_unread_idx',
+        ),
+    ]
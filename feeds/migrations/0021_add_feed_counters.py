@@ -0,0 +1,55 @@
+# Generated by Django 3.1.2 on 2026-10-17 22:05
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    Feed = apps.get_model('feeds', 'Feed')
+    FeedItem = apps.get_model('feeds', 'FeedItem')
+    feed_items = (
+        FeedItem
+        .objects
+        .filter(feed=OuterRef('pk'))
+        .order_by()
+        .values('feed')
+    )
+    Feed.objects.update(
+        item_count=Coalesce(
+            Subquery(
+                feed_items.annotate(count=Count('id')).values('count')
+            ),
+            0
+        ),
+        unread_count=Coalesce(
+            Subquery(
+                feed_items
+                .filter(is_read=False)
+                .annotate(count=Count('id'))
+                .values('count')
+            ),
+            0
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0020_add_feed_item_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feed',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='feed',
+            name='unread_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.1.2 on 2026-10-17 22:45
+
+from django.db import migrations, transaction
+from django.db.models import OuterRef, Subquery
+
+FEED_BATCH_SIZE = 100
+
+
+def fill_owners(apps, schema_editor):
+    Feed = apps.get_model('feeds', 'Feed')
+    FeedItem = apps.get_model('feeds', 'FeedItem')
+    feed_ids = list(Feed.objects.order_by('id').values_list('id', flat=True))
+    owners = (
+        Feed
+        .objects
+        .filter(id=OuterRef('feed_id'))
+        .values('subscription__owner_id')
+    )
+
+    # Every batch of feeds is committed separately to keep locks short
+    for index in range(0, len(feed_ids), FEED_BATCH_SIZE):
+        with transaction.atomic():
+            FeedItem.objects.filter(
+                feed_id__in=feed_ids[index:index + FEED_BATCH_SIZE],
+                owner__isnull=True
+            ).update(owner_id=Subquery(owners[:1]))
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('feeds', '0022_add_feed_item_owner'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_owners, migrations.RunPython.noop),
+    ]
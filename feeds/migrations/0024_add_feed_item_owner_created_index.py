@@ -0,0 +1,20 @@
+# Generated by Django 3.1.2 on 2026-10-17 22:50
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Index is built without locking writes to feeds_feeditem
+    atomic = False
+
+    dependencies = [
+        ('feeds', '0023_fill_feed_item_owner'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='feeditem',
+            index=models.Index(fields=['owner', '-created', '-id'], name='feeds_item_owner_created_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.1.2 on 2026-10-17 22:55
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Indexes are built without locking writes to feeds_feeditem
+    atomic = False
+
+    dependencies = [
+        ('feeds', '0024_add_feed_item_owner_created_index'),
+    ]
+
+    operations = [
+        # Expression indexes can't be declared in FeedItem.Meta
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+            'feeds_item_owner_sort_date_idx ON feeds_feeditem '
+            '(owner_id, COALESCE(pub_date, created) DESC, id DESC)',
+            'DROP INDEX CONCURRENTLY IF EXISTS feeds_item_owner_sort_date_idx',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+            'feeds_item_owner_unread_sort_date_idx ON feeds_feeditem '
+            '(owner_id, COALESCE(pub_date, created) DESC, id DESC) '
+            'WHERE is_read = false',
+            'DROP INDEX CONCURRENTLY IF EXISTS '
+            'feeds_item_owner_unread_sort_date_idx',
+        ),
+    ]
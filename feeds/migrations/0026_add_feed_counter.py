@@ -0,0 +1,56 @@
+# Generated by Django 3.1.2 on 2026-10-17 23:30
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+import django.db.models.deletion
+
+
+def fill_feed_counters(apps, schema_editor):
+    Feed = apps.get_model('feeds', 'Feed')
+    FeedCounter = apps.get_model('feeds', 'FeedCounter')
+    owners = (
+        Feed
+        .objects
+        .order_by()
+        .values('subscription__owner')
+        .annotate(
+            feed_count=Count('id'),
+            item_count=Sum('item_count'),
+            unread_count=Sum('unread_count')
+        )
+    )
+    FeedCounter.objects.bulk_create(
+        [
+            FeedCounter(
+                feed_count=owner['feed_count'],
+                item_count=owner['item_count'],
+                owner_id=owner['subscription__owner'],
+                unread_count=owner['unread_count']
+            )
+            for owner in owners
+        ],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('feeds', '0025_add_feed_item_owner_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feed_count', models.PositiveIntegerField(default=0)),
+                ('item_count', models.PositiveIntegerField(default=0)),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+                ('owner', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='feed_counter', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(fill_feed_counters, migrations.RunPython.noop),
+    ]
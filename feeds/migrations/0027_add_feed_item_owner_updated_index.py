@@ -0,0 +1,20 @@
+# Generated by Django 3.1.2 on 2026-10-17 23:40
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Index is built without locking writes to feeds_feeditem
+    atomic = False
+
+    dependencies = [
+        ('feeds', '0026_add_feed_counter'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='feeditem',
+            index=models.Index(fields=['owner', '-updated', '-id'], name='feeds_item_owner_updated_idx'),
+        ),
+    ]
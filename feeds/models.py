@@ -1,13 +1,239 @@
+import hashlib
+import random
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from django.db import models
-from django.db.models import F
+from django.db import connections, models, transaction
+from django.db.models import (
+    Case,
+    DateTimeField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    Func,
+    Q,
+    Value,
+    When
+)
+from django.db.models.functions import Greatest, Least, Power
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
 User = get_user_model()
 
 
+class FeedSubscriptionQuerySet(models.QuerySet):
+    def claim(self, limit: Optional[int] = None) -> List[int]:
+        """
+        Atomically set status to IN_PROGRESS with a new lease for
+        subscriptions of QuerySet. Rows locked by concurrent claims are
+        skipped, so every subscription is claimed only once.
+
+        :param limit: Max number of subscriptions to claim.
+        :return: List of claimed subscription ids.
+        """
+        connection = connections[self.db]
+        lease_expires_at = timezone.now() + settings.FEED_UPDATE_LEASE
+
+        with transaction.atomic(using=self.db), connection.cursor() as cursor:
+            queryset = (
+                self
+                .order_by('next_fetch_at')
+                .select_for_update(skip_locked=True)
+                .values('id')
+            )[:limit]
+            sql, params = queryset.query.get_compiler(self.db).as_sql()
+            cursor.execute(
+                'UPDATE {table} SET {status} = %s, {lease} = %s '
+                'WHERE {id} IN ({sql}) RETURNING {id}'.format(
+                    id=connection.ops.quote_name('id'),
+                    lease=connection.ops.quote_name('lease_expires_at'),
+                    sql=sql,
+                    status=connection.ops.quote_name('status'),
+                    table=connection.ops.quote_name(self.model._meta.db_table)
+                ),
+                [
+                    FeedSubscription.STATUS_IN_PROGRESS,
+                    lease_expires_at,
+                    *params
+                ]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def claimable(self) -> models.QuerySet:
+        """
+        Get subscriptions that are not in progress or which lease is expired.
+
+        :return: FeedSubscription QuerySet.
+        """
+        return self.filter(
+            ~Q(status=FeedSubscription.STATUS_IN_PROGRESS)
+            | Q(lease_expires_at__isnull=True)
+            | Q(lease_expires_at__lt=timezone.now())
+        )
+
+    def due(self) -> models.QuerySet:
+        """
+        Get subscriptions that are ready and due to be fetched or which
+        update lease is expired, e.g. because of a crashed worker. Failed
+        subscriptions are due when their retry time comes, stopped ones are
+        only re-probed by it.
+
+        :return: FeedSubscription QuerySet.
+        """
+        now = timezone.now()
+        return self.filter(
+            Q(
+                Q(is_stopped=False, next_retry_at__isnull=True)
+                | Q(next_retry_at__lte=now),
+                next_fetch_at__lte=now,
+                status=FeedSubscription.STATUS_READY
+            )
+            | Q(
+                Q(lease_expires_at__isnull=True)
+                | Q(lease_expires_at__lt=now),
+                status=FeedSubscription.STATUS_IN_PROGRESS
+            )
+        )
+
+    def add_bytes_transferred(self, sizes: Dict[int, int]) -> int:
+        """
+        Add downloaded bytes to bytes_transferred of subscriptions with a
+        single query.
+
+        :param sizes: Dict in feed_subscription_id:bytes format.
+        :return: Number of updated rows.
+        """
+        sizes = {
+            feed_subscription_id: size
+            for feed_subscription_id, size in sizes.items()
+            if size
+        }
+
+        if not sizes:
+            return 0
+
+        return self.filter(id__in=list(sizes)).update(
+            bytes_transferred=F('bytes_transferred') + Case(
+                *[
+                    When(id=feed_subscription_id, then=Value(size))
+                    for feed_subscription_id, size in sizes.items()
+                ],
+                default=Value(0),
+                output_field=models.BigIntegerField()
+            )
+        )
+
+    def failure(self, reason: Optional[str] = None) -> int:
+        """
+        Set-based version of FeedSubscription.failure().
+
+        :param reason: One of FAILURE_CHOICES values.
+        :return: Number of updated rows.
+        """
+        reason = reason or FeedSubscription.FAILURE_UNKNOWN
+        values = {
+            'failure_reason': reason,
+            'lease_expires_at': None,
+            'retries': F('retries') + 1,
+            'status': FeedSubscription.STATUS_READY
+        }
+
+        if reason in FeedSubscription.PERMANENT_FAILURES:
+            return self.update(is_stopped=True, next_retry_at=None, **values)
+
+        stop_whens = [
+            When(retries__gte=settings.MAX_RETRIES - 1, then=Value(True))
+        ]
+        retry_whens = []
+
+        # Repeated parse errors are permanent
+        if reason == FeedSubscription.FAILURE_PARSE:
+            is_repeated = Q(
+                failure_reason=FeedSubscription.FAILURE_PARSE,
+                retries__gte=settings.FEED_UPDATE_MAX_PARSE_FAILURES - 1
+            )
+            stop_whens.insert(0, When(is_repeated, then=Value(True)))
+            retry_whens.append(When(is_repeated, then=Value(None)))
+
+        jitter = settings.FEED_UPDATE_RETRY_JITTER
+        # Same delay as FeedSubscription.get_retry_delay() in seconds
+        seconds = ExpressionWrapper(
+            Case(
+                When(
+                    retries__gte=settings.MAX_RETRIES - 1,
+                    then=Value(
+                        settings
+                        .FEED_UPDATE_RETRY_PROBE_INTERVAL
+                        .total_seconds()
+                    )
+                ),
+                default=Least(
+                    Value(settings.FEED_UPDATE_RETRY_BASE.total_seconds())
+                    * Power(Value(2.0), F('retries')),
+                    Value(settings.FEED_UPDATE_RETRY_MAX.total_seconds())
+                ),
+                output_field=FloatField()
+            ) * (
+                Value(1 - jitter)
+                + Func(function='RANDOM', output_field=FloatField())
+                * Value(2 * jitter)
+            ),
+            output_field=FloatField()
+        )
+        return self.update(
+            is_stopped=Case(*stop_whens, default=F('is_stopped')),
+            next_retry_at=Case(
+                *retry_whens,
+                default=Value(timezone.now(), output_field=DateTimeField())
+                + ExpressionWrapper(
+                    Value(timedelta(seconds=1), output_field=DurationField())
+                    * seconds,
+                    output_field=DurationField()
+                ),
+                output_field=DateTimeField()
+            ),
+            **values
+        )
+
+    def in_progress(self) -> int:
+        """
+        Set-based version of FeedSubscription.in_progress().
+
+        :return: Number of updated rows.
+        """
+        return self.update(
+            lease_expires_at=timezone.now() + settings.FEED_UPDATE_LEASE,
+            status=FeedSubscription.STATUS_IN_PROGRESS
+        )
+
+    def postpone(self) -> int:
+        """
+        Set-based version of FeedSubscription.postpone().
+
+        :return: Number of updated rows.
+        """
+        return self.update(
+            lease_expires_at=None,
+            next_fetch_at=timezone.now() + settings.FEED_FETCH_HOST_POSTPONE,
+            status=FeedSubscription.STATUS_READY
+        )
+
+    def reset_validators(self) -> int:
+        """
+        Clear ETag, Last-Modified and content digest, so the next fetch is
+        not skipped as not modified. Used when items of a fetch failed to
+        be stored, because validators are saved before them.
+
+        :return: Number of updated rows.
+        """
+        return self.update(content_hash=None, etag=None, last_modified=None)
+
+
 class FeedSubscription(models.Model):
     STATUS_NEW = 'new'
     STATUS_IN_PROGRESS = 'in_progress'
@@ -19,16 +245,83 @@ class FeedSubscription(models.Model):
         (STATUS_READY, _('Ready')),
     )
 
+    FAILURE_DNS = 'dns'
+    FAILURE_GONE = 'gone'
+    FAILURE_HTTP = 'http'
+    FAILURE_NETWORK = 'network'
+    FAILURE_NOT_FEED = 'not_feed'
+    FAILURE_NOT_FOUND = 'not_found'
+    FAILURE_PARSE = 'parse'
+    FAILURE_SERVER = 'server'
+    FAILURE_TIMEOUT = 'timeout'
+    FAILURE_TOO_LARGE = 'too_large'
+    FAILURE_UNKNOWN = 'unknown'
+
+    FAILURE_CHOICES = (
+        (FAILURE_DNS, _('Host name is not resolved')),
+        (FAILURE_GONE, _('Feed is gone')),
+        (FAILURE_HTTP, _('Client HTTP error')),
+        (FAILURE_NETWORK, _('Network error')),
+        (FAILURE_NOT_FEED, _('Not a feed')),
+        (FAILURE_NOT_FOUND, _('Feed is not found')),
+        (FAILURE_PARSE, _('Invalid feed')),
+        (FAILURE_SERVER, _('Server error')),
+        (FAILURE_TIMEOUT, _('Timeout')),
+        (FAILURE_TOO_LARGE, _('Feed is too large')),
+        (FAILURE_UNKNOWN, _('Unknown error')),
+    )
+    # Failures that stop the subscription right away
+    PERMANENT_FAILURES = {FAILURE_GONE, FAILURE_NOT_FEED}
+
+    PARSER_FEEDPARSER = 'feedparser'
+    PARSER_STREAM = 'stream'
+
+    PARSER_CHOICES = (
+        (PARSER_FEEDPARSER, _('feedparser')),
+        (PARSER_STREAM, _('Streaming RSS parser')),
+    )
+
+    # Number of downloaded bytes of all fetches, before decoding
+    bytes_transferred = models.BigIntegerField(default=0)
+    # SHA-256 digest of the last fetched content
+    content_hash = models.CharField(blank=True, max_length=64, null=True)
+    etag = models.TextField(blank=True, null=True)
+    # Reason of the last failed update, reset on success
+    failure_reason = models.CharField(
+        blank=True,
+        choices=FAILURE_CHOICES,
+        max_length=9,
+        null=True
+    )
+    # Number of successful fetches
+    fetch_count = models.PositiveIntegerField(default=0)
+    fetch_interval = models.DurationField(blank=True, null=True)
     is_stopped = models.BooleanField(default=False)
+    last_modified = models.TextField(blank=True, null=True)
+    lease_expires_at = models.DateTimeField(blank=True, null=True)
+    next_fetch_at = models.DateTimeField(default=timezone.now)
+    # Time of the next attempt after a failed update
+    next_retry_at = models.DateTimeField(blank=True, null=True)
     owner = models.ForeignKey(User, models.CASCADE, 'feed_subscriptions')
+    # Parser backend, FEED_PARSER setting is used if not set
+    parser = models.CharField(
+        blank=True,
+        choices=PARSER_CHOICES,
+        max_length=10,
+        null=True
+    )
     retries = models.PositiveSmallIntegerField(default=0)
     status = models.CharField(
         default=STATUS_NEW,
         choices=STATUS_CHOICES,
         max_length=11
     )
+    # Number of successful fetches with content equal to the previous one
+    unchanged_count = models.PositiveIntegerField(default=0)
     url = models.URLField()
 
+    objects = FeedSubscriptionQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -36,6 +329,26 @@ class FeedSubscription(models.Model):
                 name='feeds_feedsubscription_owner_url_key'
             ),
         ]
+        indexes = [
+            # Due subscriptions lookup of update_feeds task
+            models.Index(
+                condition=Q(is_stopped=False, status='ready'),
+                fields=['next_fetch_at'],
+                name='feeds_feedsub_next_fetch_idx'
+            ),
+            # Failed subscriptions retry lookup of update_feeds task
+            models.Index(
+                condition=Q(status='ready'),
+                fields=['next_retry_at'],
+                name='feeds_feedsub_next_retry_idx'
+            ),
+            # Expired leases lookup of update_feeds task
+            models.Index(
+                condition=Q(status='in_progress'),
+                fields=['lease_expires_at'],
+                name='feeds_feedsub_lease_idx'
+            ),
+        ]
 
     def clean(self) -> None:
         """
@@ -55,35 +368,145 @@ class FeedSubscription(models.Model):
                 code='duplicated_subscription'
             )
 
-    def failure(self) -> None:
+    def get_retry_delay(self) -> timedelta:
+        """
+        Get delay of the next attempt after a failure. Delay grows
+        exponentially with retries up to FEED_UPDATE_RETRY_MAX, stopped
+        subscriptions are re-probed every FEED_UPDATE_RETRY_PROBE_INTERVAL.
+        Delay is randomised by FEED_UPDATE_RETRY_JITTER to spread retries of
+        feeds that failed together.
+
+        :return: Delay as timedelta.
+        """
+        if self.retries + 1 >= settings.MAX_RETRIES:
+            delay = settings.FEED_UPDATE_RETRY_PROBE_INTERVAL
+        else:
+            delay = min(
+                settings.FEED_UPDATE_RETRY_BASE * 2 ** self.retries,
+                settings.FEED_UPDATE_RETRY_MAX
+            )
+
+        jitter = settings.FEED_UPDATE_RETRY_JITTER
+        return delay * random.uniform(1 - jitter, 1 + jitter)
+
+    def is_permanent_failure(self, reason: str) -> bool:
         """
-        Set status to READY, increment retries and set is_stopped to True
-        if retries are exceeded max value.
+        Check if failure won't be fixed by retries: feed is gone, page is not
+        a feed or feed is repeatedly invalid.
+
+        :param reason: One of FAILURE_CHOICES values.
+        :return: Is failure permanent.
+        """
+        if reason in self.PERMANENT_FAILURES:
+            return True
+
+        return (
+            reason == self.FAILURE_PARSE
+            and self.failure_reason == self.FAILURE_PARSE
+            and self.retries + 1 >= settings.FEED_UPDATE_MAX_PARSE_FAILURES
+        )
+
+    def failure(self, reason: Optional[str] = None) -> None:
         """
+        Set status to READY, increment retries and store failure reason.
+        Transient failures schedule the next attempt and set is_stopped to
+        True if retries are exceeded max value, permanent ones stop the
+        subscription right away.
+
+        :param reason: One of FAILURE_CHOICES values.
+        """
+        reason = reason or self.FAILURE_UNKNOWN
+        is_permanent = self.is_permanent_failure(reason)
+
         # It's possible that because of concurrency real value will be
         # different. It's a trade-off to not make an extra db query.
-        if self.retries + 1 >= settings.MAX_RETRIES:
+        if is_permanent or self.retries + 1 >= settings.MAX_RETRIES:
             self.is_stopped = True
 
+        self.failure_reason = reason
+        self.lease_expires_at = None
+        self.next_retry_at = (
+            None
+            if is_permanent
+            else timezone.now() + self.get_retry_delay()
+        )
         self.status = FeedSubscription.STATUS_READY
         self.retries = F('retries') + 1
         self.save()
 
+    def get_parser(self) -> str:
+        """
+        Get parser backend of the subscription or the default one.
+
+        :return: One of PARSER_CHOICES values.
+        """
+        return self.parser or settings.FEED_PARSER
+
     def in_progress(self) -> None:
         """
-        Set status to IN_PROGRESS.
+        Set status to IN_PROGRESS with a new lease.
         """
+        self.lease_expires_at = timezone.now() + settings.FEED_UPDATE_LEASE
         self.status = self.STATUS_IN_PROGRESS
         self.save()
 
-    def success(self) -> None:
+    def postpone(self) -> None:
+        """
+        Set status to READY and move the next fetch to a later time without
+        counting it as a retry.
+        """
+        self.lease_expires_at = None
+        self.next_fetch_at = timezone.now() + settings.FEED_FETCH_HOST_POSTPONE
+        self.status = FeedSubscription.STATUS_READY
+        self.save()
+
+    def success(self, commit: bool = True) -> None:
         """
-        Set status to READY, reset retries and is_stopped.
+        Set status to READY, reset retries, retry time, failure reason and
+        is_stopped.
+
+        :param commit: Save changes to db, otherwise caller is responsible
+        for saving them, e.g. with bulk_update() of multiple subscriptions.
         """
+        self.failure_reason = None
         self.is_stopped = False
+        self.lease_expires_at = None
+        self.next_retry_at = None
         self.retries = 0
         self.status = FeedSubscription.STATUS_READY
-        self.save()
+
+        if commit:
+            self.save()
+
+
+class FeedPayload(models.Model):
+    # SHA-256 digest of the body, name of the archived file
+    content_hash = models.CharField(max_length=64)
+    fetched_at = models.DateTimeField(default=timezone.now)
+    headers = models.JSONField(default=dict)
+    # Size of the decoded body
+    size = models.BigIntegerField()
+    status = models.PositiveSmallIntegerField()
+    subscription = models.ForeignKey(
+        FeedSubscription,
+        models.CASCADE,
+        'payloads'
+    )
+    url = models.TextField()
+
+    class Meta:
+        indexes = [
+            # Fetch history of a subscription
+            models.Index(
+                fields=['subscription', 'fetched_at'],
+                name='feeds_feedpayload_fetched_idx'
+            ),
+            # References lookup of archived files
+            models.Index(
+                fields=['content_hash'],
+                name='feeds_feedpayload_hash_idx'
+            ),
+        ]
 
 
 class Feed(models.Model):
@@ -104,10 +527,14 @@ class Feed(models.Model):
     image_title = models.TextField(blank=True, null=True)
     image_url = models.TextField(blank=True, null=True)
     image_width = models.TextField(blank=True, null=True)
+    # Number of FeedItem objects, maintained by FeedItemUpdater
+    item_count = models.PositiveIntegerField(default=0)
     language = models.TextField(blank=True, null=True)
     link = models.TextField(blank=True, null=True)
     managing_editor = models.TextField(blank=True, null=True)
     pub_date = models.DateTimeField(blank=True, null=True)
+    skip_days = models.TextField(blank=True, null=True)
+    skip_hours = models.TextField(blank=True, null=True)
     subscription = models.OneToOneField(
         FeedSubscription,
         models.CASCADE,
@@ -119,10 +546,88 @@ class Feed(models.Model):
     text_input_title = models.TextField(blank=True, null=True)
     title = models.TextField()
     ttl = models.TextField(blank=True, null=True)
+    # Number of FeedItem objects with is_read False, maintained by
+    # FeedItemUpdater and FeedItem.mark_read
+    unread_count = models.PositiveIntegerField(default=0)
     updated = models.DateTimeField(auto_now=True)
     version = models.TextField(blank=True, null=True)
     web_master = models.TextField(blank=True, null=True)
 
+    @transaction.atomic(savepoint=False)
+    def add_items(self, count: int) -> None:
+        """
+        Increment item_count and unread_count of Feed and FeedCounter of
+        its owner by the number of created FeedItem objects. Counters are
+        incremented in the database, so concurrent updates don't overwrite
+        each other.
+
+        :param count: Number of created unread FeedItem objects.
+        """
+        if not count:
+            return
+
+        is_changed = Feed.objects.filter(id=self.id).update(
+            item_count=F('item_count') + count,
+            unread_count=F('unread_count') + count
+        )
+
+        # Feed deleted meanwhile is already subtracted from FeedCounter
+        if is_changed:
+            FeedCounter.objects.filter(
+                owner_id=self.subscription.owner_id
+            ).update(
+                item_count=F('item_count') + count,
+                unread_count=F('unread_count') + count
+            )
+
+
+class FeedCounter(models.Model):
+    """
+    Sums of Feed counters of a user, maintained together with the Feed
+    counters, so summary of the user doesn't aggregate Feed rows.
+    """
+    feed_count = models.PositiveIntegerField(default=0)
+    item_count = models.PositiveIntegerField(default=0)
+    owner = models.OneToOneField(
+        User,
+        models.CASCADE,
+        related_name='feed_counter'
+    )
+    unread_count = models.PositiveIntegerField(default=0)
+
+    @classmethod
+    def add_feed(cls, feed: Feed) -> None:
+        """
+        Count a created Feed. FeedCounter of the owner is created with its
+        first Feed.
+
+        :param feed: Created Feed instance.
+        """
+        feed_counter, created = cls.objects.get_or_create(
+            defaults={'feed_count': 1},
+            owner_id=feed.subscription.owner_id
+        )
+
+        if not created:
+            cls.objects.filter(id=feed_counter.id).update(
+                feed_count=F('feed_count') + 1
+            )
+
+    @classmethod
+    def remove_feed(cls, feed: Feed) -> None:
+        """
+        Subtract counters of a deleted Feed.
+
+        :param feed: Deleted Feed instance.
+        """
+        cls.objects.filter(
+            owner__feed_subscriptions=feed.subscription_id
+        ).update(
+            feed_count=Greatest(F('feed_count') - 1, 0),
+            item_count=Greatest(F('item_count') - feed.item_count, 0),
+            unread_count=Greatest(F('unread_count') - feed.unread_count, 0)
+        )
+
 
 class FeedCategoryAbstract(models.Model):
     domain = models.TextField(blank=True, null=True)
@@ -146,9 +651,22 @@ class FeedItem(models.Model):
     enclosure_type = models.TextField(blank=True, null=True)
     enclosure_url = models.TextField(blank=True, null=True)
     feed = models.ForeignKey(Feed, models.CASCADE, 'items')
+    # SHA-256 digest of fetched values and categories
+    fingerprint = models.CharField(blank=True, max_length=64, null=True)
     guid = models.TextField(blank=True, null=True)
+    # SHA-256 digest of guid, link or title, identifies item within feed
+    identity_key = models.CharField(blank=True, max_length=64, null=True)
     is_read = models.BooleanField(default=False)
     link = models.TextField(blank=True, null=True)
+    # Owner of the Feed subscription, FeedItemViewSet lists don't join it
+    owner = models.ForeignKey(
+        User,
+        models.CASCADE,
+        'feed_items',
+        blank=True,
+        db_index=False,
+        null=True
+    )
     pub_date = models.DateTimeField(blank=True, null=True)
     title = models.TextField()
     updated = models.DateTimeField(auto_now=True)
@@ -159,8 +677,108 @@ class FeedItem(models.Model):
                 fields=['feed', 'link'],
                 name='feeds_feeditem_feed_link_key'
             ),
+            models.UniqueConstraint(
+                fields=['feed', 'identity_key'],
+                name='feeds_feeditem_feed_identity_key'
+            ),
+        ]
+        indexes = [
+            # FeedItem.clean lookup by title
+            models.Index(
+                fields=['feed', 'title'],
+                name='feeds_feeditem_title_idx'
+            ),
+            # FeedItemViewSet lists ordered by pub_date use expression
+            # indexes of migrations 0020 and 0025
+            # FeedItemViewSet list filtered by feed ordered by created
+            models.Index(
+                fields=['feed', '-created'],
+                name='feeds_feeditem_created_idx'
+            ),
+            # FeedItemViewSet list ordered by created
+            models.Index(
+                fields=['owner', '-created', '-id'],
+                name='feeds_item_owner_created_idx'
+            ),
+            # FeedItemViewSet list ordered by updated
+            models.Index(
+                fields=['owner', '-updated', '-id'],
+                name='feeds_item_owner_updated_idx'
+            ),
         ]
 
+    @classmethod
+    def get_identity_key(
+            cls,
+            guid: Optional[str],
+            link: Optional[str],
+            title: Optional[str]
+    ) -> str:
+        """
+        Get key that identifies FeedItem within its Feed by guid, if it
+        exists, by link, if not, or by title otherwise.
+
+        :param guid: FeedItem guid.
+        :param link: FeedItem link.
+        :param title: FeedItem title.
+        :return: SHA-256 hex digest.
+        """
+        if guid:
+            value = 'guid:{}'.format(guid)
+        elif link:
+            value = 'link:{}'.format(link)
+        else:
+            value = 'title:{}'.format(title or '')
+
+        return hashlib.sha256(value.encode()).hexdigest()
+
+    def save(self, *args: Tuple, **kwargs: Dict) -> None:
+        """
+        Set identity_key and owner of FeedItem saved without them.
+        """
+        if not self.identity_key:
+            self.identity_key = self.get_identity_key(
+                self.guid,
+                self.link,
+                self.title
+            )
+
+        if not self.owner_id:
+            self.owner_id = self.feed.subscription.owner_id
+
+        super().save(*args, **kwargs)
+
+    @transaction.atomic
+    def mark_read(self) -> bool:
+        """
+        Set is_read to True and decrement unread_count of its Feed and
+        FeedCounter of the owner. Only the request which actually changes
+        is_read decrements the counters.
+
+        :return: Is FeedItem changed.
+        """
+        is_changed = bool(
+            FeedItem
+            .objects
+            .filter(id=self.id, is_read=False)
+            .update(is_read=True, updated=timezone.now())
+        )
+
+        # Item created outside FeedItemUpdater is not counted
+        if is_changed and (
+                Feed
+                .objects
+                .filter(id=self.feed_id, unread_count__gt=0)
+                .update(unread_count=F('unread_count') - 1)
+        ):
+            FeedCounter.objects.filter(
+                owner_id=self.owner_id,
+                unread_count__gt=0
+            ).update(unread_count=F('unread_count') - 1)
+
+        self.is_read = True
+        return is_changed
+
     def clean(self) -> None:
         """
         Don't allow to save FeedItem with not unique feed+title.
@@ -0,0 +1,226 @@
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Optional, Tuple
+from urllib import parse
+
+from django.db.models import F, Q, QuerySet
+from django.db.models.functions import Coalesce
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import CursorPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import APIView
+
+
+class FeedItemCursorPagination(CursorPagination):
+    """
+    Paginate FeedItem list by keyset of sort value and id. A page is
+    selected by comparing both with the cursor position, so deep pages cost
+    as much as the first one and no OFFSET or COUNT(*) queries are run.
+    pub_date ordering sorts items without pub_date by created. Total count
+    is returned only on count=true request.
+    """
+    count_query_param = 'count'
+    ordering = '-pub_date'
+    # Sort value of every ordering field, matching indexes of FeedItem
+    sort_values = {
+        'created': F('created'),
+        'pub_date': Coalesce('pub_date', 'created'),
+        'updated': F('updated')
+    }
+
+    def get_ordering(
+            self,
+            request: Request,
+            queryset: QuerySet,
+            view: APIView
+    ) -> str:
+        """
+        Get ordering field chosen with OrderingFilter of the view.
+
+        :param request: Request with ordering query parameter.
+        :param queryset: QuerySet to paginate.
+        :param view: View to get OrderingFilter from.
+        :return: Field name prefixed with '-' if ordering is descending.
+        """
+        for backend in getattr(view, 'filter_backends', []):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+
+                if ordering and ordering[0].lstrip('-') in self.sort_values:
+                    return ordering[0]
+
+        return self.ordering
+
+    def _decode_position(
+            self,
+            request: Request
+    ) -> Optional[Tuple[datetime, int, bool]]:
+        """
+        Get position from cursor query parameter.
+
+        :param request: Request with cursor query parameter.
+        :return: Tuple with sort value, id and is cursor pointing to the
+        previous page or None if there is no cursor.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+
+        if encoded is None:
+            return
+
+        try:
+            tokens = parse.parse_qs(
+                b64decode(encoded.encode('ascii')).decode('ascii'),
+                keep_blank_values=True
+            )
+            value = parse_datetime(tokens['p'][0])
+            item_id = int(tokens['i'][0])
+            is_previous = bool(int(tokens.get('r', ['0'])[0]))
+        except (KeyError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+
+        return value, item_id, is_previous
+
+    def _encode_position(
+            self,
+            value: datetime,
+            item_id: int,
+            is_previous: bool
+    ) -> str:
+        """
+        Get url of the page next to position in the given direction.
+
+        :param value: Sort value of the position.
+        :param item_id: FeedItem id of the position.
+        :param is_previous: Is page before the position.
+        :return: Absolute url.
+        """
+        tokens = {'i': item_id, 'p': value.isoformat()}
+
+        if is_previous:
+            tokens['r'] = 1
+
+        encoded = b64encode(
+            parse.urlencode(tokens, doseq=True).encode('ascii')
+        ).decode('ascii')
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            encoded
+        )
+
+    def paginate_queryset(
+            self,
+            queryset: QuerySet,
+            request: Request,
+            view: Optional[APIView] = None
+    ) -> Optional[List]:
+        """
+        Get a page of queryset after or before the cursor position.
+
+        :param queryset: QuerySet to paginate.
+        :param request: Request with cursor, count and ordering query
+        parameters.
+        :param view: View of the request.
+        :return: List of page objects.
+        """
+        self.page_size = self.get_page_size(request)
+
+        if not self.page_size:
+            return
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        ordering = self.get_ordering(request, queryset, view)
+        queryset = queryset.annotate(
+            sort_value=self.sort_values[ordering.lstrip('-')]
+        )
+        self.count = None
+
+        if request.query_params.get(self.count_query_param) == 'true':
+            self.count = queryset.count()
+
+        position = self._decode_position(request)
+        is_previous = bool(position and position[2])
+        # Previous page is read backwards from the cursor
+        is_descending = ordering.startswith('-') != is_previous
+
+        if is_descending:
+            queryset = queryset.order_by('-sort_value', '-id')
+        else:
+            queryset = queryset.order_by('sort_value', 'id')
+
+        if position:
+            value, item_id, _ = position
+            # Inclusive bound keeps the index range scan, ties are cut by id
+            if is_descending:
+                queryset = queryset.filter(sort_value__lte=value).exclude(
+                    Q(sort_value=value, id__gte=item_id)
+                )
+            else:
+                queryset = queryset.filter(sort_value__gte=value).exclude(
+                    Q(sort_value=value, id__lte=item_id)
+                )
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if is_previous:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        return self.page
+
+    def get_next_link(self) -> Optional[str]:
+        """
+        :return: Url of the next page or None on the last page.
+        """
+        if not self.has_next:
+            return
+
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+
+        item = self.page[-1]
+        return self._encode_position(item.sort_value, item.id, False)
+
+    def get_previous_link(self) -> Optional[str]:
+        """
+        :return: Url of the previous page or None on the first page.
+        """
+        if not self.has_previous:
+            return
+
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+
+        item = self.page[0]
+        return self._encode_position(item.sort_value, item.id, True)
+
+    def get_paginated_response(self, data: List) -> Response:
+        """
+        :param data: Serialized page objects.
+        :return: Response with page links, results and optional count.
+        """
+        fields = [
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]
+
+        if self.count is not None:
+            fields.insert(0, ('count', self.count))
+
+        return Response(OrderedDict(fields))
@@ -19,7 +19,7 @@ class FeedSubscriptionSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = ['feed', 'id', 'is_stopped', 'owner', 'url']
+        fields = ['feed', 'id', 'is_stopped', 'owner', 'parser', 'url']
         model = FeedSubscription
         validators = [
             UniqueTogetherValidator(
@@ -30,12 +30,13 @@ class FeedSubscriptionSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data: dict) -> FeedSubscription:
         """
-        Create FeedSubscription and schedule async feed update.
+        Create FeedSubscription, claim it and schedule async feed update.
 
         :param validated_data: Dict of serializer validated data.
         :return: Created instance of FeedSubscription.
         """
         instance = super().create(validated_data)
+        FeedSubscription.objects.filter(id=instance.id).claim()
         update_feed.delay(instance.id)
         return instance
 
@@ -60,6 +61,12 @@ class FeedSerializer(serializers.ModelSerializer):
         model = Feed
 
 
+class FeedSummarySerializer(serializers.Serializer):
+    feed_count = serializers.IntegerField(read_only=True)
+    item_count = serializers.IntegerField(read_only=True)
+    unread_count = serializers.IntegerField(read_only=True)
+
+
 class FeedItemCategorySerializer(serializers.ModelSerializer):
     class Meta:
         exclude = ['id', 'item']
@@ -70,5 +77,5 @@ class FeedItemSerializer(serializers.ModelSerializer):
     categories = FeedItemCategorySerializer(many=True, read_only=True)
 
     class Meta:
-        exclude = []
+        exclude = ['fingerprint', 'identity_key', 'owner']
         model = FeedItem
@@ -0,0 +1,40 @@
+from typing import Dict
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from feeds.models import Feed, FeedCounter
+
+
+@receiver(post_save, sender=Feed)
+def count_created_feed(
+        sender: type,
+        instance: Feed,
+        created: bool,
+        raw: bool,
+        **kwargs: Dict
+) -> None:
+    """
+    Add created Feed to FeedCounter of its owner.
+
+    :param sender: Feed class.
+    :param instance: Saved Feed instance.
+    :param created: Is Feed created.
+    :param raw: Is Feed loaded from a fixture.
+    :param kwargs: Keyword arguments.
+    """
+    if created and not raw:
+        FeedCounter.add_feed(instance)
+
+
+@receiver(post_delete, sender=Feed)
+def count_deleted_feed(sender: type, instance: Feed, **kwargs: Dict) -> None:
+    """
+    Subtract deleted Feed from FeedCounter of its owner. Also called for
+    Feed deleted with its FeedSubscription.
+
+    :param sender: Feed class.
+    :param instance: Deleted Feed instance.
+    :param kwargs: Keyword arguments.
+    """
+    FeedCounter.remove_feed(instance)
@@ -1,34 +1,121 @@
-from typing import Dict
+import json
+from typing import Dict, List
 
 from celery import shared_task
+from celery.exceptions import SoftTimeLimitExceeded
+from celery.signals import worker_process_shutdown
 from celery.utils.log import get_task_logger
+from django.conf import settings
 
 from feeds.models import FeedSubscription
-from feeds.utils.feedupdater import FeedItemUpdater, FeedUpdater
+from feeds.utils.feedarchive import FeedArchive
+from feeds.utils.feedfetcher import FeedFetcher
+from feeds.utils.feedupdater import (
+    FeedItemUpdater,
+    FeedUpdater,
+    FeedUpdaterPostponedError
+)
 
 logger = get_task_logger(__name__)
 
 
+@worker_process_shutdown.connect
+def close_feed_fetcher(**kwargs: Dict) -> None:
+    """
+    Close connections FeedFetcher keeps open in the worker process.
+
+    :param kwargs: Keyword arguments.
+    """
+    FeedFetcher.close()
+
+
+def delay_update_feed_items(feed_id: int, feed_items_data: List[Dict]) -> None:
+    """
+    Send update_feed_items task. Message size is logged and messages larger
+    than FEED_ITEMS_COMPRESS_SIZE bytes are compressed.
+
+    :param feed_id: Feed.id for related FeedItem objects.
+    :param feed_items_data: List of dicts with parsed FeedItem data.
+    """
+    size = len(json.dumps(feed_items_data))
+    compression = (
+        'zlib' if size > settings.FEED_ITEMS_COMPRESS_SIZE else None
+    )
+    logger.info(
+        'Items message of feed {} is {} bytes, compression: {}.'
+        .format(feed_id, size, compression)
+    )
+    update_feed_items.apply_async(
+        (feed_id, feed_items_data),
+        compression=compression
+    )
+
+
 @shared_task
 def update_feeds() -> None:
     """
-    Update all active subscriptions that are not running.
+    Claim all active subscriptions that are due to be fetched or which lease
+    is expired and update them in batches of FEED_UPDATE_BATCH_SIZE. Claimed
+    subscriptions are leased, so concurrent runs never dispatch them twice.
     """
-    queryset = (
-        FeedSubscription
-        .objects
-        .filter(
-            is_stopped=False,
-            status=FeedSubscription.STATUS_READY
+    while True:
+        batch = FeedSubscription.objects.due().claim(
+            settings.FEED_UPDATE_BATCH_SIZE
         )
-        .values_list('id', flat=True)
-    )
 
-    for subscription_id in queryset.iterator():
-        update_feed.delay(subscription_id)
+        if not batch:
+            break
 
+        update_feeds_batch.delay(batch)
 
-@shared_task
+
+@shared_task(
+    soft_time_limit=settings.FEED_UPDATE_SOFT_TIME_LIMIT,
+    time_limit=settings.FEED_UPDATE_HARD_TIME_LIMIT
+)
+def update_feeds_batch(feed_subscription_ids: List[int]) -> None:
+    """
+    Update multiple Feed objects together. Feeds are downloaded concurrently
+    using a shared HTTP session and persisted using a single db connection.
+
+    :param feed_subscription_ids: FeedSubscription ids for related Feeds.
+    """
+    results = FeedUpdater.update_many(feed_subscription_ids)
+    fetched = []
+
+    for result in results.values():
+        if isinstance(result, FeedUpdaterPostponedError):
+            logger.info(result)
+            continue
+
+        if isinstance(result, Exception):
+            logger.error(result)
+            continue
+
+        feed, feed_items_data = result
+
+        if feed_items_data:
+            fetched.append((feed, feed_items_data))
+
+    for index, (feed, feed_items_data) in enumerate(fetched):
+        try:
+            FeedItemUpdater.update_many(feed.id, feed_items_data)
+        except SoftTimeLimitExceeded as e:
+            # Items of this and the rest feeds are fetched again next time
+            logger.error(e)
+            FeedSubscription.objects.filter(
+                feed__in=[rest_feed for rest_feed, _ in fetched[index:]]
+            ).reset_validators()
+            break
+        except Exception as e:
+            logger.error(e)
+            FeedSubscription.objects.filter(feed=feed).reset_validators()
+
+
+@shared_task(
+    soft_time_limit=settings.FEED_UPDATE_SOFT_TIME_LIMIT,
+    time_limit=settings.FEED_UPDATE_HARD_TIME_LIMIT
+)
 def update_feed(feed_subscription_id: int) -> None:
     """
     Update Feed based on FeedSubscription.
@@ -37,15 +124,27 @@ def update_feed(feed_subscription_id: int) -> None:
     """
     try:
         feed, feed_items_data = FeedUpdater.update(feed_subscription_id)
+    except FeedUpdaterPostponedError as e:
+        logger.info(e)
+        return
     except Exception as e:
         logger.error(e)
         return
 
-    for feed_item_data in feed_items_data:
-        update_feed_item.delay(feed.id, feed_item_data)
+    if not feed_items_data:
+        return
+
+    try:
+        delay_update_feed_items(feed.id, feed_items_data)
+    except Exception as e:
+        logger.error(e)
+        FeedSubscription.objects.filter(feed=feed).reset_validators()
 
 
-@shared_task
+@shared_task(
+    soft_time_limit=settings.FEED_UPDATE_SOFT_TIME_LIMIT,
+    time_limit=settings.FEED_UPDATE_HARD_TIME_LIMIT
+)
 def update_feed_item(feed_id: int, feed_item_data: Dict) -> None:
     """
     Update FeedItem based on Feed.
@@ -57,3 +156,51 @@ def update_feed_item(feed_id: int, feed_item_data: Dict) -> None:
         FeedItemUpdater.update(feed_id, feed_item_data)
     except Exception as e:
         logger.error(e)
+        FeedSubscription.objects.filter(feed__id=feed_id).reset_validators()
+
+
+@shared_task(
+    soft_time_limit=settings.FEED_UPDATE_SOFT_TIME_LIMIT,
+    time_limit=settings.FEED_UPDATE_HARD_TIME_LIMIT
+)
+def update_feed_items(feed_id: int, feed_items_data: List[Dict]) -> None:
+    """
+    Update all FeedItem objects of a single Feed fetch at once.
+
+    :param feed_id: Feed.id for related FeedItem objects.
+    :param feed_items_data: List of dicts with parsed FeedItem data.
+    """
+    try:
+        FeedItemUpdater.update_many(feed_id, feed_items_data)
+    except Exception as e:
+        logger.error(e)
+        # Next fetch is not skipped as not modified and stores the items
+        FeedSubscription.objects.filter(feed__id=feed_id).reset_validators()
+
+
+@shared_task(
+    soft_time_limit=settings.FEED_UPDATE_SOFT_TIME_LIMIT,
+    time_limit=settings.FEED_UPDATE_HARD_TIME_LIMIT
+)
+def reingest_feed_payload(feed_payload_id: int) -> None:
+    """
+    Update Feed and FeedItem objects from an archived fetch.
+
+    :param feed_payload_id: FeedPayload.id of the archived fetch.
+    """
+    try:
+        feed, feed_items_data = FeedUpdater.reingest(feed_payload_id)
+    except Exception as e:
+        logger.error(e)
+        return
+
+    if feed_items_data:
+        delay_update_feed_items(feed.id, feed_items_data)
+
+
+@shared_task
+def prune_feed_archive() -> None:
+    """
+    Delete archived fetches older than FEED_ARCHIVE_RETENTION.
+    """
+    FeedArchive.prune()
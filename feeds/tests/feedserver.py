@@ -0,0 +1,92 @@
+from http import HTTPStatus
+from typing import Set, Tuple
+
+from feeds.utils.feedhttpserver import (
+    ENCODINGS,
+    FeedHTTPRequestHandler,
+    FeedHTTPServer
+)
+
+RSS_TEMPLATE = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<rss version="2.0"><channel>'
+    '<title>{title}</title>'
+    '<link>http://test.com</link>'
+    '<description>test</description>'
+    '<item><guid>{title}-1</guid><title>{title} 1</title></item>'
+    '<item><guid>{title}-2</guid><title>{title} 2</title></item>'
+    '</channel></rss>'
+)
+ETAG = '"test"'
+LAST_MODIFIED = 'Fri, 09 Oct 2020 12:33:21 GMT'
+SLOW_DELAY = 30  # seconds, far above timeouts used by tests
+
+
+class FeedRequestHandler(FeedHTTPRequestHandler):
+    def do_GET(self) -> None:
+        """
+        Serve a small RSS feed titled by url path. Supports If-None-Match,
+        If-Modified-Since, content encodings of the server, /missing path
+        for 404 response, /gone path for 410 response, /html path for a page
+        that is not a feed and /moved/<path> for a permanent redirect to
+        <path> and /slow path that doesn't respond until the server is
+        stopped or SLOW_DELAY seconds pass.
+        """
+        self.server.connections.add(self.client_address)
+
+        if self.path == '/slow':
+            self.server.stopped.wait(SLOW_DELAY)
+            self.close_connection = True
+            return
+
+        if self.path == '/missing':
+            self._send(HTTPStatus.NOT_FOUND, b'Not found')
+            return
+
+        if self.path == '/gone':
+            self._send(HTTPStatus.GONE, b'Gone')
+            return
+
+        if self.path == '/html':
+            self._send(
+                HTTPStatus.OK,
+                b'<!DOCTYPE html><html><body><p>test</p></body></html>',
+                {'Content-Type': 'text/html'}
+            )
+            return
+
+        if self.path.startswith('/moved/'):
+            self._send(
+                HTTPStatus.MOVED_PERMANENTLY,
+                b'',
+                {'Location': self.path[len('/moved'):]}
+            )
+            return
+
+        if (
+                self.headers.get('If-None-Match') == ETAG
+                or self.headers.get('If-Modified-Since') == LAST_MODIFIED
+        ):
+            self._send(HTTPStatus.NOT_MODIFIED, b'')
+            return
+
+        self._send_content(
+            RSS_TEMPLATE.format(title=self.path.strip('/')).encode(),
+            {
+                'Content-Type': 'application/rss+xml',
+                'ETag': ETAG,
+                'Last-Modified': LAST_MODIFIED
+            }
+        )
+
+
+class FeedServer(FeedHTTPServer):
+    """
+    Local HTTP server that serves RSS feeds in a background thread.
+    """
+    def __init__(self, encodings: Tuple[str, ...] = ENCODINGS) -> None:
+        """
+        :param encodings: Content encodings in preference order.
+        """
+        super().__init__(('127.0.0.1', 0), FeedRequestHandler, encodings)
+        self.connections: Set[Tuple[str, int]] = set()
@@ -0,0 +1,158 @@
+import hashlib
+import os
+import tempfile
+from datetime import timedelta
+from typing import Tuple
+from unittest import mock
+
+from django.test import override_settings
+from django.utils import timezone
+
+from feeds.models import FeedPayload
+from feeds.utils.feedarchive import FeedArchive, FeedArchiveError
+from feeds.utils.feedfetcher import FeedFetcherError, FeedFetchResponse
+from rss.tests import BaseTestCase
+
+CONTENT = b'<rss version="2.0"><channel><title>test</title></channel></rss>'
+
+
+def get_response(
+        content: bytes = CONTENT,
+        status: int = 200
+) -> FeedFetchResponse:
+    return FeedFetchResponse(
+        content=content,
+        headers={'etag': 'test'},
+        size=len(content),
+        status=status,
+        url='http://test.com'
+    )
+
+
+class FeedArchiveTestCase(BaseTestCase):
+    def setUp(self) -> None:
+        """
+        Set self.user, self.feed_subscription and archive directory before
+        tests.
+        """
+        self.set_user()
+        self.set_feed_subscription()
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(
+            FEED_ARCHIVE_DIR=self.directory.name
+        )
+        self.settings_override.enable()
+
+    def tearDown(self) -> None:
+        """
+        Delete archive directory after tests.
+        """
+        self.settings_override.disable()
+        self.directory.cleanup()
+
+    # archive tests
+    def test__archive__store_body_once__on_same_content(self) -> None:
+        feed_payloads = FeedArchive.archive([
+            (self.feed_subscription, get_response()),
+            (self.feed_subscription, get_response())
+        ])
+
+        content_hash = hashlib.sha256(CONTENT).hexdigest()
+        self.assertEqual(len(feed_payloads), 2)
+        self.assertEqual(
+            FeedPayload.objects.filter(content_hash=content_hash).count(),
+            2
+        )
+        self.assertEqual(
+            os.listdir(os.path.join(self.directory.name, content_hash[:2])),
+            [content_hash]
+        )
+
+    def test__archive__write_body__if_file_is_pruned(self) -> None:
+        feed_payload, = FeedArchive.archive([
+            (self.feed_subscription, get_response())
+        ])
+        FeedArchive._get_path(feed_payload.content_hash).unlink()
+
+        FeedArchive.archive([(self.feed_subscription, get_response())])
+
+        self.assertEqual(FeedArchive.read(feed_payload.content_hash), CONTENT)
+
+    def test__archive__skip__on_failed_fetch(self) -> None:
+        feed_payloads = FeedArchive.archive([
+            (self.feed_subscription, FeedFetcherError('error')),
+            (self.feed_subscription, get_response(b'', 304)),
+            (self.feed_subscription, get_response(status=404))
+        ])
+
+        self.assertEqual(feed_payloads, [])
+
+    @override_settings(FEED_ARCHIVE_DIR=None)
+    def test__archive__skip__if_disabled(self) -> None:
+        feed_payloads = FeedArchive.archive([
+            (self.feed_subscription, get_response())
+        ])
+
+        self.assertEqual(feed_payloads, [])
+        self.assertFalse(FeedPayload.objects.exists())
+
+    # get_response tests
+    def test__get_response__return_archived_fetch(self) -> None:
+        feed_payload, = FeedArchive.archive([
+            (self.feed_subscription, get_response())
+        ])
+
+        response = FeedArchive.get_response(feed_payload)
+
+        self.assertEqual(response.content, CONTENT)
+        self.assertEqual(response.headers, {'etag': 'test'})
+        self.assertEqual(response.status, 200)
+
+    # read tests
+    def test__read__raise__if_not_archived(self) -> None:
+        with self.assertRaises(FeedArchiveError):
+            FeedArchive.read(hashlib.sha256(b'').hexdigest())
+
+    # prune tests
+    def test__prune__delete_expired_payloads_and_files(self) -> None:
+        expired, kept = FeedArchive.archive([
+            (self.feed_subscription, get_response()),
+            (self.feed_subscription, get_response(CONTENT + b' '))
+        ])
+        expires_at = timezone.now() - timedelta(days=31)
+        FeedPayload.objects.filter(id=expired.id).update(
+            fetched_at=expires_at
+        )
+
+        for feed_payload in (expired, kept):
+            path = FeedArchive._get_path(feed_payload.content_hash)
+            os.utime(path, (expires_at.timestamp(),) * 2)
+
+        deleted = FeedArchive.prune()
+
+        self.assertEqual(deleted, 1)
+        self.assertFalse(FeedPayload.objects.filter(id=expired.id).exists())
+        with self.assertRaises(FeedArchiveError):
+            FeedArchive.read(expired.content_hash)
+        self.assertEqual(FeedArchive.read(kept.content_hash), CONTENT + b' ')
+
+    def test__prune__keep_file__if_archived_again(self) -> None:
+        feed_payload, = FeedArchive.archive([
+            (self.feed_subscription, get_response())
+        ])
+        FeedPayload.objects.all().delete()
+        expires_at = timezone.now() - timedelta(days=31)
+        path = FeedArchive._get_path(feed_payload.content_hash)
+        os.utime(path, (expires_at.timestamp(),) * 2)
+        # Archived again after prune listed the file
+        delete = FeedArchive._delete
+
+        def archive_and_delete(*args: Tuple) -> bool:
+            FeedArchive.archive([(self.feed_subscription, get_response())])
+            return delete(*args)
+
+        with mock.patch.object(FeedArchive, '_delete', archive_and_delete):
+            deleted = FeedArchive.prune()
+
+        self.assertEqual(deleted, 0)
+        self.assertEqual(FeedArchive.read(feed_payload.content_hash), CONTENT)
@@ -0,0 +1,88 @@
+from feeds.models import Feed
+from feeds.utils.feedbenchmark import (
+    BASELINE_PATH,
+    FeedBenchmark,
+    FeedBenchmarkResult
+)
+from rss.tests import BaseTestCase
+
+
+class FeedBenchmarkTestCase(BaseTestCase):
+    # get_synthetic_response tests
+    def test__get_synthetic_response__return_feed__with_size_items(
+            self
+    ) -> None:
+        response = FeedBenchmark.get_synthetic_response(3)
+
+        self.assertEqual(response.content.count(b'<item>'), 3)
+
+    # get_recorded_corpus tests
+    def test__get_recorded_corpus__return_feeds_of_baseline(self) -> None:
+        corpus = FeedBenchmark.get_recorded_corpus()
+
+        self.assertEqual(
+            [name for name, _ in corpus],
+            sorted(FeedBenchmark.load_baseline(BASELINE_PATH))
+        )
+
+    # run tests
+    def test__run__measure_ingestion__without_leaving_data(self) -> None:
+        corpus = FeedBenchmark.get_corpus([5], is_recorded=False)
+
+        result, = FeedBenchmark.run(corpus, 1)
+
+        self.assertEqual(result.name, 'synthetic-5')
+        self.assertEqual(result.items, 5)
+        self.assertGreater(result.queries, 0)
+        self.assertGreater(result.peak_memory, 0)
+        self.assertGreater(result.items_per_second, 0)
+        self.assertFalse(Feed.objects.exists())
+
+    # compare tests
+    def test__compare__report__on_slower_stage_and_more_queries(self) -> None:
+        baseline = FeedBenchmarkResult('test', 1, 1, 1, 1, 10, 100)
+        result = baseline._replace(parse_time=1.5, queries=11)
+
+        regressions = FeedBenchmark.compare(
+            [result],
+            {'test': baseline._asdict()},
+            0.2
+        )
+
+        self.assertEqual(len(regressions), 2)
+
+    def test__compare__skip__within_tolerance(self) -> None:
+        baseline = FeedBenchmarkResult('test', 1, 1, 1, 1, 10, 100)
+        result = baseline._replace(parse_time=1.1, peak_memory=110)
+
+        regressions = FeedBenchmark.compare(
+            [result, result._replace(name='missing')],
+            {'test': baseline._asdict()},
+            0.2
+        )
+
+        self.assertEqual(regressions, [])
+
+    def test__compare__skip__within_time_slack(self) -> None:
+        baseline = FeedBenchmarkResult('test', 1, 0.01, 0.01, 0.01, 10, 100)
+        result = baseline._replace(feed_time=0.02)
+
+        regressions = FeedBenchmark.compare(
+            [result],
+            {'test': baseline._asdict()},
+            0.2
+        )
+
+        self.assertEqual(regressions, [])
+
+    def test__compare__report__on_changed_items(self) -> None:
+        baseline = FeedBenchmarkResult('test', 10, 1, 1, 1, 10, 100)
+        result = baseline._replace(items=9)
+
+        regressions = FeedBenchmark.compare(
+            [result],
+            {'test': baseline._asdict()},
+            0.2
+        )
+
+        self.assertEqual(len(regressions), 1)
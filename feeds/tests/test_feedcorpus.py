@@ -0,0 +1,93 @@
+from feeds.models import FeedSubscription
+from feeds.utils.feedcorpus import (
+    FeedCorpus,
+    FeedCorpusOptions,
+    FeedCorpusServer
+)
+from feeds.utils.feedfetcher import FeedFetcher, FeedFetchRequest
+from feeds.utils.feedhttpserver import ENCODINGS
+from feeds.utils.feedupdater import FeedUpdater
+from rss.tests import BaseTestCase
+
+
+class FeedCorpusTestCase(BaseTestCase):
+    # get_content tests
+    def test__get_content__return_size_latest_items(self) -> None:
+        corpus = FeedCorpus(FeedCorpusOptions(size=3))
+
+        content = corpus.get_content(0, 'http://test.com', 36000)
+
+        self.assertEqual(content.count(b'<item>'), 3)
+        last_index = corpus.get_last_index(0, 36000)
+        self.assertIn(
+            'items/{}<'.format(last_index).encode(),
+            content
+        )
+
+    def test__get_content__return_atom__if_atom_share_is_full(self) -> None:
+        corpus = FeedCorpus(FeedCorpusOptions(atom_share=1, size=2))
+
+        content = corpus.get_content(0, 'http://test.com')
+
+        self.assertIn(b'http://www.w3.org/2005/Atom', content)
+        self.assertEqual(content.count(b'<entry>'), 2)
+
+    # get_etag tests
+    def test__get_etag__change__on_new_item(self) -> None:
+        corpus = FeedCorpus(FeedCorpusOptions(churn=1))
+
+        etag = corpus.get_etag(0, 36000)
+
+        self.assertEqual(corpus.get_etag(0, 36001), etag)
+        self.assertNotEqual(corpus.get_etag(0, 36000 + 3600), etag)
+
+    def test__get_etag__keep__without_churn(self) -> None:
+        corpus = FeedCorpus(FeedCorpusOptions(churn=0))
+
+        self.assertEqual(corpus.get_etag(0, 0), corpus.get_etag(0, 36000))
+
+    # FeedCorpusServer tests
+    def test__server__serve_feeds__to_feed_updater(self) -> None:
+        self.set_user()
+
+        with FeedCorpusServer(
+                ('127.0.0.1', 0),
+                FeedCorpus(FeedCorpusOptions(redirects=2, size=5))
+        ) as server:
+            feed_subscriptions = [
+                FeedSubscription.objects.create(
+                    owner=self.user,
+                    url=server.get_feed_url(i)
+                )
+                for i in range(3)
+            ]
+
+            results = FeedUpdater.update_many(
+                feed_subscription.id
+                for feed_subscription in feed_subscriptions
+            )
+
+        for i, feed_subscription in enumerate(feed_subscriptions):
+            feed, feed_items_data = results[feed_subscription.id]
+            self.assertEqual(feed.title, 'Feed {}'.format(i))
+            self.assertEqual(len(feed_items_data), 5)
+
+    def test__server__serve_feeds__in_every_encoding(self) -> None:
+        corpus = FeedCorpus(FeedCorpusOptions(size=1))
+
+        for encoding in ENCODINGS:
+            with self.subTest(encoding=encoding):
+                with FeedCorpusServer(
+                        ('127.0.0.1', 0),
+                        corpus,
+                        (encoding,)
+                ) as server:
+                    response, = FeedFetcher.fetch_many([
+                        FeedFetchRequest(server.get_feed_url(0))
+                    ])
+
+                self.assertEqual(
+                    response.headers['content-encoding'],
+                    encoding
+                )
+                self.assertIn(b'<title>Feed 0</title>', response.content)
@@ -0,0 +1,150 @@
+from http import HTTPStatus
+
+import brotli
+from django.test import override_settings, SimpleTestCase
+
+from feeds.tests.feedserver import ETAG, FeedServer
+from feeds.utils.feedfetcher import (
+    FeedFetcher,
+    FeedFetcherError,
+    FeedFetcherTooLargeError,
+    FeedFetchRequest
+)
+
+
+class FeedFetcherTestCase(SimpleTestCase):
+    # fetch_many tests
+    def test__fetch_many__return_decoded_content__on_gzip(self) -> None:
+        with FeedServer() as server:
+            response, = FeedFetcher.fetch_many([
+                FeedFetchRequest(server.get_url('/test'))
+            ])
+
+        self.assertEqual(response.status, HTTPStatus.OK)
+        self.assertEqual(response.headers['content-encoding'], 'gzip')
+        self.assertIn(b'<title>test</title>', response.content)
+
+    def test__fetch_many__return_decoded_content__on_deflate(self) -> None:
+        with FeedServer(('deflate',)) as server:
+            response, = FeedFetcher.fetch_many([
+                FeedFetchRequest(server.get_url('/test'))
+            ])
+
+        self.assertEqual(response.headers['content-encoding'], 'deflate')
+        self.assertIn(b'<title>test</title>', response.content)
+
+    def test__fetch_many__return_decoded_content__on_brotli(self) -> None:
+        with FeedServer(('br',)) as server:
+            response, = FeedFetcher.fetch_many([
+                FeedFetchRequest(server.get_url('/test'))
+            ])
+
+        self.assertEqual(response.headers['content-encoding'], 'br')
+        self.assertIn(b'<title>test</title>', response.content)
+
+    def test__fetch_many__return_not_modified__on_same_etag(self) -> None:
+        with FeedServer() as server:
+            response, = FeedFetcher.fetch_many([
+                FeedFetchRequest(server.get_url('/test'), etag=ETAG)
+            ])
+
+        self.assertEqual(response.status, HTTPStatus.NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test__fetch_many__return_error__on_connection_failure(self) -> None:
+        with FeedServer() as server:
+            url = server.get_url('/test')
+
+        responses = FeedFetcher.fetch_many([
+            FeedFetchRequest(url),
+            FeedFetchRequest('invalid_url')
+        ])
+
+        self.assertIsInstance(responses[0], FeedFetcherError)
+        self.assertIsInstance(responses[1], FeedFetcherError)
+
+    def test__fetch_many__reuse_connections__on_same_host(self) -> None:
+        with self.settings(FEED_FETCH_CONCURRENCY_PER_HOST=2):
+            with FeedServer() as server:
+                responses = FeedFetcher.fetch_many(
+                    FeedFetchRequest(server.get_url('/test{}'.format(i)))
+                    for i in range(10)
+                )
+
+        self.assertEqual(len(responses), 10)
+        self.assertTrue(
+            all(response.status == HTTPStatus.OK for response in responses)
+        )
+        self.assertLessEqual(len(server.connections), 2)
+
+    @override_settings(FEED_FETCH_CONCURRENCY_PER_HOST=1)
+    def test__fetch_many__reuse_connections__across_calls(self) -> None:
+        with FeedServer() as server:
+            for i in range(3):
+                FeedFetcher.fetch_many([
+                    FeedFetchRequest(server.get_url('/test{}'.format(i)))
+                ])
+
+        self.assertEqual(len(server.connections), 1)
+
+    @override_settings(FEED_FETCH_CONCURRENCY_PER_HOST=1)
+    def test__close__close_connections(self) -> None:
+        with FeedServer() as server:
+            for i in range(2):
+                FeedFetcher.fetch_many([
+                    FeedFetchRequest(server.get_url('/test{}'.format(i)))
+                ])
+                FeedFetcher.close()
+
+        self.assertEqual(len(server.connections), 2)
+
+    @override_settings(FEED_FETCH_TOTAL_TIMEOUT=0.1)
+    def test__fetch_many__return_error__on_timeout(self) -> None:
+        with FeedServer() as server:
+            response, = FeedFetcher.fetch_many([
+                FeedFetchRequest(server.get_url('/slow'))
+            ])
+
+        self.assertIsInstance(response, FeedFetcherError)
+
+    @override_settings(FEED_FETCH_MAX_SIZE=100)
+    def test__fetch_many__return_error__on_too_large_body(self) -> None:
+        with FeedServer() as server:
+            response, = FeedFetcher.fetch_many([
+                FeedFetchRequest(server.get_url('/test'))
+            ])
+
+        self.assertIsInstance(response, FeedFetcherTooLargeError)
+
+    def test__fetch_many__return_transferred_size(self) -> None:
+        with FeedServer() as server:
+            response, = FeedFetcher.fetch_many([
+                FeedFetchRequest(server.get_url('/test'))
+            ])
+
+        self.assertEqual(
+            response.size,
+            int(response.headers['content-length'])
+        )
+
+    # _get_decompressor tests
+    def test__get_decompressor__decode_brotli(self) -> None:
+        decompressor = FeedFetcher._get_decompressor({
+            'content-encoding': 'br'
+        })
+
+        content = decompressor.decompress(brotli.compress(b'test'))
+
+        self.assertEqual(content + decompressor.flush(), b'test')
+
+    def test__get_decompressor__limit_brotli_output__on_bomb(self) -> None:
+        decompressor = FeedFetcher._get_decompressor({
+            'content-encoding': 'br'
+        })
+        bomb = brotli.compress(b'\0' * 100 * 1024 * 1024)
+
+        content = decompressor.decompress(bomb, 1024)
+
+        self.assertGreaterEqual(len(content), 1024)
+        # Brotli meta-block is 16 MiB at most
+        self.assertLessEqual(len(content), 1024 + 16 * 1024 * 1024)
@@ -0,0 +1,47 @@
+from django.test import override_settings, SimpleTestCase
+
+from feeds.utils.feedhostlimiter import FeedHostLimiter
+
+URL = 'http://limiter.test/rss'
+
+
+class FeedHostLimiterTestCase(SimpleTestCase):
+    def setUp(self) -> None:
+        """
+        Reset counters of the test host before tests.
+        """
+        client = FeedHostLimiter._get_client()
+
+        for key in client.scan_iter(FeedHostLimiter.KEY_PREFIX + 'limiter.*'):
+            client.delete(key)
+
+    # acquire tests
+    @override_settings(FEED_FETCH_HOST_CONCURRENCY=2)
+    def test__acquire__deny__over_concurrency_limit(self) -> None:
+        acquired = FeedHostLimiter.acquire([URL, URL, URL])
+
+        self.assertEqual(acquired, [True, True, False])
+
+    @override_settings(FEED_FETCH_HOST_RATE=2)
+    def test__acquire__deny__over_rate_limit(self) -> None:
+        FeedHostLimiter.acquire([URL, URL])
+        FeedHostLimiter.release([URL, URL])
+
+        acquired = FeedHostLimiter.acquire([URL])
+
+        self.assertEqual(acquired, [False])
+
+    @override_settings(FEED_FETCH_HOST_CONCURRENCY=1)
+    def test__acquire__allow__on_different_hosts(self) -> None:
+        acquired = FeedHostLimiter.acquire([URL, 'http://limiter.test2/rss'])
+
+        self.assertEqual(acquired, [True, True])
+
+    # release tests
+    @override_settings(FEED_FETCH_HOST_CONCURRENCY=1)
+    def test__release__allow_next_request(self) -> None:
+        FeedHostLimiter.acquire([URL])
+
+        FeedHostLimiter.release([URL])
+
+        self.assertEqual(FeedHostLimiter.acquire([URL]), [True])
@@ -0,0 +1,55 @@
+from unittest import mock
+
+from django.test import override_settings, SimpleTestCase
+
+from feeds.utils.feedparserpool import FeedParserPool
+
+
+def divide(dividend: int, divisor: int) -> float:
+    return dividend / divisor
+
+
+class FeedParserPoolTestCase(SimpleTestCase):
+    def setUp(self) -> None:
+        """
+        Enable pool before tests.
+        """
+        FeedParserPool._is_disabled = False
+
+    # map tests
+    @override_settings(FEED_PARSE_PROCESSES=2)
+    def test__map__return_results__in_order_of_arguments(self) -> None:
+        results = FeedParserPool.map(divide, [1, 2, 3], [1, 1, 1])
+
+        self.assertEqual(results, [1, 2, 3])
+
+    @override_settings(FEED_PARSE_PROCESSES=2)
+    def test__map__return_exception__on_failed_call(self) -> None:
+        results = FeedParserPool.map(divide, [1, 2], [1, 0])
+
+        self.assertEqual(results[0], 1)
+        self.assertIsInstance(results[1], ZeroDivisionError)
+
+    @override_settings(FEED_PARSE_PROCESSES=0)
+    def test__map__call_in_process__if_pool_is_disabled(self) -> None:
+        results = FeedParserPool.map(divide, [1, 2], [1, 0])
+
+        self.assertIsNone(FeedParserPool._get_executor())
+        self.assertEqual(results[0], 1)
+        self.assertIsInstance(results[1], ZeroDivisionError)
+
+    @override_settings(FEED_PARSE_PROCESSES=2)
+    @mock.patch('feeds.utils.feedparserpool.current_process')
+    def test__map__call_in_process__in_daemonic_process(
+            self,
+            current_process: mock.Mock
+    ) -> None:
+        current_process.return_value.daemon = True
+
+        results = FeedParserPool.map(divide, [1, 2], [1, 1])
+
+        self.assertIsNone(FeedParserPool._get_executor())
+        self.assertEqual(results, [1, 2])
+
+    def test__map__return_empty_list__on_no_arguments(self) -> None:
+        self.assertEqual(FeedParserPool.map(divide, [], []), [])
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from feeds.models import Feed
+from feeds.utils.feedscheduler import FeedScheduler
+from rss.tests import BaseTestCase
+
+
+class FeedSchedulerTestCase(BaseTestCase):
+    # get_interval tests
+    def test__get_interval__return_min_interval__if_no_hints(self) -> None:
+        interval = FeedScheduler.get_interval(None)
+
+        self.assertEqual(interval, settings.FEED_UPDATE_MIN_INTERVAL)
+
+    def test__get_interval__return_ttl__if_ttl_is_longer(self) -> None:
+        feed = Feed(ttl='60')
+
+        interval = FeedScheduler.get_interval(feed)
+
+        self.assertEqual(interval, timedelta(minutes=60))
+
+    def test__get_interval__return_half_cadence__if_modified(self) -> None:
+        pub_dates = [
+            datetime(2020, 1, 1, hour)
+            for hour in (0, 4, 8, 12)
+        ]
+
+        interval = FeedScheduler.get_interval(None, pub_dates)
+
+        self.assertEqual(interval, timedelta(hours=2))
+
+    def test__get_interval__increase_interval__if_not_modified(self) -> None:
+        interval = FeedScheduler.get_interval(
+            None,
+            previous_interval=timedelta(hours=1),
+            is_modified=False
+        )
+
+        self.assertEqual(interval, timedelta(hours=1.5))
+
+    def test__get_interval__limit_interval__by_max_interval(self) -> None:
+        feed = Feed(ttl='100000')
+
+        interval = FeedScheduler.get_interval(feed)
+
+        self.assertEqual(interval, settings.FEED_UPDATE_MAX_INTERVAL)
+
+    # get_next_fetch_at tests
+    def test__get_next_fetch_at__return_interval_later(self) -> None:
+        now = timezone.now()
+
+        fetch_at = FeedScheduler.get_next_fetch_at(
+            None,
+            timedelta(hours=1),
+            now
+        )
+
+        self.assertEqual(fetch_at, now + timedelta(hours=1))
+
+    def test__get_next_fetch_at__move_out_of_skip_hours(self) -> None:
+        feed = Feed(skip_hours='1,2')
+        now = datetime(2020, 1, 1, 0, 30, tzinfo=timezone.utc)
+
+        fetch_at = FeedScheduler.get_next_fetch_at(
+            feed,
+            timedelta(hours=1),
+            now
+        )
+
+        self.assertEqual(
+            fetch_at,
+            datetime(2020, 1, 1, 3, tzinfo=timezone.utc)
+        )
+
+    def test__get_next_fetch_at__move_out_of_skip_days(self) -> None:
+        # 2020-01-01 is Wednesday
+        feed = Feed(skip_days='Wednesday,Thursday')
+        now = datetime(2019, 12, 31, 23, 30, tzinfo=timezone.utc)
+
+        fetch_at = FeedScheduler.get_next_fetch_at(
+            feed,
+            timedelta(hours=1),
+            now
+        )
+
+        self.assertEqual(
+            fetch_at,
+            datetime(2020, 1, 3, tzinfo=timezone.utc)
+        )
+
+    def test__get_next_fetch_at__ignore_skip_hours__if_all_skipped(
+            self
+    ) -> None:
+        feed = Feed(skip_hours=','.join(map(str, range(24))))
+        now = timezone.now()
+
+        fetch_at = FeedScheduler.get_next_fetch_at(
+            feed,
+            timedelta(hours=1),
+            now
+        )
+
+        self.assertEqual(fetch_at, now + timedelta(hours=1))
@@ -0,0 +1,96 @@
+import feedparser
+from django.test import SimpleTestCase
+
+from feeds.utils.feedstreamparser import (
+    FeedStreamParser,
+    FeedStreamParserError,
+    FeedStreamParserUnsupportedError
+)
+
+RSS = (
+    b'<?xml version="1.0" encoding="utf-8"?>'
+    b'<rss version="2.0"><channel>'
+    b'<title>test</title>'
+    b'<link>http://test.com</link>'
+    b'<description>test</description>'
+    b'<category domain="http://test.com">news</category>'
+    b'<pubDate>Fri, 09 Oct 2020 12:33:21 GMT</pubDate>'
+    b'<skipHours><hour>1</hour><hour>2</hour></skipHours>'
+    b'<item>'
+    b'<guid isPermaLink="true">http://test.com/1</guid>'
+    b'<title>test 1</title>'
+    b'<description>&lt;p&gt;test&lt;/p&gt;</description>'
+    b'<category>sport</category>'
+    b'<enclosure url="http://test.com/1.mp3" length="1" type="audio/mpeg"/>'
+    b'</item>'
+    b'<item><guid>test-2</guid><title>test 2</title></item>'
+    b'<ttl>60</ttl>'
+    b'</channel></rss>'
+)
+
+
+class FeedStreamParserTestCase(SimpleTestCase):
+    # iterparse tests
+    def test__iterparse__yield_feed_before_entries(self) -> None:
+        feed, *entries = FeedStreamParser.iterparse(RSS)
+
+        self.assertEqual(feed['title'], 'test')
+        self.assertEqual(
+            [entry['title'] for entry in entries],
+            ['test 1', 'test 2']
+        )
+
+    def test__iterparse__update_feed__with_elements_after_items(self) -> None:
+        feed, *_ = FeedStreamParser.iterparse(RSS)
+
+        self.assertEqual(feed['ttl'], '60')
+
+    def test__iterparse__raise__on_not_rss(self) -> None:
+        with self.assertRaises(FeedStreamParserUnsupportedError):
+            list(FeedStreamParser.iterparse(b'<feed></feed>'))
+
+    def test__iterparse__raise__on_invalid_xml(self) -> None:
+        with self.assertRaises(FeedStreamParserError):
+            list(FeedStreamParser.iterparse(b'<rss><channel>'))
+
+    # parse tests
+    def test__parse__match_feedparser__on_consumed_fields(self) -> None:
+        expected = feedparser.parse(RSS)
+
+        feed_data = FeedStreamParser.parse(RSS)
+        entries = list(feed_data.entries)
+
+        self.assertEqual(feed_data.version, expected.version)
+        self.assertEqual(feed_data.encoding, expected.encoding)
+
+        for name in ('title', 'link', 'subtitle', 'ttl', 'published_parsed'):
+            self.assertEqual(feed_data.feed[name], expected.feed[name])
+
+        self.assertEqual(
+            feed_data.feed['tags'][0]['term'],
+            expected.feed['tags'][0]['term']
+        )
+
+        for entry, expected_entry in zip(entries, expected.entries):
+            for name in ('id', 'link', 'title'):
+                self.assertEqual(entry.get(name), expected_entry.get(name))
+
+        self.assertEqual(
+            entries[0]['summary'],
+            expected.entries[0]['summary']
+        )
+        self.assertEqual(
+            entries[0]['enclosures'][0]['href'],
+            expected.entries[0]['enclosures'][0]['href']
+        )
+
+    def test__parse__return_all_skip_values(self) -> None:
+        feed_data = FeedStreamParser.parse(RSS)
+
+        self.assertEqual(feed_data.feed['skip_hours'], ['1', '2'])
+
+    def test__parse__raise__on_invalid_xml_after_items(self) -> None:
+        feed_data = FeedStreamParser.parse(RSS[:-len(b'</channel></rss>')])
+
+        with self.assertRaises(FeedStreamParserError):
+            list(feed_data.entries)
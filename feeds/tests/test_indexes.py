@@ -0,0 +1,157 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import QuerySet
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from feeds.models import Feed, FeedItem, FeedSubscription
+from rss.tests import BaseTestCase
+
+User = get_user_model()
+
+USERS = 8
+FEEDS_PER_USER = 5
+ITEMS_PER_FEED = 200
+
+
+class FeedItemIndexesTestCase(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """
+        Seed USERS users with FEEDS_PER_USER feeds each, so lists of a user
+        merge several feeds, with ITEMS_PER_FEED items each and collect
+        planner statistics.
+        """
+        now = timezone.now()
+        users = User.objects.bulk_create(
+            User(username='indexes-{}'.format(i)) for i in range(USERS)
+        )
+        feed_subscriptions = FeedSubscription.objects.bulk_create(
+            FeedSubscription(owner=user, url='http://test.com/{}'.format(i))
+            for user in users
+            for i in range(FEEDS_PER_USER)
+        )
+        feeds = Feed.objects.bulk_create(
+            Feed(subscription=feed_subscription, title='test')
+            for feed_subscription in feed_subscriptions
+        )
+        FeedItem.objects.bulk_create(
+            (
+                FeedItem(
+                    feed=feed,
+                    guid='{}-{}'.format(feed.id, i) if i % 2 else None,
+                    identity_key=FeedItem.get_identity_key(
+                        '{}-{}'.format(feed.id, i),
+                        None,
+                        None
+                    ),
+                    is_read=bool(i % 3),
+                    link='http://test.com/{}/{}'.format(feed.id, i),
+                    owner_id=feed.subscription.owner_id,
+                    pub_date=now - timedelta(hours=i),
+                    title='{}-{}'.format(feed.id, i)
+                )
+                for feed in feeds
+                for i in range(ITEMS_PER_FEED)
+            ),
+            batch_size=1000
+        )
+        cls.user = users[0]
+        cls.feed = feeds[0]
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE feeds_feeditem')
+
+    def assertUsesIndex(self, queryset: QuerySet, index: str) -> None:
+        """
+        Check that query plan of queryset scans the index.
+
+        :param queryset: QuerySet to explain.
+        :param index: Index name.
+        """
+        plan = queryset.explain()
+        self.assertIn(index, plan, plan)
+
+    def test__identity_lookup__use_identity_key_index(self) -> None:
+        self.assertUsesIndex(
+            FeedItem.objects.filter(
+                feed=self.feed,
+                identity_key__in=['1', '2']
+            ),
+            'feeds_feeditem_feed_identity_key'
+        )
+
+    def test__title_lookup__use_title_index(self) -> None:
+        self.assertUsesIndex(
+            FeedItem.objects.filter(feed=self.feed, title='test'),
+            'feeds_feeditem_title_idx'
+        )
+
+    def test__owner_list__use_sort_date_index(self) -> None:
+        self.assertUsesIndex(
+            FeedItem
+            .objects
+            .filter(owner=self.user)
+            .annotate(sort_value=Coalesce('pub_date', 'created'))
+            .order_by('-sort_value', '-id')[:10],
+            'feeds_item_owner_sort_date_idx'
+        )
+
+    def test__owner_list_page__use_sort_date_index(self) -> None:
+        self.assertUsesIndex(
+            FeedItem
+            .objects
+            .filter(owner=self.user)
+            .annotate(sort_value=Coalesce('pub_date', 'created'))
+            .filter(sort_value__lte=timezone.now() - timedelta(hours=100))
+            .order_by('-sort_value', '-id')[:10],
+            'feeds_item_owner_sort_date_idx'
+        )
+
+    def test__owner_unread_list__use_unread_sort_date_index(self) -> None:
+        self.assertUsesIndex(
+            FeedItem
+            .objects
+            .filter(owner=self.user, is_read=False)
+            .annotate(sort_value=Coalesce('pub_date', 'created'))
+            .order_by('-sort_value', '-id')[:10],
+            'feeds_item_owner_unread_sort_date_idx'
+        )
+
+    def test__owner_list__use_created_index(self) -> None:
+        self.assertUsesIndex(
+            FeedItem
+            .objects
+            .filter(owner=self.user)
+            .order_by('-created', '-id')[:10],
+            'feeds_item_owner_created_idx'
+        )
+
+    def test__owner_list_page__use_created_index(self) -> None:
+        self.assertUsesIndex(
+            FeedItem
+            .objects
+            .filter(owner=self.user, created__lte=timezone.now())
+            .order_by('-created', '-id')[:10],
+            'feeds_item_owner_created_idx'
+        )
+
+    def test__owner_list__use_updated_index(self) -> None:
+        self.assertUsesIndex(
+            FeedItem
+            .objects
+            .filter(owner=self.user)
+            .order_by('-updated', '-id')[:10],
+            'feeds_item_owner_updated_idx'
+        )
+
+    def test__owner_list_page__use_updated_index(self) -> None:
+        self.assertUsesIndex(
+            FeedItem
+            .objects
+            .filter(owner=self.user, updated__lte=timezone.now())
+            .order_by('-updated', '-id')[:10],
+            'feeds_item_owner_updated_idx'
+        )
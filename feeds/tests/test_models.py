@@ -1,8 +1,11 @@
+from datetime import timedelta
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
-from feeds.models import FeedItem, FeedSubscription
+from feeds.models import Feed, FeedCounter, FeedItem, FeedSubscription
 from rss.tests import BaseTestCase
 
 User = get_user_model()
@@ -89,6 +92,53 @@ class FeedSubscriptionTestCase(BaseTestCase):
 
         self.assertFalse(self.feed_subscription.is_stopped)
 
+    def test__failure__set_next_retry_at__with_backoff(self) -> None:
+        self.feed_subscription.retries = 2
+        self.feed_subscription.save()
+        now = timezone.now()
+
+        self.feed_subscription.failure()
+        self.feed_subscription.refresh_from_db()
+
+        delay = self.feed_subscription.next_retry_at - now
+        base = settings.FEED_UPDATE_RETRY_BASE * 4
+        jitter = settings.FEED_UPDATE_RETRY_JITTER
+        self.assertGreaterEqual(delay, base * (1 - jitter))
+        self.assertLessEqual(delay, base * (1 + jitter) + timedelta(seconds=1))
+
+    def test__failure__set_next_retry_at__to_probe__if_stopped(self) -> None:
+        self.feed_subscription.retries = settings.MAX_RETRIES - 1
+        self.feed_subscription.save()
+        now = timezone.now()
+
+        self.feed_subscription.failure()
+        self.feed_subscription.refresh_from_db()
+
+        delay = self.feed_subscription.next_retry_at - now
+        probe = settings.FEED_UPDATE_RETRY_PROBE_INTERVAL
+        jitter = settings.FEED_UPDATE_RETRY_JITTER
+        self.assertGreaterEqual(delay, probe * (1 - jitter))
+
+    def test__failure__stop__on_permanent_reason(self) -> None:
+        self.feed_subscription.failure(FeedSubscription.FAILURE_GONE)
+        self.feed_subscription.refresh_from_db()
+
+        self.assertTrue(self.feed_subscription.is_stopped)
+        self.assertIsNone(self.feed_subscription.next_retry_at)
+        self.assertEqual(
+            self.feed_subscription.failure_reason,
+            FeedSubscription.FAILURE_GONE
+        )
+
+    def test__failure__stop__on_repeated_parse_errors(self) -> None:
+        for _ in range(settings.FEED_UPDATE_MAX_PARSE_FAILURES):
+            self.feed_subscription.refresh_from_db()
+            self.assertFalse(self.feed_subscription.is_stopped)
+            self.feed_subscription.failure(FeedSubscription.FAILURE_PARSE)
+
+        self.feed_subscription.refresh_from_db()
+        self.assertTrue(self.feed_subscription.is_stopped)
+
     def test__failure__set_status_to_ready(self) -> None:
         self.feed_subscription.status = FeedSubscription.STATUS_NEW
         self.feed_subscription.save()
@@ -139,6 +189,239 @@ class FeedSubscriptionTestCase(BaseTestCase):
         )
 
 
+class FeedSubscriptionQuerySetTestCase(BaseTestCase):
+    def setUp(self) -> None:
+        """
+        Set self.user and self.feed_subscription before tests.
+        """
+        self.set_user()
+        self.set_feed_subscription()
+        self.feed_subscription.success()
+
+    # claim tests
+    def test__claim__set_status_and_lease(self) -> None:
+        claimed_ids = FeedSubscription.objects.due().claim()
+        self.feed_subscription.refresh_from_db()
+
+        self.assertEqual(claimed_ids, [self.feed_subscription.id])
+        self.assertEqual(
+            self.feed_subscription.status,
+            FeedSubscription.STATUS_IN_PROGRESS
+        )
+        self.assertGreater(
+            self.feed_subscription.lease_expires_at,
+            timezone.now()
+        )
+
+    def test__claim__dont_claim_twice__on_active_lease(self) -> None:
+        FeedSubscription.objects.due().claim()
+
+        self.assertEqual(FeedSubscription.objects.due().claim(), [])
+        self.assertEqual(FeedSubscription.objects.claimable().claim(), [])
+
+    def test__claim__limit_claimed_subscriptions(self) -> None:
+        self.set_additional_user()
+        self.set_additional_feed_subscription()
+        self.additional_feed_subscription.success()
+
+        self.assertEqual(len(FeedSubscription.objects.due().claim(1)), 1)
+        self.assertEqual(len(FeedSubscription.objects.due().claim(1)), 1)
+        self.assertEqual(FeedSubscription.objects.due().claim(1), [])
+
+    # due tests
+    def test__due__include_subscription__on_expired_lease(self) -> None:
+        self.feed_subscription.in_progress()
+        FeedSubscription.objects.update(
+            lease_expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        self.assertIn(self.feed_subscription, FeedSubscription.objects.due())
+
+    def test__due__exclude_subscription__on_active_lease(self) -> None:
+        self.feed_subscription.in_progress()
+
+        self.assertNotIn(
+            self.feed_subscription,
+            FeedSubscription.objects.due()
+        )
+
+    def test__due__exclude_subscription__before_retry_time(self) -> None:
+        self.feed_subscription.failure()
+
+        self.assertNotIn(
+            self.feed_subscription,
+            FeedSubscription.objects.due()
+        )
+
+    def test__due__include_stopped_subscription__on_retry_time(self) -> None:
+        FeedSubscription.objects.update(
+            is_stopped=True,
+            next_retry_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        self.assertIn(self.feed_subscription, FeedSubscription.objects.due())
+
+    def test__due__exclude_stopped_subscription__without_retry_time(
+            self
+    ) -> None:
+        FeedSubscription.objects.update(is_stopped=True)
+
+        self.assertNotIn(
+            self.feed_subscription,
+            FeedSubscription.objects.due()
+        )
+
+    # failure tests
+    def test__failure__increments_retries(self) -> None:
+        old_retries = self.feed_subscription.retries
+
+        FeedSubscription.objects.filter(
+            id=self.feed_subscription.id
+        ).failure()
+        self.feed_subscription.refresh_from_db()
+
+        self.assertEqual(old_retries + 1, self.feed_subscription.retries)
+        self.assertEqual(
+            self.feed_subscription.status,
+            FeedSubscription.STATUS_READY
+        )
+
+    def test__failure__set_next_retry_at__with_backoff(self) -> None:
+        self.feed_subscription.retries = 2
+        self.feed_subscription.save()
+        now = timezone.now()
+
+        FeedSubscription.objects.filter(
+            id=self.feed_subscription.id
+        ).failure()
+        self.feed_subscription.refresh_from_db()
+
+        delay = self.feed_subscription.next_retry_at - now
+        base = settings.FEED_UPDATE_RETRY_BASE * 4
+        jitter = settings.FEED_UPDATE_RETRY_JITTER
+        self.assertGreaterEqual(delay, base * (1 - jitter))
+        self.assertLessEqual(delay, base * (1 + jitter) + timedelta(seconds=1))
+
+    def test__failure__sets_is_stopped__if_retries_exceeded(self) -> None:
+        self.feed_subscription.retries = settings.MAX_RETRIES - 1
+        self.feed_subscription.save()
+
+        FeedSubscription.objects.filter(
+            id=self.feed_subscription.id
+        ).failure()
+        self.feed_subscription.refresh_from_db()
+
+        self.assertTrue(self.feed_subscription.is_stopped)
+
+    def test__failure__is_not_stopped__if_retries_not_exceeded(self) -> None:
+        self.feed_subscription.retries = settings.MAX_RETRIES - 2
+        self.feed_subscription.save()
+
+        FeedSubscription.objects.filter(
+            id=self.feed_subscription.id
+        ).failure()
+        self.feed_subscription.refresh_from_db()
+
+        self.assertFalse(self.feed_subscription.is_stopped)
+
+    def test__failure__stop__on_permanent_reason(self) -> None:
+        FeedSubscription.objects.filter(
+            id=self.feed_subscription.id
+        ).failure(FeedSubscription.FAILURE_NOT_FEED)
+        self.feed_subscription.refresh_from_db()
+
+        self.assertTrue(self.feed_subscription.is_stopped)
+        self.assertIsNone(self.feed_subscription.next_retry_at)
+
+    def test__failure__stop__on_repeated_parse_errors(self) -> None:
+        queryset = FeedSubscription.objects.filter(
+            id=self.feed_subscription.id
+        )
+
+        for _ in range(settings.FEED_UPDATE_MAX_PARSE_FAILURES):
+            self.assertFalse(queryset.get().is_stopped)
+            queryset.failure(FeedSubscription.FAILURE_PARSE)
+
+        self.assertTrue(queryset.get().is_stopped)
+        self.assertIsNone(queryset.get().next_retry_at)
+
+    # in_progress tests
+    def test__in_progress__set_status_to_in_progress(self) -> None:
+        FeedSubscription.objects.filter(
+            id=self.feed_subscription.id
+        ).in_progress()
+        self.feed_subscription.refresh_from_db()
+
+        self.assertEqual(
+            self.feed_subscription.status,
+            FeedSubscription.STATUS_IN_PROGRESS
+        )
+
+
+class FeedTestCase(BaseTestCase):
+    def setUp(self) -> None:
+        """
+        Set self.user and self.feed before tests.
+        """
+        self.set_user()
+        self.set_feed_subscription()
+        self.set_feed()
+
+    # add_items tests
+    def test__add_items__increment_counters(self) -> None:
+        self.feed.add_items(2)
+        self.feed.add_items(3)
+        self.feed.refresh_from_db()
+
+        self.assertEqual(self.feed.item_count, 5)
+        self.assertEqual(self.feed.unread_count, 5)
+
+    def test__add_items__increment_owner_counters(self) -> None:
+        self.feed.add_items(2)
+
+        feed_counter = FeedCounter.objects.get(owner=self.user)
+
+        self.assertEqual(feed_counter.feed_count, 1)
+        self.assertEqual(feed_counter.item_count, 2)
+        self.assertEqual(feed_counter.unread_count, 2)
+
+    def test__add_items__dont_query__on_zero_count(self) -> None:
+        with self.assertNumQueries(0):
+            self.feed.add_items(0)
+
+    # delete tests
+    def test__delete__subtract_owner_counters(self) -> None:
+        feed = Feed.objects.create(
+            subscription=FeedSubscription.objects.create(
+                owner=self.user,
+                url='http://test2.com'
+            ),
+            title='test2'
+        )
+        self.feed.add_items(2)
+        feed.add_items(3)
+        self.feed.refresh_from_db()
+
+        self.feed.delete()
+        feed_counter = FeedCounter.objects.get(owner=self.user)
+
+        self.assertEqual(feed_counter.feed_count, 1)
+        self.assertEqual(feed_counter.item_count, 3)
+        self.assertEqual(feed_counter.unread_count, 3)
+
+    def test__delete__subtract_owner_counters__on_subscription_delete(
+            self
+    ) -> None:
+        self.feed.add_items(2)
+
+        self.feed_subscription.delete()
+        feed_counter = FeedCounter.objects.get(owner=self.user)
+
+        self.assertEqual(feed_counter.feed_count, 0)
+        self.assertEqual(feed_counter.item_count, 0)
+        self.assertEqual(feed_counter.unread_count, 0)
+
+
 class FeedItemTestCase(BaseTestCase):
     def setUp(self) -> None:
         """
@@ -198,3 +481,85 @@ class FeedItemTestCase(BaseTestCase):
             feed_item.clean()
         except ValueError:
             self.fail('clean() raised ValueError unexpectedly.')
+
+    # get_identity_key tests
+    def test__get_identity_key__use_guid__if_exists(self) -> None:
+        self.assertEqual(
+            FeedItem.get_identity_key('guid', 'link1', 'title1'),
+            FeedItem.get_identity_key('guid', 'link2', 'title2')
+        )
+
+    def test__get_identity_key__use_link__if_no_guid(self) -> None:
+        self.assertEqual(
+            FeedItem.get_identity_key(None, 'link', 'title1'),
+            FeedItem.get_identity_key(None, 'link', 'title2')
+        )
+
+    def test__get_identity_key__differ__for_same_guid_and_link(self) -> None:
+        self.assertNotEqual(
+            FeedItem.get_identity_key('value', None, 'title'),
+            FeedItem.get_identity_key(None, 'value', 'title')
+        )
+
+    # save tests
+    def test__save__set_identity_key__if_not_set(self) -> None:
+        self.assertEqual(
+            self.feed_item.identity_key,
+            FeedItem.get_identity_key(
+                self.feed_item.guid,
+                self.feed_item.link,
+                self.feed_item.title
+            )
+        )
+
+    # mark_read tests
+    def test__mark_read__decrement_unread_count__on_unread_item(self) -> None:
+        self.feed.add_items(1)
+
+        is_changed = self.feed_item.mark_read()
+        self.feed.refresh_from_db()
+        self.feed_item.refresh_from_db()
+
+        self.assertTrue(is_changed)
+        self.assertTrue(self.feed_item.is_read)
+        self.assertEqual(self.feed.item_count, 1)
+        self.assertEqual(self.feed.unread_count, 0)
+
+    def test__mark_read__decrement_owner_unread_count__on_unread_item(
+            self
+    ) -> None:
+        self.feed.add_items(1)
+
+        self.feed_item.mark_read()
+        feed_counter = FeedCounter.objects.get(owner=self.user)
+
+        self.assertEqual(feed_counter.item_count, 1)
+        self.assertEqual(feed_counter.unread_count, 0)
+
+    def test__mark_read__keep_unread_count__on_not_counted_item(self) -> None:
+        feed = Feed.objects.create(
+            subscription=FeedSubscription.objects.create(
+                owner=self.user,
+                url='http://test2.com'
+            ),
+            title='test2'
+        )
+        feed.add_items(1)
+
+        is_changed = self.feed_item.mark_read()
+        self.feed.refresh_from_db()
+        feed_counter = FeedCounter.objects.get(owner=self.user)
+
+        self.assertTrue(is_changed)
+        self.assertEqual(self.feed.unread_count, 0)
+        self.assertEqual(feed_counter.unread_count, 1)
+
+    def test__mark_read__dont_change_counters__on_read_item(self) -> None:
+        self.feed.add_items(1)
+        self.feed_item.mark_read()
+
+        is_changed = self.feed_item.mark_read()
+        self.feed.refresh_from_db()
+
+        self.assertFalse(is_changed)
+        self.assertEqual(self.feed.unread_count, 0)
@@ -0,0 +1,264 @@
+from datetime import timedelta
+from typing import List
+from unittest import mock
+
+from celery.exceptions import SoftTimeLimitExceeded
+from django.test import override_settings
+from django.utils import timezone
+
+from feeds.models import FeedItem, FeedSubscription
+from feeds.tasks import (
+    delay_update_feed_items,
+    update_feed_items,
+    update_feeds,
+    update_feeds_batch
+)
+from feeds.tests.feedserver import FeedServer
+from rss.tests import BaseTestCase
+
+
+class UpdateFeedsTestCase(BaseTestCase):
+    def setUp(self) -> None:
+        """
+        Set self.user and self.feed_subscription before tests.
+        """
+        self.set_user()
+        self.set_feed_subscription()
+        self.feed_subscription.success()
+
+    # update_feeds tests
+    @mock.patch('feeds.tasks.update_feeds_batch.delay')
+    def test__update_feeds__dispatch__on_due_subscription(
+            self,
+            delay: mock.Mock
+    ) -> None:
+        self.feed_subscription.next_fetch_at = timezone.now()
+        self.feed_subscription.save()
+
+        update_feeds()
+
+        delay.assert_called_once_with([self.feed_subscription.id])
+
+    @mock.patch('feeds.tasks.update_feeds_batch.delay')
+    def test__update_feeds__dont_dispatch__on_not_due_subscription(
+            self,
+            delay: mock.Mock
+    ) -> None:
+        self.feed_subscription.next_fetch_at = (
+            timezone.now() + timedelta(minutes=1)
+        )
+        self.feed_subscription.save()
+
+        update_feeds()
+
+        delay.assert_not_called()
+
+    @mock.patch('feeds.tasks.update_feeds_batch.delay')
+    def test__update_feeds__dont_dispatch__on_claimed_subscription(
+            self,
+            delay: mock.Mock
+    ) -> None:
+        update_feeds()
+        update_feeds()
+
+        delay.assert_called_once_with([self.feed_subscription.id])
+
+    @mock.patch('feeds.tasks.update_feeds_batch.delay')
+    def test__update_feeds__dispatch__on_expired_lease(
+            self,
+            delay: mock.Mock
+    ) -> None:
+        self.feed_subscription.in_progress()
+        FeedSubscription.objects.update(
+            lease_expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        update_feeds()
+
+        delay.assert_called_once_with([self.feed_subscription.id])
+
+    @mock.patch('feeds.tasks.update_feeds_batch.delay')
+    def test__update_feeds__split_subscriptions_into_batches(
+            self,
+            delay: mock.Mock
+    ) -> None:
+        self.set_additional_user()
+        self.set_additional_feed_subscription()
+        self.additional_feed_subscription.success()
+
+        with self.settings(FEED_UPDATE_BATCH_SIZE=1):
+            update_feeds()
+
+        self.assertEqual(delay.call_count, 2)
+
+
+class UpdateFeedsBatchTestCase(BaseTestCase):
+    def setUp(self) -> None:
+        """
+        Set self.user before tests.
+        """
+        self.set_user()
+
+    # update_feeds_batch tests
+    def test__update_feeds_batch__save_feeds_and_items(self) -> None:
+        with FeedServer() as server:
+            feed_subscriptions = [
+                FeedSubscription.objects.create(
+                    owner=self.user,
+                    url=server.get_url(path)
+                )
+                for path in ('/test', '/missing')
+            ]
+
+            update_feeds_batch([
+                feed_subscription.id
+                for feed_subscription in feed_subscriptions
+            ])
+
+        for feed_subscription in feed_subscriptions:
+            feed_subscription.refresh_from_db()
+
+        self.assertEqual(
+            FeedItem.objects.filter(
+                feed__subscription=feed_subscriptions[0]
+            ).count(),
+            2
+        )
+        self.assertEqual(feed_subscriptions[0].retries, 0)
+        self.assertEqual(feed_subscriptions[1].retries, 1)
+        self.assertEqual(
+            {
+                feed_subscription.status
+                for feed_subscription in feed_subscriptions
+            },
+            {FeedSubscription.STATUS_READY}
+        )
+
+    def _update_feeds_batch(self, paths: List[str]) -> List[FeedSubscription]:
+        """
+        Run update_feeds_batch for new subscriptions of FeedServer paths.
+
+        :param paths: Url paths of the subscriptions.
+        :return: List of refreshed FeedSubscription instances.
+        """
+        with FeedServer() as server:
+            feed_subscriptions = [
+                FeedSubscription.objects.create(
+                    owner=self.user,
+                    url=server.get_url(path)
+                )
+                for path in paths
+            ]
+
+            update_feeds_batch([
+                feed_subscription.id
+                for feed_subscription in feed_subscriptions
+            ])
+
+        for feed_subscription in feed_subscriptions:
+            feed_subscription.refresh_from_db()
+
+        return feed_subscriptions
+
+    @mock.patch(
+        'feeds.tasks.FeedItemUpdater.update_many',
+        side_effect=ValueError('test')
+    )
+    def test__update_feeds_batch__reset_validators__on_items_failure(
+            self,
+            update_many: mock.Mock
+    ) -> None:
+        feed_subscription, = self._update_feeds_batch(['/test'])
+
+        self.assertIsNone(feed_subscription.content_hash)
+        self.assertIsNone(feed_subscription.etag)
+        self.assertIsNone(feed_subscription.last_modified)
+
+    @mock.patch(
+        'feeds.tasks.FeedItemUpdater.update_many',
+        side_effect=SoftTimeLimitExceeded()
+    )
+    def test__update_feeds_batch__reset_validators_of_rest__on_timeout(
+            self,
+            update_many: mock.Mock
+    ) -> None:
+        feed_subscriptions = self._update_feeds_batch(['/test1', '/test2'])
+
+        self.assertEqual(update_many.call_count, 1)
+        self.assertEqual(
+            [
+                feed_subscription.etag
+                for feed_subscription in feed_subscriptions
+            ],
+            [None, None]
+        )
+
+    def test__update_feeds_batch__keep_validators__on_items_success(
+            self
+    ) -> None:
+        feed_subscription, = self._update_feeds_batch(['/test'])
+
+        self.assertIsNotNone(feed_subscription.content_hash)
+        self.assertIsNotNone(feed_subscription.etag)
+
+
+class UpdateFeedItemsTestCase(BaseTestCase):
+    def setUp(self) -> None:
+        """
+        Set self.feed_subscription and self.feed before tests.
+        """
+        self.set_user()
+        self.set_feed_subscription()
+        self.set_feed()
+        self.feed_subscription.content_hash = 'test'
+        self.feed_subscription.etag = 'test'
+        self.feed_subscription.last_modified = 'test'
+        self.feed_subscription.save()
+
+    # update_feed_items tests
+    @mock.patch(
+        'feeds.tasks.FeedItemUpdater.update_many',
+        side_effect=ValueError('test')
+    )
+    def test__update_feed_items__reset_validators__on_failure(
+            self,
+            update_many: mock.Mock
+    ) -> None:
+        update_feed_items(self.feed.id, [{'title': 'test'}])
+        self.feed_subscription.refresh_from_db()
+
+        self.assertIsNone(self.feed_subscription.content_hash)
+        self.assertIsNone(self.feed_subscription.etag)
+        self.assertIsNone(self.feed_subscription.last_modified)
+
+    def test__update_feed_items__keep_validators__on_success(self) -> None:
+        update_feed_items(self.feed.id, [{'title': 'test'}])
+        self.feed_subscription.refresh_from_db()
+
+        self.assertEqual(self.feed_subscription.etag, 'test')
+
+
+class DelayUpdateFeedItemsTestCase(BaseTestCase):
+    # delay_update_feed_items tests
+    @override_settings(FEED_ITEMS_COMPRESS_SIZE=1024)
+    @mock.patch('feeds.tasks.update_feed_items.apply_async')
+    def test__delay_update_feed_items__dont_compress__small_message(
+            self,
+            apply_async: mock.Mock
+    ) -> None:
+        delay_update_feed_items(1, [{'title': 'test'}])
+
+        apply_async.assert_called_once_with(
+            (1, [{'title': 'test'}]),
+            compression=None
+        )
+
+    @override_settings(FEED_ITEMS_COMPRESS_SIZE=10)
+    @mock.patch('feeds.tasks.update_feed_items.apply_async')
+    def test__delay_update_feed_items__compress__large_message(
+            self,
+            apply_async: mock.Mock
+    ) -> None:
+        delay_update_feed_items(1, [{'title': 'test' * 10}])
+
+        self.assertEqual(apply_async.call_args[1], {'compression': 'zlib'})
@@ -1,16 +1,29 @@
+import tempfile
 from datetime import datetime
 from time import struct_time
+from unittest import mock
 
-import vcr
+from celery.exceptions import SoftTimeLimitExceeded
+from django.db import connection, IntegrityError
+from django.test import override_settings
+from django.utils import timezone
 from feedparser.util import FeedParserDict
 
-from feeds.models import FeedCategory, FeedItemCategory, FeedSubscription
+from feeds.models import (
+    FeedCategory,
+    FeedItem,
+    FeedItemCategory,
+    FeedSubscription
+)
+from feeds.tests.feedserver import ETAG, FeedServer, LAST_MODIFIED
+from feeds.utils.feedfetcher import FeedFetcherError, FeedFetchResponse
 from feeds.utils.feedupdater import (
     BaseFeedUpdater,
     FeedItemUpdater,
     FeedUpdater,
     FeedUpdaterDoesntExistError,
-    FeedUpdaterInvalidRSSError
+    FeedUpdaterInvalidRSSError,
+    FeedUpdaterPostponedError
 )
 from rss.tests import BaseTestCase
 
@@ -70,11 +83,25 @@ class FeedItemUpdaterTestCase(BaseTestCase):
             'title': title
         }
 
-        feed_item = FeedItemUpdater._update_feed_item(self.feed, data)
+        feed_item, _ = FeedItemUpdater._update_feed_item(self.feed, data)
 
         self.assertNotEqual(feed_item.id, self.feed_item.id)
         self.assertEqual(feed_item.title, title)
 
+    def test__update_feed_item__increment_counters__if_not_exists(
+            self
+    ) -> None:
+        data = {
+            'title': 'test2'
+        }
+
+        FeedItemUpdater._update_feed_item(self.feed, data)
+        FeedItemUpdater._update_feed_item(self.feed, data)
+        self.feed.refresh_from_db()
+
+        self.assertEqual(self.feed.item_count, 1)
+        self.assertEqual(self.feed.unread_count, 1)
+
     def test__update_feed_item__update__if_guid_exists(self) -> None:
         title = 'test2'
         data = {
@@ -87,17 +114,46 @@ class FeedItemUpdaterTestCase(BaseTestCase):
 
         self.assertEqual(self.feed_item.title, title)
 
-    def test__update_feed_item__update__if_title_exists(self) -> None:
+    def test__update_feed_item__update__if_link_exists(self) -> None:
         link = 'link'
+        feed_item = FeedItem.objects.create(
+            feed=self.feed,
+            link=link,
+            title='test2'
+        )
+        title = 'test3'
         data = {
             'link': link,
-            'title': self.feed_item.title
+            'title': title
         }
 
         FeedItemUpdater._update_feed_item(self.feed, data)
-        self.feed_item.refresh_from_db()
+        feed_item.refresh_from_db()
+
+        self.assertEqual(feed_item.title, title)
+
+    def test__update_feed_item__update__if_title_exists(self) -> None:
+        feed_item = FeedItem.objects.create(feed=self.feed, title='test2')
+        author = 'author'
+        data = {
+            'author': author,
+            'title': feed_item.title
+        }
+
+        FeedItemUpdater._update_feed_item(self.feed, data)
+        feed_item.refresh_from_db()
+
+        self.assertEqual(feed_item.author, author)
+
+    def test__update_feed_item__create__if_guid_differs(self) -> None:
+        data = {
+            'id': 'guid2',
+            'title': self.feed_item.title
+        }
 
-        self.assertEqual(self.feed_item.link, link)
+        feed_item, _ = FeedItemUpdater._update_feed_item(self.feed, data)
+
+        self.assertNotEqual(feed_item.id, self.feed_item.id)
 
     # _update_categories tests
     def test__update_categories__replace_old_categories_with_new(self) -> None:
@@ -123,6 +179,37 @@ class FeedItemUpdaterTestCase(BaseTestCase):
         ).first()
         self.assertEqual(feed_item_category.keyword, new_keyword)
 
+    def test__update_categories__keep_unchanged_categories(self) -> None:
+        feed_item_category = FeedItemCategory.objects.create(
+            item=self.feed_item,
+            keyword='keyword'
+        )
+        data = {
+            'tags': [{
+                'term': 'keyword',
+            }]
+        }
+
+        # Only stored categories are selected, nothing is written
+        with self.assertNumQueries(1):
+            FeedItemUpdater._update_categories(self.feed_item, data)
+
+        category_ids = list(
+            FeedItemCategory
+            .objects
+            .filter(item=self.feed_item)
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(category_ids, [feed_item_category.id])
+
+    def test__update_feed_item__dont_save__on_same_fingerprint(self) -> None:
+        data = {'id': self.feed_item.guid, 'title': 'test2'}
+        FeedItemUpdater._update_feed_item(self.feed, data)
+
+        _, is_changed = FeedItemUpdater._update_feed_item(self.feed, data)
+
+        self.assertFalse(is_changed)
+
     # update tests
     def test__update__return_feed_item__on_valid_data(self) -> None:
         data = {
@@ -133,6 +220,127 @@ class FeedItemUpdaterTestCase(BaseTestCase):
 
         self.assertEqual(self.feed_item.id, feed_item.id)
 
+    # update_many tests
+    def test__update_many__create_and_update_items(self) -> None:
+        data = [
+            {'id': self.feed_item.guid, 'title': 'test2'},
+            {'title': 'test3'},
+        ]
+
+        feed_items = FeedItemUpdater.update_many(self.feed.id, data)
+        self.feed_item.refresh_from_db()
+
+        self.assertEqual(len(feed_items), 2)
+        self.assertEqual(self.feed_item.title, 'test2')
+        self.assertEqual(FeedItem.objects.filter(feed=self.feed).count(), 2)
+
+    def test__update_many__skip_item__on_same_fingerprint(self) -> None:
+        data = [{'id': self.feed_item.guid, 'title': 'test2'}]
+        FeedItemUpdater.update_many(self.feed.id, data)
+        self.feed_item.refresh_from_db()
+        old_updated = self.feed_item.updated
+
+        feed_items = FeedItemUpdater.update_many(self.feed.id, data)
+        self.feed_item.refresh_from_db()
+
+        self.assertEqual(feed_items, [])
+        self.assertEqual(self.feed_item.updated, old_updated)
+
+    def test__update_many__skip_item__on_duplicated_link(self) -> None:
+        self.feed_item.link = 'link'
+        self.feed_item.save()
+        data = [
+            {'id': 'test2', 'link': 'link', 'title': 'test2'},
+        ]
+
+        feed_items = FeedItemUpdater.update_many(self.feed.id, data)
+
+        self.assertEqual(feed_items, [])
+        self.assertEqual(FeedItem.objects.filter(feed=self.feed).count(), 1)
+
+    def test__update_many__replace_old_categories_with_new(self) -> None:
+        FeedItemCategory.objects.create(
+            item=self.feed_item,
+            keyword='old_keyword'
+        )
+        data = [{
+            'id': self.feed_item.guid,
+            'tags': [{'term': 'keyword'}],
+            'title': self.feed_item.title
+        }]
+
+        FeedItemUpdater.update_many(self.feed.id, data)
+
+        keywords = list(
+            FeedItemCategory
+            .objects
+            .filter(item=self.feed_item)
+            .values_list('keyword', flat=True)
+        )
+        self.assertEqual(keywords, ['keyword'])
+
+    def test__update_many__skip_item__if_link_exists(self) -> None:
+        link = 'link'
+        FeedItem.objects.create(
+            feed=self.feed,
+            guid='guid1',
+            link=link,
+            title='test2'
+        )
+        data = [{
+            'id': 'guid2',
+            'link': link,
+            'title': 'test3'
+        }]
+
+        FeedItemUpdater.update_many(self.feed.id, data)
+
+        self.assertFalse(
+            FeedItem.objects.filter(feed=self.feed, guid='guid2').exists()
+        )
+
+    def test__update_many__update_item__if_title_exists(self) -> None:
+        author = 'author'
+        data = [{'author': author, 'title': self.feed_item.title}]
+
+        FeedItemUpdater.update_many(self.feed.id, data)
+        self.feed_item.refresh_from_db()
+
+        self.assertEqual(self.feed_item.author, author)
+        self.assertEqual(FeedItem.objects.filter(feed=self.feed).count(), 1)
+
+    def test__update_many__increment_counters__on_created_items(
+            self
+    ) -> None:
+        data = [
+            {'id': self.feed_item.guid, 'title': 'test2'},
+            {'id': 'guid1', 'title': 'test3'},
+            {'id': 'guid2', 'title': 'test4'}
+        ]
+
+        FeedItemUpdater.update_many(self.feed.id, data)
+        FeedItemUpdater.update_many(self.feed.id, data)
+        self.feed.refresh_from_db()
+
+        self.assertEqual(self.feed.item_count, 2)
+        self.assertEqual(self.feed.unread_count, 2)
+
+    def test__update_many__dont_depend_on_items_count(self) -> None:
+        data = [
+            {
+                'id': 'guid{}'.format(i),
+                'tags': [{'term': 'keyword'}],
+                'title': 'title{}'.format(i)
+            }
+            for i in range(50)
+        ]
+
+        # savepoint, feed, existing items, bulk insert, inserted ids, feed
+        # counters, owner counters, stored categories, categories insert
+        # and savepoint release
+        with self.assertNumQueries(10):
+            FeedItemUpdater.update_many(self.feed.id, data)
+
 
 class FeedUpdaterTestCase(BaseTestCase):
     def setUp(self) -> None:
@@ -159,26 +367,104 @@ class FeedUpdaterTestCase(BaseTestCase):
         with self.assertRaises(FeedUpdaterInvalidRSSError):
             FeedUpdater._get_feed_data('invalid_url')
 
-    @vcr.use_cassette(
-        'feeds/tests/vcr_cassettes/'
-        'test__get_feed_data__raise_exception__on_not_rss_url.yaml'
-    )
     def test__get_feed_data__raise_exception__on_not_rss_url(self) -> None:
-        with self.assertRaises(FeedUpdaterInvalidRSSError):
-            FeedUpdater._get_feed_data('https://www.google.com/')
+        with FeedServer() as server:
+            with self.assertRaises(FeedUpdaterInvalidRSSError):
+                FeedUpdater._get_feed_data(server.get_url('/html'))
 
-    @vcr.use_cassette(
-        'feeds/tests/vcr_cassettes/'
-        'test__get_feed_data__dont_raise_exception__on_valid_url.yaml'
-    )
     def test__get_feed_data__dont_raise_exception__on_valid_url(self) -> None:
         try:
-            FeedUpdater._get_feed_data('http://www.nu.nl/rss/Algemeen')
+            with FeedServer() as server:
+                FeedUpdater._get_feed_data(server.get_url('/test'))
         except FeedUpdaterInvalidRSSError:
             self.fail(
                 'clean() raised FeedUpdaterInvalidRSSError unexpectedly.'
             )
 
+    # _get_skip_values tests
+    def test__get_skip_values__return_all_nested_values(self) -> None:
+        content = (
+            b'<rss><channel><skipHours><hour>1</hour><hour>2</hour>'
+            b'</skipHours></channel></rss>'
+        )
+
+        values = FeedUpdater._get_skip_values(content, 'skipHours')
+
+        self.assertEqual(values, ['1', '2'])
+
+    def test__get_skip_values__return_empty_list__if_not_set(self) -> None:
+        values = FeedUpdater._get_skip_values(b'<rss></rss>', 'skipDays')
+
+        self.assertEqual(values, [])
+
+    # _parse_compact_content tests
+    def test__parse_compact_content__keep_only_persisted_data(self) -> None:
+        response = FeedFetchResponse(
+            content=(
+                b'<rss version="2.0"><channel><title>test</title>'
+                b'<item><title>item</title><guid>1</guid></item>'
+                b'</channel></rss>'
+            ),
+            headers={},
+            status=200,
+            url='http://test/rss'
+        )
+
+        feed_data = FeedUpdater._parse_compact_content(response)
+
+        entry, = feed_data.entries
+        self.assertEqual(feed_data.version, 'rss20')
+        self.assertEqual(feed_data.feed['title'], 'test')
+        self.assertNotIn('title_detail', feed_data.feed)
+        self.assertEqual(entry['title'], 'item')
+        self.assertNotIn('title_detail', entry)
+        self.assertTrue(set(entry).issubset(FeedUpdater.ENTRY_KEYS))
+
+    def test__parse_compact_content__fail__on_invalid_streamed_items(
+            self
+    ) -> None:
+        response = FeedFetchResponse(
+            content=(
+                b'<rss version="2.0"><channel><title>test</title>'
+                b'<item><title>item</title><guid>1</guid>'
+            ),
+            headers={},
+            status=200,
+            url='http://test/rss'
+        )
+
+        feed_data = FeedUpdater._parse_compact_content(
+            response,
+            FeedSubscription.PARSER_STREAM
+        )
+
+        self.assertTrue(feed_data.bozo)
+        self.assertEqual(feed_data.entries, [])
+
+    # _get_compact_entry tests
+    def test__get_compact_entry__keep_only_used_values(self) -> None:
+        entry = FeedParserDict(
+            author=None,
+            links=[
+                {'href': 'http://test.com', 'rel': 'alternate'},
+                {'href': 'http://test.com/1', 'rel': 'enclosure'},
+                {'href': 'http://test.com/2', 'rel': 'enclosure'}
+            ],
+            summary='<p>test</p>',
+            summary_detail={'type': 'text/html', 'value': '<p>test</p>'},
+            tags=[{'term': 'test', 'scheme': None, 'label': None, 'x': 1}],
+            title='test'
+        )
+
+        compact_entry = FeedUpdater._get_compact_entry(entry)
+
+        self.assertEqual(compact_entry, {
+            'enclosures': [{'href': 'http://test.com/1'}],
+            'summary': '<p>test</p>',
+            'tags': [{'label': None, 'scheme': None, 'term': 'test'}],
+            'title': 'test'
+        })
+
     # _update_categories tests
     def test__update_categories__replace_old_categories_with_new(self) -> None:
         FeedCategory.objects.create(
@@ -201,6 +487,32 @@ class FeedUpdaterTestCase(BaseTestCase):
         feed_category = FeedCategory.objects.filter(feed=self.feed).first()
         self.assertEqual(feed_category.keyword, new_keyword)
 
+    def test__update_categories__delete_only_stale_categories(self) -> None:
+        feed_category = FeedCategory.objects.create(
+            feed=self.feed,
+            domain='domain',
+            keyword='keyword'
+        )
+        FeedCategory.objects.create(feed=self.feed, keyword='old_keyword')
+        feed_data = FeedParserDict({
+            'feed': {
+                'tags': [{
+                    'scheme': 'domain',
+                    'term': 'keyword',
+                }]
+            }
+        })
+
+        FeedUpdater._update_categories(self.feed, feed_data)
+
+        category_ids = list(
+            FeedCategory
+            .objects
+            .filter(feed=self.feed)
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(category_ids, [feed_category.id])
+
     # _update_feed tests
     def test__update_feed__creates_feed__if_relation_is_missing(self) -> None:
         self.feed.delete()
@@ -229,33 +541,435 @@ class FeedUpdaterTestCase(BaseTestCase):
         self.assertEqual(self.feed.title, title)
 
     # update tests
-    @vcr.use_cassette(
-        'feeds/tests/vcr_cassettes/'
-        'test__update__save_and_return_data__on_valid_rss.yaml'
-    )
     def test__update__save_and_return_data__on_valid_rss(self) -> None:
-        feed_subscription = FeedSubscription.objects.create(
-            owner=self.user,
-            url='http://www.nu.nl/rss/Algemeen'
-        )
+        with FeedServer() as server:
+            feed_subscription = FeedSubscription.objects.create(
+                owner=self.user,
+                url=server.get_url('/test')
+            )
 
-        feed, feed_data = FeedUpdater.update(feed_subscription.id)
+            feed, feed_data = FeedUpdater.update(feed_subscription.id)
 
         self.assertIsNotNone(feed.id)
         self.assertTrue(bool(feed_data))
 
-    @vcr.use_cassette(
-        'feeds/tests/vcr_cassettes/'
-        'test__update__fail__on_invalid_rss.yaml'
-    )
+    def test__update__save_validators__on_valid_rss(self) -> None:
+        with FeedServer() as server:
+            feed_subscription = FeedSubscription.objects.create(
+                owner=self.user,
+                url=server.get_url('/test')
+            )
+
+            FeedUpdater.update(feed_subscription.id)
+
+        feed_subscription.refresh_from_db()
+        self.assertEqual(feed_subscription.etag, ETAG)
+        self.assertEqual(feed_subscription.last_modified, LAST_MODIFIED)
+
+    def test__update__skip_feed_update__on_not_modified(self) -> None:
+        old_updated = self.feed.updated
+
+        with FeedServer() as server:
+            self.feed_subscription.url = server.get_url('/test')
+            self.feed_subscription.last_modified = LAST_MODIFIED
+            self.feed_subscription.save()
+
+            feed, feed_data = FeedUpdater.update(self.feed_subscription.id)
+        self.feed.refresh_from_db()
+        self.feed_subscription.refresh_from_db()
+
+        self.assertIsNone(feed)
+        self.assertFalse(bool(feed_data))
+        self.assertEqual(self.feed.updated, old_updated)
+        self.assertEqual(
+            self.feed_subscription.status,
+            FeedSubscription.STATUS_READY
+        )
+
     def test__update__fail__on_invalid_rss(self) -> None:
+        with FeedServer() as server:
+            feed_subscription = FeedSubscription.objects.create(
+                owner=self.user,
+                url=server.get_url('/html')
+            )
+
+            with self.assertRaises(FeedUpdaterInvalidRSSError):
+                FeedUpdater.update(feed_subscription.id)
+
+        feed_subscription.refresh_from_db()
+        self.assertEqual(feed_subscription.retries, 1)
+
+    def test__update__fetch__outside_transaction(self) -> None:
+        savepoints = len(connection.savepoint_ids)
+        fetch_savepoints = []
+
+        def fetch_many(requests: list) -> list:
+            fetch_savepoints.append(len(connection.savepoint_ids))
+            return [FeedFetcherError('test') for _ in requests]
+
+        with mock.patch(
+                'feeds.utils.feedupdater.FeedFetcher.fetch_many',
+                side_effect=fetch_many
+        ):
+            with self.assertRaises(FeedUpdaterInvalidRSSError):
+                FeedUpdater.update(self.feed_subscription.id)
+
+        self.assertEqual(fetch_savepoints, [savepoints])
+
+    # reingest tests
+    def test__reingest__update_feed__from_archived_fetch(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(FEED_ARCHIVE_DIR=directory):
+                with FeedServer() as server:
+                    feed_subscription = FeedSubscription.objects.create(
+                        owner=self.user,
+                        url=server.get_url('/test')
+                    )
+                    FeedUpdater.update(feed_subscription.id)
+
+                feed_subscription.feed.title = 'changed'
+                feed_subscription.feed.save()
+                feed_payload = feed_subscription.payloads.get()
+
+                feed, feed_items_data = FeedUpdater.reingest(feed_payload.id)
+
+        self.assertEqual(feed.title, 'test')
+        self.assertEqual(len(feed_items_data), 2)
+
+    def test__reingest__raise__if_not_exists(self) -> None:
+        with self.assertRaises(FeedUpdaterDoesntExistError):
+            FeedUpdater.reingest(0)
+
+    # update_many tests
+    def test__update_many__update_all_feeds__on_valid_rss(self) -> None:
+        with FeedServer() as server:
+            feed_subscriptions = [
+                FeedSubscription.objects.create(
+                    owner=self.user,
+                    url=server.get_url('/test{}'.format(i))
+                )
+                for i in range(3)
+            ]
+
+            results = FeedUpdater.update_many(
+                feed_subscription.id
+                for feed_subscription in feed_subscriptions
+            )
+
+        for i, feed_subscription in enumerate(feed_subscriptions):
+            feed, feed_items_data = results[feed_subscription.id]
+            self.assertEqual(feed.title, 'test{}'.format(i))
+            self.assertEqual(len(feed_items_data), 2)
+
+    def test__update_many__count_bytes_transferred(self) -> None:
+        with FeedServer() as server:
+            feed_subscription = FeedSubscription.objects.create(
+                owner=self.user,
+                url=server.get_url('/test')
+            )
+
+            FeedUpdater.update_many([feed_subscription.id])
+
+        feed_subscription.refresh_from_db()
+        self.assertGreater(feed_subscription.bytes_transferred, 0)
+
+    def test__update_many__reset_failure_reason__on_success(self) -> None:
+        with FeedServer() as server:
+            feed_subscription = FeedSubscription.objects.create(
+                failure_reason=FeedSubscription.FAILURE_UNKNOWN,
+                owner=self.user,
+                retries=1,
+                url=server.get_url('/test')
+            )
+
+            FeedUpdater.update_many([feed_subscription.id])
+
+        feed_subscription.refresh_from_db()
+        self.assertIsNone(feed_subscription.failure_reason)
+        self.assertEqual(feed_subscription.retries, 0)
+
+    def test__update_many__schedule_next_fetch(self) -> None:
+        with FeedServer() as server:
+            feed_subscription = FeedSubscription.objects.create(
+                owner=self.user,
+                url=server.get_url('/test')
+            )
+
+            FeedUpdater.update_many([feed_subscription.id])
+
+        feed_subscription.refresh_from_db()
+        self.assertIsNotNone(feed_subscription.fetch_interval)
+        self.assertGreater(feed_subscription.next_fetch_at, timezone.now())
+
+    def test__update_many__fail_only_invalid_feeds(self) -> None:
+        with FeedServer() as server:
+            valid_feed_subscription = FeedSubscription.objects.create(
+                owner=self.user,
+                url=server.get_url('/test')
+            )
+            invalid_feed_subscription = FeedSubscription.objects.create(
+                owner=self.user,
+                url=server.get_url('/missing')
+            )
+
+            results = FeedUpdater.update_many([
+                valid_feed_subscription.id,
+                invalid_feed_subscription.id
+            ])
+
+        invalid_feed_subscription.refresh_from_db()
+        self.assertIsInstance(
+            results[invalid_feed_subscription.id],
+            FeedUpdaterInvalidRSSError
+        )
+        self.assertEqual(invalid_feed_subscription.retries, 1)
+        feed, _ = results[valid_feed_subscription.id]
+        self.assertIsNotNone(feed.id)
+
+    def test__update_many__save_feeds__with_stream_parser(self) -> None:
+        with FeedServer() as server:
+            feed_subscription = FeedSubscription.objects.create(
+                owner=self.user,
+                parser=FeedSubscription.PARSER_STREAM,
+                url=server.get_url('/test')
+            )
+
+            results = FeedUpdater.update_many([feed_subscription.id])
+
+        feed, feed_items_data = results[feed_subscription.id]
+        self.assertEqual(feed.title, 'test')
+        self.assertEqual(feed.version, 'rss20')
+        self.assertEqual(
+            [feed_item_data['id'] for feed_item_data in feed_items_data],
+            ['test-1', 'test-2']
+        )
+
+    @override_settings(FEED_PARSE_PROCESSES=0)
+    def test__update_many__save_feeds__without_parser_processes(self) -> None:
+        with FeedServer() as server:
+            feed_subscription = FeedSubscription.objects.create(
+                owner=self.user,
+                url=server.get_url('/test')
+            )
+
+            results = FeedUpdater.update_many([feed_subscription.id])
+
+        feed, feed_items_data = results[feed_subscription.id]
+        self.assertEqual(feed.title, 'test')
+        self.assertEqual(len(feed_items_data), 2)
+
+    def test__update_many__skip_feed_update__on_same_content(self) -> None:
+        with FeedServer() as server:
+            feed_subscription = FeedSubscription.objects.create(
+                owner=self.user,
+                url=server.get_url('/test')
+            )
+            feed, _ = FeedUpdater.update_many([feed_subscription.id])[
+                feed_subscription.id
+            ]
+            # Make the next request unconditional
+            FeedSubscription.objects.filter(
+                id=feed_subscription.id
+            ).update(etag=None, last_modified=None)
+
+            results = FeedUpdater.update_many([feed_subscription.id])
+
+        old_updated = feed.updated
+        feed.refresh_from_db()
+        feed_subscription.refresh_from_db()
+        self.assertEqual(results[feed_subscription.id], (None, {}))
+        self.assertEqual(feed.updated, old_updated)
+        self.assertEqual(feed_subscription.fetch_count, 2)
+        self.assertEqual(feed_subscription.unchanged_count, 1)
+
+    @override_settings(FEED_FETCH_HOST_CONCURRENCY=1)
+    def test__update_many__postpone__over_host_limits(self) -> None:
+        with FeedServer() as server:
+            feed_subscriptions = [
+                FeedSubscription.objects.create(
+                    owner=self.user,
+                    url=server.get_url('/test{}'.format(i))
+                )
+                for i in range(2)
+            ]
+
+            results = FeedUpdater.update_many(
+                feed_subscription.id
+                for feed_subscription in feed_subscriptions
+            )
+
+        postponed = [
+            feed_subscription
+            for feed_subscription in feed_subscriptions
+            if isinstance(
+                results[feed_subscription.id],
+                FeedUpdaterPostponedError
+            )
+        ]
+        self.assertEqual(len(postponed), 1)
+        postponed[0].refresh_from_db()
+        self.assertEqual(postponed[0].retries, 0)
+        self.assertEqual(postponed[0].status, FeedSubscription.STATUS_READY)
+        self.assertGreater(postponed[0].next_fetch_at, timezone.now())
+
+    def test__update_many__store_failure_reason__on_missing_feed(self) -> None:
+        with FeedServer() as server:
+            feed_subscription = FeedSubscription.objects.create(
+                owner=self.user,
+                url=server.get_url('/missing')
+            )
+
+            FeedUpdater.update_many([feed_subscription.id])
+
+        feed_subscription.refresh_from_db()
+        self.assertEqual(
+            feed_subscription.failure_reason,
+            FeedSubscription.FAILURE_NOT_FOUND
+        )
+        self.assertFalse(feed_subscription.is_stopped)
+        self.assertIsNotNone(feed_subscription.next_retry_at)
+
+    def test__update_many__stop__on_permanent_failure(self) -> None:
+        with FeedServer() as server:
+            feed_subscriptions = [
+                FeedSubscription.objects.create(
+                    owner=self.user,
+                    url=server.get_url(path)
+                )
+                for path in ('/gone', '/html')
+            ]
+
+            FeedUpdater.update_many(
+                feed_subscription.id
+                for feed_subscription in feed_subscriptions
+            )
+
+        reasons = []
+
+        for feed_subscription in feed_subscriptions:
+            feed_subscription.refresh_from_db()
+            reasons.append(feed_subscription.failure_reason)
+            self.assertTrue(feed_subscription.is_stopped)
+            self.assertIsNone(feed_subscription.next_retry_at)
+
+        self.assertEqual(
+            reasons,
+            [
+                FeedSubscription.FAILURE_GONE,
+                FeedSubscription.FAILURE_NOT_FEED
+            ]
+        )
+
+    def test__update_many__update_url__on_permanent_redirect(self) -> None:
+        with FeedServer() as server:
+            feed_subscription = FeedSubscription.objects.create(
+                owner=self.user,
+                url=server.get_url('/moved/test')
+            )
+
+            FeedUpdater.update_many([feed_subscription.id])
+
+        feed_subscription.refresh_from_db()
+        self.assertEqual(feed_subscription.url, server.get_url('/test'))
+
+    def test__update_many__release__on_redirect_url_conflict(self) -> None:
+        with FeedServer() as server:
+            feed_subscriptions = [
+                FeedSubscription.objects.create(
+                    owner=self.user,
+                    url=server.get_url(path)
+                )
+                for path in ('/moved/test', '/moved/moved/test')
+            ]
+
+            results = FeedUpdater.update_many(
+                feed_subscription.id
+                for feed_subscription in feed_subscriptions
+            )
+
+        for feed_subscription in feed_subscriptions:
+            feed_subscription.refresh_from_db()
+
+        # One of them is saved with the final url, the other is released
+        saved, conflicted = sorted(
+            feed_subscriptions,
+            key=lambda feed_subscription: bool(
+                feed_subscription.failure_reason
+            )
+        )
+        self.assertEqual(saved.url, server.get_url('/test'))
+        self.assertIsInstance(results[conflicted.id], IntegrityError)
+        self.assertEqual(conflicted.status, FeedSubscription.STATUS_READY)
+        self.assertEqual(
+            conflicted.failure_reason,
+            FeedSubscription.FAILURE_UNKNOWN
+        )
+
+    @mock.patch(
+        'feeds.utils.feedupdater.FeedArchive.archive',
+        side_effect=OSError
+    )
+    def test__update_many__release__on_archive_error(
+            self,
+            archive: mock.Mock
+    ) -> None:
+        with FeedServer() as server:
+            feed_subscription = FeedSubscription.objects.create(
+                owner=self.user,
+                url=server.get_url('/test')
+            )
+
+            results = FeedUpdater.update_many([feed_subscription.id])
+
+        feed_subscription.refresh_from_db()
+        self.assertIsInstance(results[feed_subscription.id], OSError)
+        self.assertEqual(
+            feed_subscription.status,
+            FeedSubscription.STATUS_READY
+        )
+        self.assertEqual(feed_subscription.retries, 1)
+
+    @override_settings(FEED_FETCH_TOTAL_TIMEOUT=0.1)
+    def test__update_many__store_timeout__on_slow_server(self) -> None:
+        with FeedServer() as server:
+            feed_subscription = FeedSubscription.objects.create(
+                owner=self.user,
+                url=server.get_url('/slow')
+            )
+
+            FeedUpdater.update_many([feed_subscription.id])
+
+        feed_subscription.refresh_from_db()
+        self.assertEqual(
+            feed_subscription.failure_reason,
+            FeedSubscription.FAILURE_TIMEOUT
+        )
+
+    @mock.patch(
+        'feeds.utils.feedupdater.FeedFetcher.fetch_many',
+        side_effect=SoftTimeLimitExceeded
+    )
+    def test__update_many__release__on_soft_time_limit(
+            self,
+            fetch_many: mock.Mock
+    ) -> None:
         feed_subscription = FeedSubscription.objects.create(
             owner=self.user,
-            url='https://www.google.com/'
+            url='http://test2.com'
         )
 
-        with self.assertRaises(FeedUpdaterInvalidRSSError):
-            FeedUpdater.update(feed_subscription.id)
+        results = FeedUpdater.update_many([feed_subscription.id])
 
         feed_subscription.refresh_from_db()
-        self.assertEqual(feed_subscription.retries, 1)
+        self.assertIsInstance(
+            results[feed_subscription.id],
+            SoftTimeLimitExceeded
+        )
+        self.assertEqual(
+            feed_subscription.status,
+            FeedSubscription.STATUS_READY
+        )
+        self.assertEqual(
+            feed_subscription.failure_reason,
+            FeedSubscription.FAILURE_TIMEOUT
+        )
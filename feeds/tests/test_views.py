@@ -1,8 +1,14 @@
+from datetime import timedelta
+from typing import List, Optional
+from unittest import mock
+
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.test import APIRequestFactory, force_authenticate
 
-from feeds.views import FeedItemViewSet, FeedSubscriptionRetryView
+from feeds.models import FeedItem, FeedSubscription
+from feeds.views import FeedItemViewSet, FeedSubscriptionRetryView, FeedViewSet
 from rss.tests import BaseTestCase
 
 
@@ -42,6 +48,39 @@ class FeedSubscriptionRetryViewTestCase(BaseTestCase):
         self.assertNotEqual(old_retries, self.feed_subscription.retries)
         self.assertNotEqual(old_is_stopped, self.feed_subscription.is_stopped)
 
+    @mock.patch('feeds.views.update_feed.delay')
+    def test__retry__claim_and_update__on_stopped_subscription(
+            self,
+            delay: mock.Mock
+    ) -> None:
+        self.feed_subscription.is_stopped = True
+        self.feed_subscription.save()
+
+        self._get_retry_response()
+        self.feed_subscription.refresh_from_db()
+
+        delay.assert_called_once_with(self.feed_subscription.id)
+        self.assertEqual(
+            self.feed_subscription.status,
+            FeedSubscription.STATUS_IN_PROGRESS
+        )
+
+    @mock.patch('feeds.views.update_feed.delay')
+    def test__retry__dont_update__on_subscription_in_progress(
+            self,
+            delay: mock.Mock
+    ) -> None:
+        self.feed_subscription.is_stopped = True
+        self.feed_subscription.save()
+        FeedSubscription.objects.filter(id=self.feed_subscription.id).claim()
+
+        response = self._get_retry_response()
+        self.feed_subscription.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(self.feed_subscription.is_stopped)
+        delay.assert_not_called()
+
     def test__retry__dont_reset_stats__on_unstopped_subscription(self) -> None:
         old_retries = self.feed_subscription.retries
         old_is_stopped = self.feed_subscription.is_stopped
@@ -54,6 +93,55 @@ class FeedSubscriptionRetryViewTestCase(BaseTestCase):
         self.assertEqual(old_is_stopped, self.feed_subscription.is_stopped)
 
 
+class FeedViewSetTestCase(BaseTestCase):
+    def setUp(self) -> None:
+        """
+        Set self.user before tests.
+        """
+        self.set_user()
+        self.set_feed_subscription()
+        self.set_feed()
+
+    # summary tests
+    def _get_summary_response(self) -> Response:
+        """
+        Makes authenticated request to FeedViewSet.summary
+        and returns response.
+
+        :return: Response for FeedViewSet.summary.
+        """
+        factory = APIRequestFactory()
+        view = FeedViewSet.as_view({'get': 'summary'})
+        request = factory.get('/feeds/summary/')
+        force_authenticate(request, user=self.user)
+        return view(request)
+
+    def test__summary__return_counters_of_user_feeds(self) -> None:
+        self.feed.add_items(3)
+        self.set_additional_user()
+        self.set_additional_feed_subscription()
+        self.set_additional_feed()
+        self.additional_feed.add_items(5)
+
+        response = self._get_summary_response()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {'feed_count': 1, 'item_count': 3, 'unread_count': 3}
+        )
+
+    def test__summary__return_zeros__without_feeds(self) -> None:
+        self.feed.delete()
+
+        response = self._get_summary_response()
+
+        self.assertEqual(
+            response.data,
+            {'feed_count': 0, 'item_count': 0, 'unread_count': 0}
+        )
+
+
 class FeedItemViewSetTestCase(BaseTestCase):
     def setUp(self) -> None:
         """
@@ -87,6 +175,14 @@ class FeedItemViewSetTestCase(BaseTestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertNotEqual(old_value, self.feed_item.is_read)
 
+    def test__is_read__decrement_unread_count__on_unread_item(self) -> None:
+        self.feed.add_items(1)
+
+        self._get_is_read_response()
+        self.feed.refresh_from_db()
+
+        self.assertEqual(self.feed.unread_count, 0)
+
     def test__is_read__dont_update_value__on_read_item(self) -> None:
         self.feed_item.is_read = True
         self.feed_item.save()
@@ -97,3 +193,139 @@ class FeedItemViewSetTestCase(BaseTestCase):
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertEqual(old_value, self.feed_item.is_read)
+
+    # list tests
+    def _get_list_response(
+            self,
+            url: str = '/feeds/items/',
+            data: Optional[dict] = None
+    ) -> Response:
+        """
+        Makes authenticated request to FeedItemViewSet.list
+        and returns response.
+
+        :param url: Url of the page.
+        :param data: Query parameters.
+        :return: Response for FeedItemViewSet.list.
+        """
+        factory = APIRequestFactory()
+        view = FeedItemViewSet.as_view({'get': 'list'})
+        request = factory.get(url, data or {})
+        force_authenticate(request, user=self.user)
+        return view(request)
+
+    def _get_all_ids(
+            self,
+            data: Optional[dict] = None,
+            link: str = 'next'
+    ) -> List[int]:
+        """
+        Follow page links from the first page and collect FeedItem ids.
+
+        :param data: Query parameters of the first page.
+        :param link: Name of the link to follow.
+        :return: List of FeedItem ids in the order of pages.
+        """
+        response = self._get_list_response(data=data)
+        ids = [item['id'] for item in response.data['results']]
+
+        while response.data[link]:
+            response = self._get_list_response(response.data[link])
+            ids.extend(item['id'] for item in response.data['results'])
+
+        return ids
+
+    def _set_feed_items(self) -> List[FeedItem]:
+        """
+        Create 25 FeedItem objects, some with equal pub_date and some
+        without pub_date.
+
+        :return: List of created FeedItem instances.
+        """
+        now = timezone.now()
+        return [
+            FeedItem.objects.create(
+                feed=self.feed,
+                is_read=bool(i % 2),
+                pub_date=now - timedelta(hours=i // 3) if i % 5 else None,
+                title='test{}'.format(i)
+            )
+            for i in range(25)
+        ]
+
+    def test__list__return_all_items_once__on_next_links(self) -> None:
+        feed_items = self._set_feed_items() + [self.feed_item]
+        expected_ids = [
+            feed_item.id
+            for feed_item in sorted(
+                feed_items,
+                key=lambda item: (item.pub_date or item.created, item.id),
+                reverse=True
+            )
+        ]
+
+        ids = self._get_all_ids()
+
+        self.assertEqual(ids, expected_ids)
+
+    def test__list__return_all_items_once__on_ascending_ordering(
+            self
+    ) -> None:
+        feed_items = self._set_feed_items() + [self.feed_item]
+        expected_ids = [
+            feed_item.id
+            for feed_item in sorted(
+                feed_items,
+                key=lambda item: (item.created, item.id)
+            )
+        ]
+
+        ids = self._get_all_ids({'ordering': 'created'})
+
+        self.assertEqual(ids, expected_ids)
+
+    def test__list__return_unread_items__on_is_read_filter(self) -> None:
+        feed_items = self._set_feed_items() + [self.feed_item]
+        expected_ids = {
+            feed_item.id
+            for feed_item in feed_items
+            if not feed_item.is_read
+        }
+
+        ids = self._get_all_ids({'is_read': 'false'})
+
+        self.assertEqual(len(ids), len(expected_ids))
+        self.assertEqual(set(ids), expected_ids)
+
+    def test__list__return_previous_page__on_previous_link(self) -> None:
+        self._set_feed_items()
+        first_page = self._get_list_response()
+        second_page = self._get_list_response(first_page.data['next'])
+
+        response = self._get_list_response(second_page.data['previous'])
+
+        self.assertEqual(response.data['results'], first_page.data['results'])
+        self.assertIsNone(response.data['previous'])
+
+    def test__list__dont_return_count__by_default(self) -> None:
+        response = self._get_list_response()
+
+        self.assertNotIn('count', response.data)
+
+    def test__list__return_count__on_count_param(self) -> None:
+        self._set_feed_items()
+
+        response = self._get_list_response(data={'count': 'true'})
+
+        self.assertEqual(response.data['count'], 26)
+
+    def test__list__not_found__on_invalid_cursor(self) -> None:
+        response = self._get_list_response(data={'cursor': 'invalid'})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test__list__dont_return_internal_fields__by_default(self) -> None:
+        response = self._get_list_response()
+
+        for field in ('fingerprint', 'identity_key', 'owner'):
+            self.assertNotIn(field, response.data['results'][0])
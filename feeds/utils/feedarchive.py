@@ -0,0 +1,230 @@
+import hashlib
+import mmap
+import os
+import tempfile
+import zlib
+from datetime import datetime
+from http import HTTPStatus
+from pathlib import Path
+from typing import Iterable, List, Tuple, Union
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from feeds.models import FeedPayload, FeedSubscription
+from feeds.utils.feedfetcher import FeedFetcherError, FeedFetchResponse
+
+
+class FeedArchiveError(Exception):
+    pass
+
+
+class FeedArchive:
+    """
+    Archive raw fetched RSS pages on local disk under FEED_ARCHIVE_DIR.
+    Bodies are stored compressed in files named by their SHA-256 digest, so
+    equal bodies are stored once. FeedPayload objects index the archived
+    bodies per subscription and fetch time. Archive is disabled if
+    FEED_ARCHIVE_DIR is not set.
+    """
+    @classmethod
+    def is_enabled(cls) -> bool:
+        """
+        Check if fetched bodies are archived.
+
+        :return: Is archive enabled.
+        """
+        return bool(settings.FEED_ARCHIVE_DIR)
+
+    @classmethod
+    def _get_path(cls, content_hash: str) -> Path:
+        """
+        Get path of an archived body. Files are spread over subdirectories
+        by the first digest byte to keep directories small.
+
+        :param content_hash: SHA-256 digest of the body.
+        :return: Path to the archived file.
+        """
+        return Path(settings.FEED_ARCHIVE_DIR, content_hash[:2], content_hash)
+
+    @classmethod
+    def _write(cls, content_hash: str, content: bytes) -> None:
+        """
+        Write compressed body to the archive if it's not archived yet.
+
+        :param content_hash: SHA-256 digest of the body.
+        :param content: Raw body.
+        """
+        path = cls._get_path(content_hash)
+
+        try:
+            # Keep deduplicated file from being pruned, unlike touch() utime
+            # never creates an empty file in place of a pruned one
+            os.utime(path)
+            return
+        except FileNotFoundError:
+            pass
+
+        path.parent.mkdir(exist_ok=True, parents=True)
+
+        # Written under a temporary name, so readers never see a partial file
+        with tempfile.NamedTemporaryFile(
+                delete=False,
+                dir=path.parent
+        ) as file:
+            file.write(
+                zlib.compress(content, settings.FEED_ARCHIVE_COMPRESS_LEVEL)
+            )
+
+        os.replace(file.name, path)
+
+    @classmethod
+    def read(cls, content_hash: str) -> bytes:
+        """
+        Read archived body. Compressed file is memory-mapped instead of being
+        copied into a buffer before decompression.
+
+        :param content_hash: SHA-256 digest of the body.
+        :return: Raw body.
+        """
+        try:
+            with open(cls._get_path(content_hash), 'rb') as file, mmap.mmap(
+                    file.fileno(),
+                    0,
+                    access=mmap.ACCESS_READ
+            ) as data:
+                return zlib.decompress(data)
+        except (OSError, ValueError, zlib.error) as e:
+            raise FeedArchiveError(
+                _('Failed to read archived body {}: {}')
+                .format(content_hash, repr(e))
+            ) from e
+
+    @classmethod
+    def get_response(cls, feed_payload: FeedPayload) -> FeedFetchResponse:
+        """
+        Get archived fetch of RSS page the way it was downloaded.
+
+        :param feed_payload: FeedPayload of the fetch.
+        :return: FeedFetchResponse with archived body.
+        """
+        return FeedFetchResponse(
+            content=cls.read(feed_payload.content_hash),
+            headers=feed_payload.headers,
+            size=feed_payload.size,
+            status=feed_payload.status,
+            url=feed_payload.url
+        )
+
+    @classmethod
+    def archive(
+            cls,
+            fetches: Iterable[Tuple[
+                FeedSubscription,
+                Union[FeedFetchResponse, FeedFetcherError]
+            ]]
+    ) -> List[FeedPayload]:
+        """
+        Archive downloaded bodies of FeedSubscription objects. Failed
+        downloads and responses without a body are skipped. Body which can't
+        be written, e.g. if disk is full, is skipped too, so archive never
+        fails an update.
+
+        :param fetches: Iterable of FeedSubscription and its FeedFetchResponse
+        or FeedFetcherError.
+        :return: List of created FeedPayload instances.
+        """
+        if not cls.is_enabled():
+            return []
+
+        fetched_at = timezone.now()
+        feed_payloads = []
+
+        for feed_subscription, response in fetches:
+            if (
+                    isinstance(response, FeedFetcherError)
+                    or response.status == HTTPStatus.NOT_MODIFIED
+                    or response.status >= HTTPStatus.BAD_REQUEST
+            ):
+                continue
+
+            content_hash = hashlib.sha256(response.content).hexdigest()
+
+            try:
+                cls._write(content_hash, response.content)
+            except OSError:
+                continue
+
+            feed_payloads.append(FeedPayload(
+                content_hash=content_hash,
+                fetched_at=fetched_at,
+                headers=response.headers,
+                size=len(response.content),
+                status=response.status,
+                subscription=feed_subscription,
+                url=response.url
+            ))
+
+        return FeedPayload.objects.bulk_create(feed_payloads)
+
+    @classmethod
+    def _delete(cls, path: Path, expires_at: datetime) -> bool:
+        """
+        Delete archived file unless it's archived again concurrently. File is
+        moved aside first, so archive() writes the body again instead of
+        refreshing it, and is put back if it was refreshed before the move.
+
+        :param path: Path to the archived file.
+        :param expires_at: Files modified before are deleted.
+        :return: Is file deleted.
+        """
+        pruned = path.with_name('{}.pruned'.format(path.name))
+
+        try:
+            os.rename(path, pruned)
+        except FileNotFoundError:
+            return False
+
+        if pruned.stat().st_mtime >= expires_at.timestamp():
+            os.replace(pruned, path)
+            return False
+
+        pruned.unlink()
+        return True
+
+    @classmethod
+    def prune(cls) -> int:
+        """
+        Delete FeedPayload objects older than FEED_ARCHIVE_RETENTION and
+        archived files which are not referenced anymore. Files touched
+        within the retention period are kept, so bodies archived while
+        pruning are not deleted.
+
+        :return: Number of deleted files.
+        """
+        if not cls.is_enabled():
+            return 0
+
+        expires_at = timezone.now() - settings.FEED_ARCHIVE_RETENTION
+        FeedPayload.objects.filter(fetched_at__lt=expires_at).delete()
+        deleted = 0
+
+        for directory in Path(settings.FEED_ARCHIVE_DIR).glob('??'):
+            paths = {
+                path.name: path
+                for path in directory.iterdir()
+                if path.stat().st_mtime < expires_at.timestamp()
+            }
+            referenced = set(
+                FeedPayload
+                .objects
+                .filter(content_hash__in=paths)
+                .values_list('content_hash', flat=True)
+            )
+
+            for name, path in paths.items():
+                if name not in referenced and cls._delete(path, expires_at):
+                    deleted += 1
+
+        return deleted
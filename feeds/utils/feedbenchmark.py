@@ -0,0 +1,387 @@
+import gzip
+import json
+import tracemalloc
+import uuid
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils.translation import gettext as _
+
+from feeds.models import FeedPayload, FeedSubscription
+from feeds.utils.feedarchive import FeedArchive
+from feeds.utils.feedfetcher import FeedFetchResponse
+from feeds.utils.feedupdater import FeedItemUpdater, FeedUpdater
+
+User = get_user_model()
+
+ITEM_TEMPLATE = (
+    '<item>'
+    '<guid>{url}/{index}</guid>'
+    '<title>Item {index}</title>'
+    '<link>{url}/{index}</link>'
+    '<description><![CDATA[<p>Item <b>{index}</b> {text}</p>'
+    '<script>alert(1)</script>]]></description>'
+    '<category domain="{url}">category-{category}</category>'
+    '<pubDate>Mon, 05 Oct 2020 {hour:02d}:{minute:02d}:00 GMT</pubDate>'
+    '<enclosure url="{url}/{index}.mp3" length="1024" type="audio/mpeg"/>'
+    '</item>'
+)
+RSS_TEMPLATE = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<rss version="2.0"><channel>'
+    '<title>Benchmark {size}</title>'
+    '<link>{url}</link>'
+    '<description>Benchmark feed with {size} items</description>'
+    '<category>benchmark</category>'
+    '{items}'
+    '</channel></rss>'
+)
+TEXT = 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 4
+# Recorded feeds and their baseline results, committed with the code
+BENCHMARK_DIR = Path(__file__).resolve().parent.parent / 'benchmark'
+BASELINE_PATH = BENCHMARK_DIR / 'baseline.json'
+CORPUS_DIR = BENCHMARK_DIR / 'corpus'
+CONTENT_TYPES = {
+    'atom': 'application/atom+xml',
+    'rss': 'application/rss+xml'
+}
+
+
+class FeedBenchmarkResult(NamedTuple):
+    name: str
+    items: int
+    # Seconds of each ingestion stage, the best of all runs
+    parse_time: float
+    feed_time: float
+    items_time: float
+    queries: int
+    # Bytes allocated at peak, measured in a separate traced run
+    peak_memory: int
+
+    @property
+    def total_time(self) -> float:
+        """
+        :return: Seconds of all ingestion stages.
+        """
+        return self.parse_time + self.feed_time + self.items_time
+
+    @property
+    def items_per_second(self) -> float:
+        """
+        :return: Number of items ingested per second.
+        """
+        return self.items / self.total_time if self.total_time else 0
+
+
+class FeedBenchmark:
+    """
+    Measure ingestion of a corpus of feeds through FeedUpdater and
+    FeedItemUpdater against the configured database. The corpus consists of
+    recorded feeds of CORPUS_DIR, synthetic feeds of the given sizes and
+    fetches recorded by FeedArchive. Every feed is ingested into a fresh
+    FeedSubscription inside a transaction which is rolled back, so runs
+    don't leave data behind.
+    """
+    # Number of timed runs of every feed
+    REPEAT = 5
+    # Times may grow by this share over the baseline
+    TOLERANCE = 0.5
+    # Seconds times may grow by in addition to TOLERANCE, scheduling noise
+    # of stages which take a few milliseconds
+    TIME_SLACK = 0.02
+
+    @classmethod
+    def get_synthetic_response(cls, size: int) -> FeedFetchResponse:
+        """
+        Get RSS page with the given number of items.
+
+        :param size: Number of items.
+        :return: FeedFetchResponse of the page.
+        """
+        url = 'http://benchmark.test/{}'.format(size)
+        items = ''.join(
+            ITEM_TEMPLATE.format(
+                category=index % 10,
+                hour=index // 60 % 24,
+                index=index,
+                minute=index % 60,
+                text=TEXT,
+                url=url
+            )
+            for index in range(size)
+        )
+        content = RSS_TEMPLATE.format(items=items, size=size, url=url)
+        return FeedFetchResponse(
+            content=content.encode(),
+            headers={'content-type': 'application/rss+xml'},
+            status=200,
+            url=url
+        )
+
+    @classmethod
+    def get_recorded_corpus(
+            cls,
+            path: Path = CORPUS_DIR
+    ) -> List[Tuple[str, FeedFetchResponse]]:
+        """
+        Get recorded feeds. Feeds are stored compressed in
+        <format>-<description>.xml.gz files, so the corpus doesn't change
+        with the code which generates synthetic feeds.
+
+        :param path: Directory of recorded feeds.
+        :return: List of names and FeedFetchResponse of the feeds sorted by
+        name.
+        """
+        corpus = []
+
+        for file_path in sorted(path.glob('*.xml.gz')):
+            name = file_path.name[:-len('.xml.gz')]
+            url = 'http://benchmark.test/corpus/{}'.format(name)
+            corpus.append((
+                'corpus-{}'.format(name),
+                FeedFetchResponse(
+                    content=gzip.decompress(file_path.read_bytes()),
+                    headers={
+                        'content-type': CONTENT_TYPES[name.split('-')[0]]
+                    },
+                    status=200,
+                    url=url
+                )
+            ))
+
+        return corpus
+
+    @classmethod
+    def get_corpus(
+            cls,
+            sizes: Iterable[int] = (),
+            feed_payload_ids: Iterable[int] = (),
+            is_recorded: bool = True
+    ) -> List[Tuple[str, FeedFetchResponse]]:
+        """
+        Get named feeds to ingest.
+
+        :param sizes: Numbers of items of synthetic feeds.
+        :param feed_payload_ids: FeedPayload ids of archived fetches.
+        :param is_recorded: Include recorded feeds of CORPUS_DIR.
+        :return: List of names and FeedFetchResponse of the feeds.
+        """
+        corpus = cls.get_recorded_corpus() if is_recorded else []
+        corpus.extend(
+            ('synthetic-{}'.format(size), cls.get_synthetic_response(size))
+            for size in sizes
+        )
+        corpus.extend(
+            (
+                'payload-{}'.format(feed_payload.id),
+                FeedArchive.get_response(feed_payload)
+            )
+            for feed_payload in FeedPayload.objects.filter(
+                id__in=feed_payload_ids
+            ).order_by('id')
+        )
+        return corpus
+
+    @classmethod
+    def _ingest(
+            cls,
+            response: FeedFetchResponse,
+            parser: Optional[str] = None
+    ) -> Tuple[Dict[str, float], int, int]:
+        """
+        Ingest a single feed into a fresh FeedSubscription and roll it back.
+
+        :param response: FeedFetchResponse of the feed.
+        :param parser: Parser backend, FEED_PARSER setting if not set.
+        :return: Tuple with seconds of each stage, number of queries and
+        number of items.
+        """
+        times = {}
+
+        with transaction.atomic():
+            owner = User.objects.create(
+                username='feed-benchmark-{}'.format(uuid.uuid4().hex)
+            )
+            feed_subscription = FeedSubscription.objects.create(
+                owner=owner,
+                url=response.url
+            )
+
+            with CaptureQueriesContext(connection) as queries:
+                start = perf_counter()
+                feed_data = FeedUpdater._parse_feed_data(
+                    response.url,
+                    response,
+                    parser
+                )
+                times['parse_time'] = perf_counter() - start
+
+                start = perf_counter()
+                feed, feed_items_data = FeedUpdater._save(
+                    feed_subscription,
+                    feed_data
+                )
+                times['feed_time'] = perf_counter() - start
+
+                start = perf_counter()
+                FeedItemUpdater.update_many(feed.id, feed_items_data)
+                times['items_time'] = perf_counter() - start
+
+            transaction.set_rollback(True)
+
+        return times, len(queries), len(feed_items_data)
+
+    @classmethod
+    def _get_peak_memory(
+            cls,
+            response: FeedFetchResponse,
+            parser: Optional[str] = None
+    ) -> int:
+        """
+        Get peak memory allocated by ingestion of a single feed.
+
+        :param response: FeedFetchResponse of the feed.
+        :param parser: Parser backend, FEED_PARSER setting if not set.
+        :return: Peak allocated bytes.
+        """
+        tracemalloc.start()
+
+        try:
+            cls._ingest(response, parser)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return peak
+
+    @classmethod
+    def run(
+            cls,
+            corpus: List[Tuple[str, FeedFetchResponse]],
+            repeat: int = REPEAT,
+            parser: Optional[str] = None
+    ) -> List[FeedBenchmarkResult]:
+        """
+        Ingest every feed of the corpus repeat times. Time of every stage is
+        the best of all runs, memory is traced in an extra run, because
+        tracing slows ingestion down. Every feed is ingested once more
+        before the timed runs, so the first of them doesn't pay for cold
+        caches.
+
+        :param corpus: List of names and FeedFetchResponse of the feeds.
+        :param repeat: Number of timed runs of every feed.
+        :param parser: Parser backend, FEED_PARSER setting if not set.
+        :return: List of FeedBenchmarkResult in the order of corpus.
+        """
+        results = []
+
+        for name, response in corpus:
+            cls._ingest(response, parser)
+            runs = [cls._ingest(response, parser) for _ in range(repeat)]
+            times = {
+                stage: min(run_times[stage] for run_times, _, _ in runs)
+                for stage in runs[0][0]
+            }
+            _, queries, items = runs[-1]
+            results.append(FeedBenchmarkResult(
+                items=items,
+                name=name,
+                peak_memory=cls._get_peak_memory(response, parser),
+                queries=queries,
+                **times
+            ))
+
+        return results
+
+    @classmethod
+    def load_baseline(cls, path: Path) -> Dict[str, dict]:
+        """
+        Load stored results.
+
+        :param path: Path to JSON file with results.
+        :return: Dict in name:result fields format.
+        """
+        with open(path) as file:
+            return json.load(file)
+
+    @classmethod
+    def save_baseline(
+            cls,
+            path: Path,
+            results: List[FeedBenchmarkResult]
+    ) -> None:
+        """
+        Store results as a baseline for the next runs.
+
+        :param path: Path to JSON file with results.
+        :param results: List of FeedBenchmarkResult.
+        """
+        with open(path, 'w') as file:
+            json.dump(
+                {result.name: result._asdict() for result in results},
+                file,
+                indent=2,
+                sort_keys=True
+            )
+            file.write('\n')
+
+    @classmethod
+    def compare(
+            cls,
+            results: List[FeedBenchmarkResult],
+            baseline: Dict[str, dict],
+            tolerance: float = TOLERANCE
+    ) -> List[str]:
+        """
+        Compare results with the baseline. Times and peak memory may grow by
+        tolerance share, times also by TIME_SLACK seconds, number of
+        queries may not grow at all and number of items must not change.
+        Results missing in the baseline are not compared.
+
+        :param results: List of FeedBenchmarkResult.
+        :param baseline: Dict in name:result fields format.
+        :param tolerance: Allowed growth share of times and memory.
+        :return: List of regression messages.
+        """
+        regressions = []
+
+        for result in results:
+            expected = baseline.get(result.name)
+
+            if not expected:
+                continue
+
+            if result.items != expected['items']:
+                regressions.append(
+                    _('{}: items is {}, baseline is {}.')
+                    .format(result.name, result.items, expected['items'])
+                )
+
+            for metric in (
+                    'parse_time',
+                    'feed_time',
+                    'items_time',
+                    'peak_memory',
+                    'queries'
+            ):
+                limit = expected[metric]
+
+                if metric != 'queries':
+                    limit *= 1 + tolerance
+
+                if metric.endswith('_time'):
+                    limit += cls.TIME_SLACK
+
+                value = getattr(result, metric)
+
+                if value > limit:
+                    regressions.append(
+                        _('{}: {} is {}, baseline is {}.')
+                        .format(result.name, metric, value, expected[metric])
+                    )
+
+        return regressions
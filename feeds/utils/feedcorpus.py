@@ -0,0 +1,298 @@
+import random
+import time
+from email.utils import formatdate
+from html import escape
+from http import HTTPStatus
+from typing import NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from feeds.utils.feedhttpserver import (
+    ENCODINGS,
+    FeedHTTPRequestHandler,
+    FeedHTTPServer
+)
+
+RSS_ITEM_TEMPLATE = (
+    '<item>'
+    '<guid>{url}/items/{index}</guid>'
+    '<title>Item {index} of feed {number}</title>'
+    '<link>{url}/items/{index}</link>'
+    '<description>{description}</description>'
+    '<category>category-{category}</category>'
+    '<pubDate>{date}</pubDate>'
+    '</item>'
+)
+RSS_TEMPLATE = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<rss version="2.0"><channel>'
+    '<title>Feed {number}</title>'
+    '<link>{url}</link>'
+    '<description>Synthetic feed {number}</description>'
+    '<ttl>60</ttl>'
+    '{items}'
+    '</channel></rss>'
+)
+ATOM_ENTRY_TEMPLATE = (
+    '<entry>'
+    '<id>{url}/items/{index}</id>'
+    '<title>Item {index} of feed {number}</title>'
+    '<link href="{url}/items/{index}"/>'
+    '<summary type="html">{description}</summary>'
+    '<category term="category-{category}"/>'
+    '<updated>{iso_date}</updated>'
+    '</entry>'
+)
+ATOM_TEMPLATE = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<feed xmlns="http://www.w3.org/2005/Atom">'
+    '<id>{url}</id>'
+    '<title>Feed {number}</title>'
+    '<link href="{url}"/>'
+    '<updated>{iso_date}</updated>'
+    '{items}'
+    '</feed>'
+)
+TEXT = (
+    'Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do '
+    'eiusmod tempor incididunt ut labore et dolore magna aliqua. '
+)
+
+
+class FeedCorpusOptions(NamedTuple):
+    # Number of items of every feed
+    size: int = 20
+    # Approximate size of every item description in bytes
+    item_size: int = 500
+    # New items of every feed per hour, 0 keeps feeds unchanged
+    churn: float = 1
+    # Share of feeds served as Atom, the rest are RSS 2.0
+    atom_share: float = 0
+    # Min and max seconds before response
+    min_latency: float = 0
+    max_latency: float = 0
+    # Share of requests failed with 500 (Internal Server Error)
+    error_rate: float = 0
+    # Send ETag and respond with 304 (Not Modified) to If-None-Match
+    etag: bool = True
+    # Number of temporary redirects before a feed is served
+    redirects: int = 0
+    # Seed of per-feed values, e.g. format and churn offset
+    seed: int = 0
+
+
+class FeedCorpus:
+    """
+    Generate synthetic RSS and Atom feeds. Feeds are numbered and every
+    feed is derived from its number and the current time only, so any number
+    of feeds is served without storing them. New items are published with
+    the churn rate, every feed at its own offset, so feeds don't change all
+    at once.
+    """
+    def __init__(
+            self,
+            options: FeedCorpusOptions = FeedCorpusOptions()
+    ) -> None:
+        """
+        :param options: FeedCorpusOptions of generated feeds.
+        """
+        self.options = options
+        repeat = options.item_size // len(TEXT) + 1
+        self.text = escape('<p>{}</p>'.format(
+            (TEXT * repeat)[:options.item_size]
+        ))
+
+    def _get_offset(self, number: int) -> float:
+        """
+        Get publishing offset of a feed in seconds.
+
+        :param number: Feed number.
+        :return: Offset in seconds.
+        """
+        seed = 'offset-{}-{}'.format(self.options.seed, number)
+        return random.Random(seed).random() * 3600
+
+    def is_atom(self, number: int) -> bool:
+        """
+        Check if a feed is served as Atom.
+
+        :param number: Feed number.
+        :return: Is feed Atom.
+        """
+        seed = 'atom-{}-{}'.format(self.options.seed, number)
+        return random.Random(seed).random() < self.options.atom_share
+
+    def get_last_index(self, number: int, now: Optional[float] = None) -> int:
+        """
+        Get index of the latest item of a feed.
+
+        :param number: Feed number.
+        :param now: Timestamp, current time if not set.
+        :return: Item index.
+        """
+        if not self.options.churn:
+            return self.options.size - 1
+
+        now = time.time() if now is None else now
+        return int(
+            (now + self._get_offset(number)) * self.options.churn / 3600
+        )
+
+    def get_etag(self, number: int, now: Optional[float] = None) -> str:
+        """
+        Get ETag of a feed, changed only when a new item is published.
+
+        :param number: Feed number.
+        :param now: Timestamp, current time if not set.
+        :return: ETag header value.
+        """
+        return '"{}-{}"'.format(number, self.get_last_index(number, now))
+
+    def _get_item_time(self, number: int, index: int) -> float:
+        """
+        Get publishing time of an item.
+
+        :param number: Feed number.
+        :param index: Item index.
+        :return: Timestamp.
+        """
+        # Items of unchanged feeds are an hour apart
+        churn = self.options.churn or 1
+        return index * 3600 / churn - self._get_offset(number)
+
+    def get_content(
+            self,
+            number: int,
+            url: str,
+            now: Optional[float] = None
+    ) -> bytes:
+        """
+        Get feed document with the latest options.size items.
+
+        :param number: Feed number.
+        :param url: Feed url.
+        :param now: Timestamp, current time if not set.
+        :return: Feed document.
+        """
+        is_atom = self.is_atom(number)
+        last_index = self.get_last_index(number, now)
+        item_template = ATOM_ENTRY_TEMPLATE if is_atom else RSS_ITEM_TEMPLATE
+        items = ''.join(
+            item_template.format(
+                category=index % 10,
+                date=formatdate(self._get_item_time(number, index)),
+                description=self.text,
+                index=index,
+                iso_date=time.strftime(
+                    '%Y-%m-%dT%H:%M:%SZ',
+                    time.gmtime(self._get_item_time(number, index))
+                ),
+                number=number,
+                url=url
+            )
+            for index in range(
+                last_index,
+                max(last_index - self.options.size, -1),
+                -1
+            )
+        )
+        template = ATOM_TEMPLATE if is_atom else RSS_TEMPLATE
+        return template.format(
+            iso_date=time.strftime(
+                '%Y-%m-%dT%H:%M:%SZ',
+                time.gmtime(self._get_item_time(number, last_index))
+            ),
+            items=items,
+            number=number,
+            url=url
+        ).encode()
+
+
+class FeedCorpusRequestHandler(FeedHTTPRequestHandler):
+    def do_GET(self) -> None:
+        """
+        Serve /feeds/<number> feed of the server corpus. Requests are
+        delayed, failed and redirected as the corpus options define.
+        """
+        corpus = self.server.corpus
+        options = corpus.options
+        url = urlsplit(self.path)
+        parts = url.path.strip('/').split('/')
+
+        if len(parts) != 2 or parts[0] != 'feeds' or not parts[1].isdigit():
+            self._send(HTTPStatus.NOT_FOUND, b'Not found')
+            return
+
+        number = int(parts[1])
+
+        if options.max_latency:
+            time.sleep(
+                random.uniform(options.min_latency, options.max_latency)
+            )
+
+        if random.random() < options.error_rate:
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, b'Error')
+            return
+
+        hop = int(parse_qs(url.query).get('hop', ['0'])[0])
+
+        if hop < options.redirects:
+            self._send(
+                HTTPStatus.FOUND,
+                b'',
+                {'Location': '{}?hop={}'.format(url.path, hop + 1)}
+            )
+            return
+
+        headers = {
+            'Content-Type': (
+                'application/atom+xml'
+                if corpus.is_atom(number)
+                else 'application/rss+xml'
+            )
+        }
+        now = time.time()
+
+        if options.etag:
+            headers['ETag'] = corpus.get_etag(number, now)
+
+            if self.headers.get('If-None-Match') == headers['ETag']:
+                self._send(HTTPStatus.NOT_MODIFIED, b'', headers)
+                return
+
+        body = corpus.get_content(
+            number,
+            'http://{}{}'.format(self.headers.get('Host', ''), url.path),
+            now
+        )
+        self._send_content(body, headers)
+
+
+class FeedCorpusServer(FeedHTTPServer):
+    """
+    Local HTTP server of a FeedCorpus for load testing.
+    """
+    request_queue_size = 1024
+
+    def __init__(
+            self,
+            address: Tuple[str, int],
+            corpus: FeedCorpus,
+            encodings: Tuple[str, ...] = ENCODINGS
+    ) -> None:
+        """
+        :param address: Host and port to listen.
+        :param corpus: FeedCorpus to serve.
+        :param encodings: Content encodings in preference order.
+        """
+        super().__init__(address, FeedCorpusRequestHandler, encodings)
+        self.corpus = corpus
+
+    def get_feed_url(self, number: int, host: Optional[str] = None) -> str:
+        """
+        Get absolute url of a feed on this server.
+
+        :param number: Feed number.
+        :param host: Host name clients use, listening address if not set.
+        :return: Absolute url.
+        """
+        return self.get_url('/feeds/{}'.format(number), host)
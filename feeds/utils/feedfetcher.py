@@ -0,0 +1,402 @@
+import asyncio
+import os
+import threading
+import zlib
+from http import HTTPStatus
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import aiohttp
+import brotli
+from django.conf import settings
+from django.utils.translation import gettext as _
+from feedparser.http import ACCEPT_HEADER
+
+
+class FeedFetcherError(Exception):
+    def __init__(self, message: str, size: int = 0) -> None:
+        """
+        :param message: Error message.
+        :param size: Number of bytes received before the error.
+        """
+        super().__init__(message)
+        self.size = size
+
+
+class FeedFetcherTooLargeError(FeedFetcherError):
+    pass
+
+
+class FeedFetchRequest(NamedTuple):
+    url: str
+    etag: Optional[str] = None
+    modified: Optional[str] = None
+
+
+class FeedFetchResponse(NamedTuple):
+    content: bytes
+    headers: Dict[str, str]
+    status: int
+    url: str
+    # Number of bytes received, before decoding
+    size: int = 0
+    # Final url if request was only redirected permanently
+    redirect_url: Optional[str] = None
+
+
+class BrotliDecompressor:
+    """
+    Brotli decoder with the interface of zlib decompress object.
+    """
+    def __init__(self) -> None:
+        self._decompressor = brotli.Decompressor()
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        """
+        Decode a chunk of data byte by byte, brotli can't limit its output
+        otherwise. Decoding stops as soon as the output reaches max_length
+        and the rest of the chunk is dropped, so the output exceeds
+        max_length by no more than a single byte decodes to, which is
+        bounded by the 16 MiB brotli meta-block size.
+
+        :param data: Encoded chunk.
+        :param max_length: Max length of output, unlimited if 0.
+        :return: Decoded chunk.
+        """
+        chunks = []
+        size = 0
+
+        for index in range(len(data)):
+            chunk = self._decompressor.process(data[index:index + 1])
+            chunks.append(chunk)
+            size += len(chunk)
+
+            if max_length and size >= max_length:
+                break
+
+        return b''.join(chunks)
+
+    def flush(self) -> bytes:
+        """
+        Brotli decoder doesn't buffer output.
+
+        :return: Empty bytes.
+        """
+        return b''
+
+
+class FeedFetcher:
+    """
+    Download RSS feeds concurrently in an event loop of the calling thread.
+    The loop and its HTTP session are created by the first fetch and kept
+    until close(), so connections are kept alive and pooled per host and
+    DNS lookups are cached across fetch_many() calls of a worker process.
+    """
+    CHUNK_SIZE = 64 * 1024
+    PERMANENT_REDIRECTS = (
+        HTTPStatus.MOVED_PERMANENTLY,
+        HTTPStatus.PERMANENT_REDIRECT
+    )
+    # Event loop and session of every thread
+    _local = threading.local()
+
+    @classmethod
+    def _get_connector_options(cls) -> Dict[str, Union[bool, int]]:
+        """
+        Get options of connection pools limited in total and per host.
+
+        :return: Dict of TCPConnector keyword arguments.
+        """
+        return {
+            'keepalive_timeout': settings.FEED_FETCH_KEEPALIVE_TIMEOUT,
+            'limit': settings.FEED_FETCH_CONCURRENCY,
+            'limit_per_host': settings.FEED_FETCH_CONCURRENCY_PER_HOST,
+            'ttl_dns_cache': settings.FEED_FETCH_DNS_CACHE_TTL,
+            'use_dns_cache': True
+        }
+
+    @classmethod
+    async def _create_session(
+            cls,
+            options: Dict[str, Union[bool, int]]
+    ) -> aiohttp.ClientSession:
+        """
+        Create session in the running event loop.
+
+        :param options: Dict of TCPConnector keyword arguments.
+        :return: ClientSession instance.
+        """
+        return aiohttp.ClientSession(
+            auto_decompress=False,
+            connector=aiohttp.TCPConnector(**options)
+        )
+
+    @classmethod
+    def _get_session(
+            cls
+    ) -> Tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]:
+        """
+        Get event loop and session of the current thread. They are created
+        on the first call, again when connection limits are changed and in
+        a forked process, which doesn't use sockets of its parent.
+
+        :return: Tuple with event loop and ClientSession instance.
+        """
+        local = cls._local
+        options = cls._get_connector_options()
+
+        if getattr(local, 'pid', None) == os.getpid():
+            if local.options == options:
+                return local.loop, local.session
+
+            cls.close()
+
+        local.loop = asyncio.new_event_loop()
+        local.options = options
+        local.pid = os.getpid()
+        local.session = local.loop.run_until_complete(
+            cls._create_session(options)
+        )
+        return local.loop, local.session
+
+    @classmethod
+    def close(cls) -> None:
+        """
+        Close session and event loop of the current thread, e.g. on worker
+        process shutdown. The next fetch creates them again.
+        """
+        local = cls._local
+
+        if getattr(local, 'pid', None) != os.getpid():
+            return
+
+        local.loop.run_until_complete(local.session.close())
+        local.loop.close()
+        del local.pid
+
+    @classmethod
+    def _get_timeout(cls) -> aiohttp.ClientTimeout:
+        """
+        Get connect, read and total deadlines of a single request, so a slow
+        server can't hold the whole fetch.
+
+        :return: ClientTimeout instance.
+        """
+        return aiohttp.ClientTimeout(
+            sock_connect=settings.FEED_FETCH_CONNECT_TIMEOUT,
+            sock_read=settings.FEED_FETCH_READ_TIMEOUT,
+            total=settings.FEED_FETCH_TOTAL_TIMEOUT
+        )
+
+    @classmethod
+    def _get_headers(cls, request: FeedFetchRequest) -> Dict[str, str]:
+        """
+        Get request headers. ETag and Last-Modified values of the previous
+        fetch are sent back to make the request conditional.
+
+        :param request: FeedFetchRequest to get headers for.
+        :return: Dict of request headers.
+        """
+        headers = {
+            'A-IM': 'feed',
+            'Accept': ACCEPT_HEADER,
+            'Accept-Encoding': 'gzip, deflate, br',
+            'User-Agent': settings.FEED_FETCH_USER_AGENT,
+        }
+
+        if request.etag:
+            headers['If-None-Match'] = request.etag
+
+        if request.modified:
+            headers['If-Modified-Since'] = request.modified
+
+        return headers
+
+    @classmethod
+    def _get_decompressor(cls, headers: Dict[str, str]) -> Optional[object]:
+        """
+        Get decompressor to decode response body incrementally.
+
+        :param headers: Dict of response headers.
+        :return: Decompress object or None if body is not compressed.
+        """
+        encoding = headers.get('content-encoding', '').strip().lower()
+
+        if encoding in ('gzip', 'x-gzip'):
+            return zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+        if encoding == 'deflate':
+            return zlib.decompressobj()
+
+        if encoding == 'br':
+            return BrotliDecompressor()
+
+        return
+
+    @classmethod
+    def _get_redirect_url(
+            cls,
+            response: aiohttp.ClientResponse
+    ) -> Optional[str]:
+        """
+        Get final url of a request that was redirected only permanently.
+
+        :param response: ClientResponse of the request.
+        :return: Final url or None if request wasn't redirected permanently.
+        """
+        if not response.history:
+            return
+
+        if any(
+                redirect.status not in cls.PERMANENT_REDIRECTS
+                for redirect in response.history
+        ):
+            return
+
+        return str(response.url)
+
+    @classmethod
+    def _get_too_large_error(
+            cls,
+            request: FeedFetchRequest,
+            size: int
+    ) -> FeedFetcherTooLargeError:
+        """
+        Get error of a body larger than FEED_FETCH_MAX_SIZE.
+
+        :param request: FeedFetchRequest of the body.
+        :param size: Number of bytes received before the download stopped.
+        :return: FeedFetcherTooLargeError instance.
+        """
+        return FeedFetcherTooLargeError(
+            _('Failed to fetch {}: body is larger than {} bytes.')
+            .format(request.url, settings.FEED_FETCH_MAX_SIZE),
+            size
+        )
+
+    @classmethod
+    async def _fetch(
+            cls,
+            session: aiohttp.ClientSession,
+            request: FeedFetchRequest
+    ) -> FeedFetchResponse:
+        """
+        Download a single RSS feed. Body is decoded while streaming and
+        download stops as soon as the body exceeds FEED_FETCH_MAX_SIZE.
+
+        :param session: ClientSession shared by concurrent requests.
+        :param request: FeedFetchRequest to download.
+        :return: FeedFetchResponse with decoded body.
+        """
+        max_size = settings.FEED_FETCH_MAX_SIZE
+        size = 0
+
+        try:
+            async with session.get(
+                    request.url,
+                    headers=cls._get_headers(request),
+                    timeout=cls._get_timeout()
+            ) as response:
+                headers = {
+                    name.lower(): value
+                    for name, value in response.headers.items()
+                }
+
+                # Don't download a body that is known to be too large
+                if (response.content_length or 0) > max_size:
+                    raise cls._get_too_large_error(request, size)
+
+                decompressor = cls._get_decompressor(headers)
+                chunks = []
+                content_size = 0
+
+                async for chunk in response.content.iter_chunked(
+                        cls.CHUNK_SIZE
+                ):
+                    size += len(chunk)
+
+                    if decompressor:
+                        # Decode no more than allowed to stop zip bombs
+                        chunk = decompressor.decompress(
+                            chunk,
+                            max_size - content_size + 1
+                        )
+
+                    content_size += len(chunk)
+
+                    if content_size > max_size:
+                        raise cls._get_too_large_error(request, size)
+
+                    chunks.append(chunk)
+
+                if decompressor:
+                    chunks.append(decompressor.flush())
+        except (
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                brotli.error,
+                zlib.error
+        ) as e:
+            raise FeedFetcherError(
+                _('Failed to fetch {}: {}').format(request.url, repr(e)),
+                size
+            ) from e
+
+        return FeedFetchResponse(
+            content=b''.join(chunks),
+            headers=headers,
+            redirect_url=cls._get_redirect_url(response),
+            size=size,
+            status=response.status,
+            url=str(response.url)
+        )
+
+    @classmethod
+    async def _fetch_many(
+            cls,
+            session: aiohttp.ClientSession,
+            requests: List[FeedFetchRequest]
+    ) -> List[Union[FeedFetchResponse, FeedFetcherError]]:
+        """
+        Download RSS feeds concurrently using a shared session.
+
+        :param session: ClientSession of the current thread.
+        :param requests: List of FeedFetchRequest to download.
+        :return: List of FeedFetchResponse or FeedFetcherError in the order
+        of requests.
+        """
+        async def fetch(
+                request: FeedFetchRequest
+        ) -> Union[FeedFetchResponse, FeedFetcherError]:
+            try:
+                return await cls._fetch(session, request)
+            except FeedFetcherError as e:
+                return e
+
+        return list(await asyncio.gather(*map(fetch, requests)))
+
+    @classmethod
+    def fetch_many(
+            cls,
+            requests: Iterable[FeedFetchRequest]
+    ) -> List[Union[FeedFetchResponse, FeedFetcherError]]:
+        """
+        Download RSS feeds concurrently. Failed downloads don't interrupt
+        the others and are returned as FeedFetcherError.
+
+        :param requests: Iterable of FeedFetchRequest to download.
+        :return: List of FeedFetchResponse or FeedFetcherError in the order
+        of requests.
+        """
+        loop, session = cls._get_session()
+        task = loop.create_task(cls._fetch_many(session, list(requests)))
+
+        try:
+            return loop.run_until_complete(task)
+        finally:
+            # Requests interrupted, e.g. by soft time limit, are cancelled
+            # instead of running on with the next fetch
+            if not task.done():
+                task.cancel()
+                loop.run_until_complete(
+                    asyncio.gather(task, return_exceptions=True)
+                )
@@ -0,0 +1,135 @@
+import time
+from typing import Iterable, List
+from urllib.parse import urlsplit
+
+import redis
+from django.conf import settings
+
+
+class FeedHostLimiter:
+    """
+    Limit concurrent requests and requests per period to a single host
+    across all workers. Counters are shared in Redis, so requests over the
+    limit can be postponed instead of hitting the host and getting
+    throttled.
+    """
+    KEY_PREFIX = 'feeds:host:'
+    # Take a slot only if both concurrency and rate limits are not reached
+    ACQUIRE_SCRIPT = """
+        local active = tonumber(redis.call('GET', KEYS[1]) or '0')
+        local requests = tonumber(redis.call('GET', KEYS[2]) or '0')
+
+        if active >= tonumber(ARGV[1]) or requests >= tonumber(ARGV[2]) then
+            return 0
+        end
+
+        redis.call('INCR', KEYS[1])
+        redis.call('EXPIRE', KEYS[1], ARGV[3])
+        redis.call('INCR', KEYS[2])
+        redis.call('EXPIRE', KEYS[2], ARGV[4])
+        return 1
+    """
+    # Don't let a counter go below zero if its key is expired
+    RELEASE_SCRIPT = """
+        if tonumber(redis.call('GET', KEYS[1]) or '0') > 0 then
+            return redis.call('DECR', KEYS[1])
+        end
+
+        return 0
+    """
+
+    _client = None
+
+    @classmethod
+    def _get_client(cls) -> redis.Redis:
+        """
+        Get Redis client shared by all calls of the process.
+
+        :return: Redis instance.
+        """
+        if cls._client is None:
+            cls._client = redis.Redis.from_url(
+                settings.FEED_FETCH_HOST_LIMITER_URL
+            )
+
+        return cls._client
+
+    @classmethod
+    def _get_host(cls, url: str) -> str:
+        """
+        Get host of url including port.
+
+        :param url: Url to get host of.
+        :return: Host in lower case.
+        """
+        return urlsplit(url).netloc.lower()
+
+    @classmethod
+    def _get_active_key(cls, url: str) -> str:
+        """
+        Get key of host active requests counter.
+
+        :param url: Url to get key of.
+        :return: Redis key.
+        """
+        return '{}{}:active'.format(cls.KEY_PREFIX, cls._get_host(url))
+
+    @classmethod
+    def _get_requests_key(cls, url: str) -> str:
+        """
+        Get key of host requests counter of the current period.
+
+        :param url: Url to get key of.
+        :return: Redis key.
+        """
+        period = int(time.time() // settings.FEED_FETCH_HOST_RATE_PERIOD)
+        return '{}{}:requests:{}'.format(
+            cls.KEY_PREFIX,
+            cls._get_host(url),
+            period
+        )
+
+    @classmethod
+    def acquire(cls, urls: Iterable[str]) -> List[bool]:
+        """
+        Take request slots of url hosts. Slots are taken one by one in the
+        order of urls, so only a part of requests to the same host can get
+        them.
+
+        :param urls: Iterable of urls to request.
+        :return: List of flags in the order of urls, True if slot is taken.
+        """
+        client = cls._get_client()
+        script = client.register_script(cls.ACQUIRE_SCRIPT)
+        pipeline = client.pipeline(transaction=False)
+
+        for url in urls:
+            script(
+                args=[
+                    settings.FEED_FETCH_HOST_CONCURRENCY,
+                    settings.FEED_FETCH_HOST_RATE,
+                    # Slots of a crashed worker are freed with its lease
+                    int(settings.FEED_UPDATE_LEASE.total_seconds()),
+                    settings.FEED_FETCH_HOST_RATE_PERIOD
+                ],
+                client=pipeline,
+                keys=[cls._get_active_key(url), cls._get_requests_key(url)]
+            )
+
+        return [bool(result) for result in pipeline.execute()]
+
+    @classmethod
+    def release(cls, urls: Iterable[str]) -> None:
+        """
+        Free request slots of url hosts taken by acquire().
+
+        :param urls: Iterable of requested urls.
+        """
+        client = cls._get_client()
+        script = client.register_script(cls.RELEASE_SCRIPT)
+        pipeline = client.pipeline(transaction=False)
+
+        for url in urls:
+            script(client=pipeline, keys=[cls._get_active_key(url)])
+
+        pipeline.execute()
@@ -0,0 +1,133 @@
+import gzip
+import threading
+import zlib
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple, Type
+
+import brotli
+
+# Content encodings served to clients which accept them, in preference order
+ENCODINGS = ('gzip', 'deflate', 'br')
+ENCODERS: Dict[str, Callable[[bytes], bytes]] = {
+    'br': brotli.compress,
+    'deflate': zlib.compress,
+    'gzip': gzip.compress
+}
+
+
+class FeedHTTPRequestHandler(BaseHTTPRequestHandler):
+    """
+    Base handler of local feed servers. Bodies are encoded with the first
+    encoding of the server that the client accepts.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def _get_encoding(self) -> Optional[str]:
+        """
+        Get content encoding of the response.
+
+        :return: Encoding name or None if body is sent as is.
+        """
+        accepted = {
+            value.split(';')[0].strip().lower()
+            for value in self.headers.get('Accept-Encoding', '').split(',')
+        }
+        return next(
+            (
+                encoding
+                for encoding in self.server.encodings
+                if encoding in accepted
+            ),
+            None
+        )
+
+    def _send_content(self, body: bytes, headers: Dict[str, str]) -> None:
+        """
+        Send 200 (OK) response with encoded body.
+
+        :param body: Response body before encoding.
+        :param headers: Dict of additional response headers.
+        """
+        encoding = self._get_encoding()
+
+        if encoding:
+            body = ENCODERS[encoding](body)
+            headers = {**headers, 'Content-Encoding': encoding}
+
+        self._send(HTTPStatus.OK, body, headers)
+
+    def _send(
+            self,
+            status: int,
+            body: bytes,
+            headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Send response with body and headers.
+
+        :param status: HTTP status code.
+        :param body: Response body.
+        :param headers: Dict of additional response headers.
+        """
+        self.send_response(status)
+
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Tuple) -> None:
+        """
+        Don't log every request.
+        """
+        pass
+
+
+class FeedHTTPServer(ThreadingHTTPServer):
+    """
+    Local HTTP server of feeds. Every request is served in its own thread,
+    so slow responses don't block the others. Used as a context manager,
+    the server runs in a background thread until the block ends.
+    """
+    daemon_threads = True
+
+    def __init__(
+            self,
+            address: Tuple[str, int],
+            handler_class: Type[FeedHTTPRequestHandler],
+            encodings: Tuple[str, ...] = ENCODINGS
+    ) -> None:
+        """
+        :param address: Host and port to listen.
+        :param handler_class: FeedHTTPRequestHandler subclass.
+        :param encodings: Content encodings in preference order.
+        """
+        super().__init__(address, handler_class)
+        self.encodings = encodings
+        self.stopped = threading.Event()
+
+    def __enter__(self) -> 'FeedHTTPServer':
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args: Tuple) -> None:
+        self.stopped.set()
+        self.shutdown()
+        self.server_close()
+
+    def get_url(self, path: str, host: Optional[str] = None) -> str:
+        """
+        Get absolute url of the path on this server.
+
+        :param path: Url path.
+        :param host: Host name clients use, listening address if not set.
+        :return: Absolute url.
+        """
+        return 'http://{}:{}{}'.format(
+            host or self.server_address[0],
+            self.server_address[1],
+            path
+        )
@@ -0,0 +1,92 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from multiprocessing import current_process
+from typing import Callable, Iterable, List, Optional
+
+from django.conf import settings
+
+
+class FeedParserPool:
+    """
+    Run CPU-bound feed parsing in a pool of FEED_PARSE_PROCESSES processes.
+    The pool is created once per process and shared by all its threads.
+    Daemonic processes, e.g. Celery prefork pool children, can't start
+    processes, so there, as with FEED_PARSE_PROCESSES set to 0, parsing runs
+    in the calling process and the prefork pool itself spreads parsing of
+    concurrent batches over the cores.
+    """
+    _executor = None
+    _is_disabled = False
+    _lock = threading.Lock()
+
+    @classmethod
+    def _get_executor(cls) -> Optional[ProcessPoolExecutor]:
+        """
+        Get the shared pool, create it on the first call.
+
+        :return: ProcessPoolExecutor instance or None if pool is disabled.
+        """
+        if (
+                cls._is_disabled
+                or not settings.FEED_PARSE_PROCESSES
+                or current_process().daemon
+        ):
+            return
+
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ProcessPoolExecutor(
+                    settings.FEED_PARSE_PROCESSES
+                )
+
+        return cls._executor
+
+    @classmethod
+    def _disable(cls) -> None:
+        """
+        Shut the pool down and parse in the calling process from now on.
+        """
+        with cls._lock:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=False)
+
+            cls._executor = None
+            cls._is_disabled = True
+
+    @classmethod
+    def map(cls, func: Callable, *iterables: Iterable) -> List:
+        """
+        Call func for every set of arguments in the pool. func and its
+        arguments and results must be picklable. Exception raised by a
+        single call doesn't interrupt the others and is returned instead of
+        its result.
+
+        :param func: Module level function or classmethod to call.
+        :param iterables: Iterables of func arguments.
+        :return: List of func results or exceptions in the order of
+        arguments.
+        """
+        args = list(zip(*iterables))
+        calls = [partial(func, *arg) for arg in args]
+        executor = cls._get_executor() if args else None
+
+        if executor:
+            try:
+                calls = [
+                    executor.submit(func, *arg).result
+                    for arg in args
+                ]
+            except (BrokenProcessPool, OSError):
+                cls._disable()
+
+        results = []
+
+        for call in calls:
+            try:
+                results.append(call())
+            except Exception as e:
+                results.append(e)
+
+        return results
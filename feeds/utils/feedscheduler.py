@@ -0,0 +1,165 @@
+from datetime import datetime, timedelta
+from statistics import median
+from typing import Iterable, Optional, Set
+
+from django.conf import settings
+from django.utils import timezone
+
+from feeds.models import Feed
+
+DAYS = (
+    'Monday',
+    'Tuesday',
+    'Wednesday',
+    'Thursday',
+    'Friday',
+    'Saturday',
+    'Sunday'
+)
+
+
+class FeedScheduler:
+    """
+    Calculate when a FeedSubscription has to be fetched next time based on
+    feed ttl, skipHours and skipDays hints and its observed publish cadence.
+    """
+    @classmethod
+    def _get_ttl(cls, feed: Optional[Feed]) -> Optional[timedelta]:
+        """
+        Get feed ttl as timedelta.
+
+        :param feed: Feed instance or None.
+        :return: ttl timedelta or None if it's not set or invalid.
+        """
+        try:
+            return timedelta(minutes=int(feed.ttl))
+        except (AttributeError, TypeError, ValueError):
+            return
+
+    @classmethod
+    def _get_cadence(
+            cls,
+            pub_dates: Iterable[Optional[datetime]]
+    ) -> Optional[timedelta]:
+        """
+        Get median interval between publication dates.
+
+        :param pub_dates: Publication dates of feed items.
+        :return: Median interval or None if it can't be calculated.
+        """
+        pub_dates = sorted({
+            pub_date for pub_date in pub_dates if pub_date is not None
+        })
+        intervals = [
+            later - earlier
+            for earlier, later in zip(pub_dates, pub_dates[1:])
+        ]
+
+        if not intervals:
+            return
+
+        return median(intervals)
+
+    @classmethod
+    def get_skip_hours(cls, feed: Optional[Feed]) -> Set[int]:
+        """
+        Get hours (GMT) when feed must not be fetched.
+
+        :param feed: Feed instance or None.
+        :return: Set of skipped hours.
+        """
+        values = getattr(feed, 'skip_hours', None) or ''
+        return {
+            int(value) % 24
+            for value in values.split(',')
+            if value.strip().isdigit()
+        }
+
+    @classmethod
+    def get_skip_days(cls, feed: Optional[Feed]) -> Set[int]:
+        """
+        Get weekdays (GMT) when feed must not be fetched.
+
+        :param feed: Feed instance or None.
+        :return: Set of skipped weekdays where Monday is 0 and Sunday is 6.
+        """
+        values = getattr(feed, 'skip_days', None) or ''
+        days = [day.lower() for day in DAYS]
+        return {
+            days.index(value.strip().lower())
+            for value in values.split(',')
+            if value.strip().lower() in days
+        }
+
+    @classmethod
+    def get_interval(
+            cls,
+            feed: Optional[Feed],
+            pub_dates: Iterable[Optional[datetime]] = (),
+            previous_interval: Optional[timedelta] = None,
+            is_modified: bool = True
+    ) -> timedelta:
+        """
+        Get interval between fetches. Modified feeds are fetched with a half
+        of their publish cadence, not modified ones are fetched less often
+        with every fetch. Interval is never shorter than feed ttl and is
+        limited by FEED_UPDATE_MIN_INTERVAL and FEED_UPDATE_MAX_INTERVAL.
+
+        :param feed: Feed instance or None.
+        :param pub_dates: Publication dates of fetched feed items.
+        :param previous_interval: Interval of the previous fetch.
+        :param is_modified: Was feed modified since the previous fetch.
+        :return: Interval between fetches.
+        """
+        interval = previous_interval or settings.FEED_UPDATE_MIN_INTERVAL
+
+        if is_modified:
+            cadence = cls._get_cadence(pub_dates)
+
+            if cadence is not None:
+                interval = cadence * settings.FEED_UPDATE_CADENCE_FACTOR
+        else:
+            interval *= settings.FEED_UPDATE_BACKOFF_FACTOR
+
+        interval = max(
+            interval,
+            cls._get_ttl(feed) or interval,
+            settings.FEED_UPDATE_MIN_INTERVAL
+        )
+        return min(interval, settings.FEED_UPDATE_MAX_INTERVAL)
+
+    @classmethod
+    def get_next_fetch_at(
+            cls,
+            feed: Optional[Feed],
+            interval: timedelta,
+            now: Optional[datetime] = None
+    ) -> datetime:
+        """
+        Get the next fetch time moved out of feed skipHours and skipDays.
+
+        :param feed: Feed instance or None.
+        :param interval: Interval between fetches.
+        :param now: Time of the current fetch, current time by default.
+        :return: Time of the next fetch.
+        """
+        fetch_at = (now or timezone.now()) + interval
+        skip_hours = cls.get_skip_hours(feed)
+        skip_days = cls.get_skip_days(feed)
+
+        # Hints that skip the whole day or week are ignored
+        if len(skip_hours) >= 24 or len(skip_days) >= 7:
+            return fetch_at
+
+        fetch_at = fetch_at.astimezone(timezone.utc)
+
+        while (
+                fetch_at.hour in skip_hours
+                or fetch_at.weekday() in skip_days
+        ):
+            fetch_at = (
+                fetch_at.replace(minute=0, second=0, microsecond=0)
+                + timedelta(hours=1)
+            )
+
+        return fetch_at
@@ -0,0 +1,337 @@
+import re
+from io import BytesIO
+from typing import Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import Element, iterparse, ParseError
+
+from django.utils.translation import gettext as _
+from feedparser.datetimes import _parse_date
+from feedparser.sanitizer import _sanitize_html
+from feedparser.util import FeedParserDict
+
+DC_NAMESPACE = '{http://purl.org/dc/elements/1.1/}'
+VERSIONS = {
+    '0.91': 'rss091u',
+    '0.92': 'rss092',
+    '0.93': 'rss093',
+    '0.94': 'rss094',
+    '2.0': 'rss20'
+}
+
+
+class FeedStreamParserError(Exception):
+    pass
+
+
+class FeedStreamParserUnsupportedError(FeedStreamParserError):
+    pass
+
+
+class FeedStreamParser:
+    """
+    Parse RSS 2.0 documents incrementally. Channel metadata is yielded first
+    and entries are yielded one at a time, each parsed entry element is
+    dropped right away, so memory used by the parser, besides the content
+    itself, doesn't grow with the number of entries. Parsed values use the
+    same keys as feedparser, but only the ones FeedUpdater and
+    FeedItemUpdater consume are set.
+    """
+    @classmethod
+    def _get_text(
+            cls,
+            element: Element,
+            tag: str,
+            default: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Get stripped text of a child element.
+
+        :param element: Parent element.
+        :param tag: Child element tag.
+        :param default: Value returned if child doesn't exist.
+        :return: Child element text.
+        """
+        child = element.find(tag)
+
+        if child is None:
+            return default
+
+        return (child.text or '').strip()
+
+    @classmethod
+    def _get_children(cls, element: Element, tag: str) -> dict:
+        """
+        Get texts of a child element children, e.g. of image or textInput.
+
+        :param element: Parent element.
+        :param tag: Child element tag.
+        :return: Dict in tag:text format.
+        """
+        child = element.find(tag)
+
+        if child is None:
+            return {}
+
+        return {
+            grandchild.tag: (grandchild.text or '').strip()
+            for grandchild in child
+        }
+
+    @classmethod
+    def _get_date(cls, element: Element, tag: str) -> Optional[tuple]:
+        """
+        Get date of a child element parsed the same way feedparser does.
+
+        :param element: Parent element.
+        :param tag: Child element tag.
+        :return: struct_time in UTC or None.
+        """
+        value = cls._get_text(element, tag)
+        return _parse_date(value) if value else None
+
+    @classmethod
+    def _get_tags(cls, element: Element) -> List[FeedParserDict]:
+        """
+        Get categories of channel or item element.
+
+        :param element: channel or item element.
+        :return: List of categories in feedparser format.
+        """
+        return [
+            FeedParserDict(
+                label=None,
+                scheme=category.get('domain'),
+                term=(category.text or '').strip()
+            )
+            for category in element.findall('category')
+        ]
+
+    @classmethod
+    def _get_skip_values(cls, element: Element, tag: str) -> List[str]:
+        """
+        Get values of skipHours or skipDays element.
+
+        :param element: channel element.
+        :param tag: skipHours or skipDays.
+        :return: List of nested values.
+        """
+        return [
+            (child.text or '').strip()
+            for child in element.findall('{}/*'.format(tag))
+        ]
+
+    @classmethod
+    def _update_feed(cls, feed: FeedParserDict, channel: Element) -> None:
+        """
+        Set channel metadata parsed so far to feed.
+
+        :param feed: Channel metadata to update.
+        :param channel: channel element without parsed items.
+        """
+        cloud = channel.find('cloud')
+        image = cls._get_children(channel, 'image')
+        text_input = cls._get_children(channel, 'textInput')
+        values = {
+            'author': cls._get_text(channel, 'managingEditor'),
+            'cloud': (
+                FeedParserDict(cloud.attrib) if cloud is not None else None
+            ),
+            'docs': cls._get_text(channel, 'docs'),
+            'generator': cls._get_text(channel, 'generator'),
+            'image': FeedParserDict(
+                description=image.get('description'),
+                height=image.get('height'),
+                href=image.get('url'),
+                link=image.get('link'),
+                title=image.get('title'),
+                width=image.get('width')
+            ) if image else None,
+            'language': cls._get_text(channel, 'language'),
+            'link': cls._get_text(channel, 'link'),
+            'published_parsed': cls._get_date(channel, 'pubDate'),
+            'publisher': cls._get_text(channel, 'webMaster'),
+            'rights': cls._get_text(channel, 'copyright'),
+            'skip_days': cls._get_skip_values(channel, 'skipDays'),
+            'skip_hours': cls._get_skip_values(channel, 'skipHours'),
+            'subtitle': cls._get_text(channel, 'description'),
+            'tags': cls._get_tags(channel),
+            'textinput': FeedParserDict(text_input) if text_input else None,
+            'title': cls._get_text(channel, 'title'),
+            'ttl': cls._get_text(channel, 'ttl')
+        }
+        feed.update({
+            name: value
+            for name, value in values.items()
+            if value is not None and (value or name not in feed)
+        })
+
+    @classmethod
+    def _get_entry(cls, item: Element) -> FeedParserDict:
+        """
+        Get entry data of item element.
+
+        :param item: item element.
+        :return: Entry data in feedparser format.
+        """
+        entry = FeedParserDict()
+        guid = item.find('guid')
+        values = {
+            'author': (
+                cls._get_text(item, 'author')
+                or cls._get_text(item, DC_NAMESPACE + 'creator')
+            ),
+            'comments': cls._get_text(item, 'comments'),
+            'id': (guid.text or '').strip() if guid is not None else None,
+            'link': cls._get_text(item, 'link'),
+            # FeedParserDict gets enclosures out of links
+            'links': [
+                FeedParserDict(
+                    href=enclosure.get('url'),
+                    length=enclosure.get('length'),
+                    rel='enclosure',
+                    type=enclosure.get('type')
+                )
+                for enclosure in item.findall('enclosure')
+            ],
+            'published_parsed': cls._get_date(item, 'pubDate'),
+            'summary': cls._get_text(item, 'description'),
+            'tags': cls._get_tags(item),
+            'title': cls._get_text(item, 'title')
+        }
+
+        if values['summary']:
+            values['summary'] = _sanitize_html(
+                values['summary'],
+                'utf-8',
+                'text/html'
+            )
+
+        # Permanent link guid is used as a link if item has no link
+        if (
+                not values['link']
+                and values['id']
+                and guid.get('isPermaLink', 'true').lower() == 'true'
+        ):
+            values['link'] = values['id']
+
+        entry.update({
+            name: value
+            for name, value in values.items()
+            if value is not None
+        })
+        return entry
+
+    @classmethod
+    def _iterate_elements(
+            cls,
+            content: bytes
+    ) -> Iterator[Tuple[str, int, Element]]:
+        """
+        Parse RSS content into start and end events of its elements.
+
+        :param content: Raw RSS content.
+        :return: Iterator of event, element depth, starting with 1 for the
+        root element, and element.
+        """
+        depth = 0
+
+        try:
+            for event, element in iterparse(
+                    BytesIO(content),
+                    events=('start', 'end')
+            ):
+                if event == 'start':
+                    depth += 1
+
+                if depth == 1 and element.tag != 'rss':
+                    raise FeedStreamParserUnsupportedError(
+                        _('Unsupported root element {}.').format(element.tag)
+                    )
+
+                yield event, depth, element
+
+                if event == 'end':
+                    depth -= 1
+        except ParseError as e:
+            raise FeedStreamParserError(
+                _('Failed to parse RSS: {}').format(e)
+            ) from e
+
+    @classmethod
+    def iterparse(cls, content: bytes) -> Iterator[FeedParserDict]:
+        """
+        Parse RSS content incrementally. Channel metadata is yielded first,
+        as soon as the first item starts, and then entries one by one.
+        Channel elements placed after items are added to the already
+        yielded channel metadata when the channel ends.
+
+        :param content: Raw RSS content.
+        :return: Iterator of channel metadata and entries data.
+        """
+        feed = FeedParserDict()
+        channel = None
+        parent = None
+        is_feed_yielded = False
+
+        for event, depth, element in cls._iterate_elements(content):
+            if event == 'start' and depth == 2:
+                parent = element
+
+            is_channel = depth == 2 and element.tag == 'channel'
+            is_item = (
+                depth == 3 and element.tag == 'item' and parent is channel
+            )
+
+            if is_channel and event == 'start':
+                channel = element
+            elif is_item and event == 'start' and not is_feed_yielded:
+                cls._update_feed(feed, channel)
+                is_feed_yielded = True
+                yield feed
+            elif is_item and event == 'end':
+                yield cls._get_entry(element)
+                # Drop parsed item to keep memory usage flat
+                channel.remove(element)
+            elif is_channel and event == 'end':
+                cls._update_feed(feed, channel)
+
+                if not is_feed_yielded:
+                    is_feed_yielded = True
+                    yield feed
+
+        if channel is None:
+            raise FeedStreamParserError(_('RSS has no channel.'))
+
+    @classmethod
+    def parse(cls, content: bytes) -> FeedParserDict:
+        """
+        Parse RSS content into a structure compatible with feedparser.parse()
+        result. Entries are an iterator, parsed while they are consumed, so
+        the caller never holds all of them, and errors in the document after
+        the channel start are raised while iterating.
+
+        :param content: Raw RSS content.
+        :return: Parsed RSS data.
+        """
+        version = re.search(
+            rb'<rss\b[^>]*\bversion=["\']([^"\']+)',
+            content[:1024]
+        )
+        encoding = re.match(
+            rb'\s*<\?xml[^>]*\bencoding=["\']([^"\']+)',
+            content
+        )
+        items = cls.iterparse(content)
+        feed = next(items)
+        return FeedParserDict(
+            bozo=False,
+            encoding=(
+                encoding.group(1).decode('ascii', 'ignore').lower()
+                if encoding else 'utf-8'
+            ),
+            entries=items,
+            feed=feed,
+            version=VERSIONS.get(
+                version.group(1).decode('ascii', 'ignore') if version else '',
+                'rss'
+            )
+        )
@@ -1,19 +1,47 @@
+import asyncio
+import hashlib
+import json
+import re
+import socket
 from datetime import datetime
+from http import HTTPStatus
 from time import mktime
-from typing import Tuple, Union
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Type, Union
 
 import feedparser
-from django.db import transaction
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import Q
+from django.utils import timezone
 from django.utils.translation import gettext as _
 from feedparser.util import FeedParserDict
 
 from feeds.models import (
     Feed,
     FeedCategory,
+    FeedCategoryAbstract,
     FeedItem,
     FeedItemCategory,
+    FeedPayload,
     FeedSubscription
 )
+from feeds.utils.feedarchive import FeedArchive
+from feeds.utils.feedfetcher import (
+    FeedFetcher,
+    FeedFetcherError,
+    FeedFetcherTooLargeError,
+    FeedFetchRequest,
+    FeedFetchResponse
+)
+from feeds.utils.feedhostlimiter import FeedHostLimiter
+from feeds.utils.feedparserpool import FeedParserPool
+from feeds.utils.feedscheduler import FeedScheduler
+from feeds.utils.feedstreamparser import (
+    FeedStreamParser,
+    FeedStreamParserError,
+    FeedStreamParserUnsupportedError
+)
 
 
 class FeedUpdaterDoesntExistError(Exception):
@@ -21,6 +49,20 @@ class FeedUpdaterDoesntExistError(Exception):
 
 
 class FeedUpdaterInvalidRSSError(Exception):
+    def __init__(
+            self,
+            message: str,
+            reason: str = FeedSubscription.FAILURE_UNKNOWN
+    ) -> None:
+        """
+        :param message: Error message.
+        :param reason: One of FeedSubscription.FAILURE_CHOICES values.
+        """
+        super().__init__(message)
+        self.reason = reason
+
+
+class FeedUpdaterPostponedError(Exception):
     pass
 
 
@@ -44,6 +86,77 @@ class BaseFeedUpdater:
 
         return
 
+    @classmethod
+    def get_categories(
+            cls,
+            data: Union[FeedParserDict, dict]
+    ) -> Set[Tuple[str, str, str]]:
+        """
+        Get unique categories as (keyword, domain, label) tuples.
+
+        :param data: Parsed RSS feed data that may include categories.
+        :return: Set of (keyword, domain, label) tuples.
+        """
+        return {
+            (
+                category.get('term'),
+                category.get('scheme'),
+                category.get('label')
+            )
+            for category in data.get('tags', [])
+        }
+
+    @classmethod
+    def _sync_categories(
+            cls,
+            model: Type[FeedCategoryAbstract],
+            relation: str,
+            categories: Dict[int, Set[Tuple[str, str, str]]]
+    ) -> None:
+        """
+        Make stored categories equal to fetched ones. Only the difference is
+        written: missing categories are inserted and stale or duplicated
+        ones are deleted, both in bulk.
+
+        :param model: Category model to synchronise.
+        :param relation: Name of the category model relation field.
+        :param categories: Dict of fetched categories in
+        related_id:{(keyword, domain, label)} format.
+        """
+        missing = {
+            related_id: set(values)
+            for related_id, values in categories.items()
+        }
+        stale_ids = []
+        stored = (
+            model
+            .objects
+            .filter(**{'{}__in'.format(relation): list(categories)})
+            .values_list('id', relation, 'keyword', 'domain', 'label')
+        )
+
+        for category_id, related_id, *values in stored:
+            values = tuple(values)
+
+            if values in missing[related_id]:
+                missing[related_id].remove(values)
+            else:
+                stale_ids.append(category_id)
+
+        if stale_ids:
+            model.objects.filter(id__in=stale_ids).delete()
+
+        model.objects.bulk_create([
+            model(**{
+                'domain': domain,
+                'keyword': keyword,
+                'label': label,
+                '{}_id'.format(relation): related_id
+            })
+            for related_id, values in missing.items()
+            for keyword, domain, label in values
+        ])
+
 
 class FeedItemUpdater(BaseFeedUpdater):
     @classmethod
@@ -58,6 +171,7 @@ class FeedItemUpdater(BaseFeedUpdater):
             feed = (
                 Feed
                 .objects
+                .select_related('subscription')
                 .get(id=feed_id)
             )
         except Feed.DoesNotExist:
@@ -68,19 +182,17 @@ class FeedItemUpdater(BaseFeedUpdater):
         return feed
 
     @classmethod
-    def _update_feed_item(cls, feed: Feed, feed_item_data: dict) -> FeedItem:
+    def _get_feed_item_fields(cls, feed: Feed, feed_item_data: dict) -> dict:
         """
-        Create or update FeedItem based on RSS feed item data.
+        Map RSS feed item data to FeedItem field values.
 
         :param feed: Feed instance related to FeedItem.
         :param feed_item_data: RSS feed item data.
-        :return: Updated FeedItem instance.
+        :return: Dict of FeedItem values in field_name:value format.
         """
         enclosure = next(iter(feed_item_data.get('enclosures', [])), {})
-        guid = feed_item_data.get('id')
-        title = feed_item_data.get('title')
         # Create a filed_name:value dict out of fetched data for FeedItem
-        data = {
+        return {
             'author': feed_item_data.get('author'),
             'comments': feed_item_data.get('comments'),
             'description': feed_item_data.get('summary'),
@@ -88,34 +200,102 @@ class FeedItemUpdater(BaseFeedUpdater):
             'enclosure_type': enclosure.get('type'),
             'enclosure_url': enclosure.get('href'),
             'feed': feed,
-            'guid': guid,
+            'guid': feed_item_data.get('id'),
+            'identity_key': FeedItem.get_identity_key(
+                feed_item_data.get('id'),
+                feed_item_data.get('link'),
+                feed_item_data.get('title')
+            ),
             'link': feed_item_data.get('link'),
             'pub_date': cls.get_pub_date(feed_item_data),
-            'title': title
+            'title': feed_item_data.get('title')
         }
-        fields = {
-            'feed': feed
+
+    @classmethod
+    def _get_fingerprint(
+            cls,
+            data: dict,
+            categories: Set[Tuple[str, str, str]]
+    ) -> str:
+        """
+        Get a digest of FeedItem values and categories to detect if fetched
+        item differs from the stored one.
+
+        :param data: Dict of FeedItem values in field_name:value format.
+        :param categories: Set of (keyword, domain, label) tuples.
+        :return: SHA-256 hex digest.
+        """
+        values = {
+            name: value
+            for name, value in data.items()
+            if name not in ('feed', 'fingerprint', 'identity_key')
         }
+        content = json.dumps(
+            [values, sorted(categories, key=str)],
+            default=str,
+            sort_keys=True
+        )
+        return hashlib.sha256(content.encode()).hexdigest()
 
-        # To determine the uniqueness of a FeedItem by guid, if it exists,
-        # or title, if not
-        if guid:
-            fields['guid'] = guid
-        else:
-            fields['title'] = title
+    @classmethod
+    def _is_matched_by_title(cls, data: dict) -> bool:
+        """
+        Check if FeedItem is matched by title instead of identity key. Title
+        is unique within Feed (see FeedItem.clean), so an item without guid
+        and link matches a stored item with the same title, even if that
+        one was stored with guid or link.
+
+        :param data: Dict of FeedItem values in field_name:value format.
+        :return: Is FeedItem matched by title.
+        """
+        return not data['guid'] and not data['link']
+
+    @classmethod
+    def _update_feed_item(
+            cls,
+            feed: Feed,
+            feed_item_data: dict
+    ) -> Tuple[FeedItem, bool]:
+        """
+        Create or update FeedItem based on RSS feed item data. FeedItem is
+        not saved if its fingerprint is not changed.
 
+        :param feed: Feed instance related to FeedItem.
+        :param feed_item_data: RSS feed item data.
+        :return: Tuple with FeedItem instance and is it changed.
+        """
+        data = cls._get_feed_item_fields(feed, feed_item_data)
+        data['fingerprint'] = cls._get_fingerprint(
+            data,
+            cls.get_categories(feed_item_data)
+        )
+        lookup = (
+            {'title': data['title']}
+            if cls._is_matched_by_title(data)
+            else {'identity_key': data['identity_key']}
+        )
+        # Unique feed+identity_key makes concurrent creates return the
+        # same FeedItem
         feed_item, created = FeedItem.objects.get_or_create(
-            defaults=data,
-            **fields
+            defaults=dict(data, owner_id=feed.subscription.owner_id),
+            feed=feed,
+            **lookup
         )
 
-        if not created:
-            # Update FeedItem with fetched values
-            for name, value in data.items():
+        if created:
+            feed.add_items(1)
+            return feed_item, True
+
+        if feed_item.fingerprint == data['fingerprint']:
+            return feed_item, False
+
+        # Update FeedItem with fetched values, stored identity is kept
+        for name, value in data.items():
+            if name != 'identity_key':
                 setattr(feed_item, name, value)
 
         feed_item.save()
-        return feed_item
+        return feed_item, True
 
     @classmethod
     def _update_categories(
@@ -129,16 +309,238 @@ class FeedItemUpdater(BaseFeedUpdater):
         :param feed_item: FeedItem instance to assign categories.
         :param feed_item_data: Dict that may include categories.
         """
-        feed_item.categories.all().delete()
-        categories = feed_item_data.get('tags', [])
+        cls._sync_categories(
+            FeedItemCategory,
+            'item',
+            {feed_item.id: cls.get_categories(feed_item_data)}
+        )
+
+    @classmethod
+    def _get_existing_feed_items(
+            cls,
+            feed: Feed,
+            items_data: List[dict]
+    ) -> List[FeedItem]:
+        """
+        Get FeedItem objects of Feed that match fetched items by identity
+        key or title or use their links in a single query.
+
+        :param feed: Feed instance related to FeedItem objects.
+        :param items_data: List of FeedItem values in field_name:value format.
+        :return: List of matching FeedItem instances.
+        """
+        keys = {data['identity_key'] for data in items_data}
+        links = {data['link'] for data in items_data if data['link']}
+        titles = {
+            data['title']
+            for data in items_data
+            if cls._is_matched_by_title(data)
+        }
+        return list(
+            FeedItem
+            .objects
+            .filter(feed=feed)
+            .filter(
+                Q(identity_key__in=keys)
+                | Q(link__in=links)
+                | Q(title__in=titles)
+            )
+        )
+
+    @classmethod
+    def _get_stored_feed_items(
+            cls,
+            feed: Feed,
+            items_data: List[dict]
+    ) -> Tuple[Dict[Tuple[str, str], FeedItem], Dict[str, int]]:
+        """
+        Get stored FeedItem objects matching fetched items.
+
+        :param feed: Feed instance related to FeedItem objects.
+        :param items_data: List of FeedItem values in field_name:value format.
+        :return: Tuple with a dict of FeedItem instances in
+        (field_name, value):FeedItem format, for identity_key and title, and
+        a dict of used links in link:feed_item_id format.
+        """
+        stored = {}
+        link_owners = {}
+
+        for feed_item in cls._get_existing_feed_items(feed, items_data):
+            if feed_item.identity_key:
+                stored[('identity_key', feed_item.identity_key)] = feed_item
+
+            stored.setdefault(('title', feed_item.title), feed_item)
+
+            if feed_item.link:
+                link_owners[feed_item.link] = feed_item.id
+
+        return stored, link_owners
+
+    @classmethod
+    def _create_feed_items(
+            cls,
+            feed: Feed,
+            feed_items: List[FeedItem]
+    ) -> int:
+        """
+        Insert FeedItem objects skipping the ones which identity key or link
+        is already used, e.g. by a concurrent update. Items are given ids of
+        the stored rows, item skipped because of its link is left without
+        id.
+
+        :param feed: Feed instance related to FeedItem objects.
+        :param feed_items: List of new FeedItem instances.
+        :return: Number of inserted rows.
+        """
+        if not feed_items:
+            return 0
+
+        FeedItem.objects.bulk_create(feed_items, ignore_conflicts=True)
+        # Ids of inserted rows are not returned if conflicts are ignored
+        stored = {
+            identity_key: (feed_item_id, created)
+            for identity_key, feed_item_id, created in (
+                FeedItem
+                .objects
+                .filter(
+                    feed=feed,
+                    identity_key__in=[
+                        feed_item.identity_key
+                        for feed_item in feed_items
+                    ]
+                )
+                .values_list('identity_key', 'id', 'created')
+            )
+        }
+        inserted = 0
 
-        for category in categories:
-            FeedItemCategory.objects.create(
-                domain=category.get('scheme'),
-                item=feed_item,
-                keyword=category.get('term'),
-                label=category.get('label')
+        for feed_item in feed_items:
+            feed_item.id, created = stored.get(
+                feed_item.identity_key,
+                (None, None)
             )
+            feed_item._state.adding = False
+
+            # Row stored by a concurrent update has another creation time
+            if created == feed_item.created:
+                inserted += 1
+
+        return inserted
+
+    @classmethod
+    def _update_feed_items(
+            cls,
+            feed: Feed,
+            feed_items_data: List[dict]
+    ) -> List[Tuple[FeedItem, dict]]:
+        """
+        Create or update FeedItem objects based on RSS feed items data using
+        bulk queries. Items with unchanged fingerprint are skipped.
+
+        :param feed: Feed instance related to FeedItem objects.
+        :param feed_items_data: List of RSS feed items data.
+        :return: List of tuples with created or changed FeedItem instance and
+        its RSS feed item data.
+        """
+        items_data = {}
+
+        for feed_item_data in feed_items_data:
+            data = cls._get_feed_item_fields(feed, feed_item_data)
+            data['fingerprint'] = cls._get_fingerprint(
+                data,
+                cls.get_categories(feed_item_data)
+            )
+            # The first occurrence of a duplicated item wins
+            items_data.setdefault(
+                data['identity_key'],
+                (data, feed_item_data)
+            )
+
+        stored, link_owners = cls._get_stored_feed_items(
+            feed,
+            [data for data, _ in items_data.values()]
+        )
+        now = timezone.now()
+        created_feed_items = []
+        updated_feed_items = []
+        result = []
+
+        for identity, (data, feed_item_data) in items_data.items():
+            feed_item = stored.get(
+                ('title', data['title'])
+                if cls._is_matched_by_title(data)
+                else ('identity_key', identity)
+            )
+            owner = feed_item.id if feed_item else identity
+
+            # Skip item which link is already used by another item to keep
+            # feed+link unique
+            if (
+                    data['link']
+                    and link_owners.setdefault(data['link'], owner) != owner
+            ):
+                continue
+
+            # Skip item which values and categories are not changed
+            if feed_item and feed_item.fingerprint == data['fingerprint']:
+                continue
+
+            if feed_item:
+                # Update FeedItem with fetched values, stored identity is
+                # kept
+                for name, value in data.items():
+                    if name != 'identity_key':
+                        setattr(feed_item, name, value)
+
+                # bulk_update() doesn't trigger auto_now
+                feed_item.updated = now
+                updated_feed_items.append(feed_item)
+            else:
+                feed_item = FeedItem(
+                    owner_id=feed.subscription.owner_id,
+                    **data
+                )
+                created_feed_items.append(feed_item)
+
+            result.append((feed_item, feed_item_data))
+
+        update_fields = [
+            name
+            for name in cls._get_feed_item_fields(feed, {})
+            if name not in ('feed', 'identity_key')
+        ]
+        FeedItem.objects.bulk_update(
+            updated_feed_items,
+            update_fields + ['fingerprint', 'updated']
+        )
+        feed.add_items(cls._create_feed_items(feed, created_feed_items))
+        # Items which link is used by another row are skipped
+        return [
+            (feed_item, feed_item_data)
+            for feed_item, feed_item_data in result
+            if feed_item.id
+        ]
+
+    @classmethod
+    def _update_feed_items_categories(
+            cls,
+            feed_items: List[Tuple[FeedItem, dict]]
+    ) -> None:
+        """
+        Sets FeedItemCategory objects to multiple FeedItem objects using
+        bulk queries.
+
+        :param feed_items: List of tuples with FeedItem instance and a dict
+        that may include its categories.
+        """
+        cls._sync_categories(
+            FeedItemCategory,
+            'item',
+            {
+                feed_item.id: cls.get_categories(feed_item_data)
+                for feed_item, feed_item_data in feed_items
+            }
+        )
 
     @classmethod
     @transaction.atomic
@@ -151,12 +553,86 @@ class FeedItemUpdater(BaseFeedUpdater):
         :return: FeedItem instance.
         """
         feed = cls._get_feed(feed_id)
-        feed_item = cls._update_feed_item(feed, feed_item_data)
-        cls._update_categories(feed_item, feed_item_data)
+        feed_item, is_changed = cls._update_feed_item(feed, feed_item_data)
+
+        if is_changed:
+            cls._update_categories(feed_item, feed_item_data)
+
         return feed_item
 
+    @classmethod
+    @transaction.atomic
+    def update_many(
+            cls,
+            feed_id: int,
+            feed_items_data: List[dict]
+    ) -> List[FeedItem]:
+        """
+        Create/update all FeedItem objects of a single fetch and related
+        instances of FeedItemCategory with a fixed number of queries.
+
+        :param feed_id: Feed id to update related FeedItem objects.
+        :param feed_items_data: List of parsed RSS feed items data.
+        :return: List of created or changed FeedItem instances.
+        """
+        feed = cls._get_feed(feed_id)
+        feed_items = cls._update_feed_items(feed, feed_items_data)
+        cls._update_feed_items_categories(feed_items)
+        return [feed_item for feed_item, _ in feed_items]
+
 
 class FeedUpdater(BaseFeedUpdater):
+    # Parsed RSS data consumed by FeedUpdater and FeedItemUpdater
+    ENTRY_KEYS = [
+        'author',
+        'comments',
+        'enclosures',
+        'id',
+        'link',
+        'published_parsed',
+        'summary',
+        'tags',
+        'title'
+    ]
+    ENCLOSURE_KEYS = ['href', 'length', 'type']
+    TAG_KEYS = ['label', 'scheme', 'term']
+    FEED_KEYS = [
+        'author',
+        'cloud',
+        'docs',
+        'generator',
+        'image',
+        'language',
+        'link',
+        'published_parsed',
+        'publisher',
+        'rights',
+        'skip_days',
+        'skip_hours',
+        'subtitle',
+        'tags',
+        'textinput',
+        'title',
+        'ttl'
+    ]
+    # FeedSubscription fields changed by a successful update
+    SUBSCRIPTION_FIELDS = [
+        'content_hash',
+        'etag',
+        'failure_reason',
+        'fetch_count',
+        'fetch_interval',
+        'is_stopped',
+        'last_modified',
+        'lease_expires_at',
+        'next_fetch_at',
+        'next_retry_at',
+        'retries',
+        'status',
+        'unchanged_count',
+        'url'
+    ]
+
     @classmethod
     def _get_feed_subscription(
             cls,
@@ -184,22 +660,466 @@ class FeedUpdater(BaseFeedUpdater):
         return feed_subscription
 
     @classmethod
-    def _get_feed_data(cls, url: str) -> FeedParserDict:
+    def _get_postponed_error(cls, url: str) -> FeedUpdaterPostponedError:
+        """
+        Get error of a fetch postponed by host limits.
+
+        :param url: Url to RSS page.
+        :return: FeedUpdaterPostponedError instance.
+        """
+        return FeedUpdaterPostponedError(
+            _('Fetch of {} is postponed by host limits.').format(url)
+        )
+
+    @classmethod
+    def _get_response(
+            cls,
+            url: str,
+            etag: Optional[str] = None,
+            modified: Optional[str] = None
+    ) -> Union[FeedFetchResponse, FeedFetcherError]:
+        """
+        Download RSS page holding its host limiter slot. ETag and
+        Last-Modified values of the previous fetch are sent back to make the
+        request conditional.
+
+        :param url: Url to RSS page.
+        :param etag: ETag header value of the previous fetch.
+        :param modified: Last-Modified header value of the previous fetch.
+        :return: FeedFetchResponse or FeedFetcherError of RSS page download.
+        """
+        if not FeedHostLimiter.acquire([url])[0]:
+            raise cls._get_postponed_error(url)
+
+        try:
+            response, = FeedFetcher.fetch_many([
+                FeedFetchRequest(url, etag, modified)
+            ])
+        finally:
+            FeedHostLimiter.release([url])
+
+        return response
+
+    @classmethod
+    def _get_feed_data(
+            cls,
+            url: str,
+            etag: Optional[str] = None,
+            modified: Optional[str] = None,
+            parser: Optional[str] = None,
+            content_hash: Optional[str] = None
+    ) -> FeedParserDict:
         """
-        Get parsed data from RSS url.
+        Get parsed data from RSS url. ETag and Last-Modified values of the
+        previous fetch are sent back to make the request conditional.
 
         :param url: Url to RSS page.
+        :param etag: ETag header value of the previous fetch.
+        :param modified: Last-Modified header value of the previous fetch.
+        :param parser: Parser backend, FEED_PARSER setting if not set.
+        :param content_hash: Content digest of the previous fetch.
         :return: Parsed RSS data.
         """
-        feed_data = feedparser.parse(url)
+        return cls._parse_feed_data(
+            url,
+            cls._get_response(url, etag, modified),
+            parser,
+            content_hash
+        )
+
+    @classmethod
+    def _get_skip_values(cls, content: bytes, tag: str) -> List[str]:
+        """
+        Get values of skipHours or skipDays RSS elements. feedparser keeps
+        only the last nested value, so values are searched in raw content.
+
+        :param content: Raw RSS content.
+        :param tag: skipHours or skipDays.
+        :return: List of nested values.
+        """
+        match = re.search(
+            r'<{0}\b[^>]*>(.*?)</{0}>'.format(tag).encode(),
+            content,
+            re.DOTALL | re.IGNORECASE
+        )
+
+        if not match:
+            return []
+
+        return [
+            value.decode('utf-8', 'ignore').strip()
+            for value in re.findall(
+                rb'<(?:hour|day)\b[^>]*>([^<]*)<',
+                match.group(1),
+                re.IGNORECASE
+            )
+        ]
+
+    @classmethod
+    def _parse_content(
+            cls,
+            response: FeedFetchResponse,
+            parser: Optional[str] = None
+    ) -> FeedParserDict:
+        """
+        Parse downloaded RSS page with the selected parser backend. Documents
+        which are not RSS, e.g. Atom, are always parsed with feedparser.
+
+        :param response: FeedFetchResponse of RSS page download.
+        :param parser: Parser backend, FEED_PARSER setting if not set.
+        :return: Parsed RSS data.
+        """
+        parser = parser or settings.FEED_PARSER
+
+        # Empty body of 304 (Not Modified) response has nothing to stream
+        if (
+                parser == FeedSubscription.PARSER_STREAM
+                and response.status != HTTPStatus.NOT_MODIFIED
+        ):
+            try:
+                return FeedStreamParser.parse(response.content)
+            except FeedStreamParserUnsupportedError:
+                pass
+            except FeedStreamParserError:
+                # Document is RSS, but it's invalid
+                return FeedParserDict(bozo=True, entries=[], version='rss')
+
+        feed_data = feedparser.parse(
+            response.content,
+            response_headers={
+                'content-location': response.url,
+                **response.headers
+            }
+        )
+        feed_data.feed['skip_days'] = cls._get_skip_values(
+            response.content,
+            'skipDays'
+        )
+        feed_data.feed['skip_hours'] = cls._get_skip_values(
+            response.content,
+            'skipHours'
+        )
+        return feed_data
+
+    @classmethod
+    def _get_compact_data(
+            cls,
+            data: FeedParserDict,
+            keys: List[str]
+    ) -> FeedParserDict:
+        """
+        Get only the given keys of parsed data.
+
+        :param data: Parsed channel or entry data.
+        :param keys: Keys to keep.
+        :return: Parsed data with the given keys.
+        """
+        return FeedParserDict({key: data[key] for key in keys if key in data})
+
+    @classmethod
+    def _get_compact_entry(cls, entry: FeedParserDict) -> dict:
+        """
+        Get entry data with only the values FeedItemUpdater uses, which are
+        sent in update_feed_items task messages. Only the first enclosure
+        is kept and unset values are dropped. Plain dict is returned, because
+        FeedParserDict gets enclosures out of links.
+
+        :param entry: Parsed entry data.
+        :return: Compact entry data.
+        """
+        compact_entry = dict(cls._get_compact_data(entry, cls.ENTRY_KEYS))
+
+        if compact_entry.get('enclosures'):
+            compact_entry['enclosures'] = [cls._get_compact_data(
+                compact_entry['enclosures'][0],
+                cls.ENCLOSURE_KEYS
+            )]
+
+        if compact_entry.get('tags'):
+            compact_entry['tags'] = [
+                cls._get_compact_data(tag, cls.TAG_KEYS)
+                for tag in compact_entry['tags']
+            ]
+
+        return {
+            key: value
+            for key, value in compact_entry.items()
+            if value is not None and value != []
+        }
+
+    @classmethod
+    def _parse_compact_content(
+            cls,
+            response: FeedFetchResponse,
+            parser: Optional[str] = None
+    ) -> FeedParserDict:
+        """
+        Parse downloaded RSS page into a compact structure with only the
+        data persisted by FeedUpdater and FeedItemUpdater, which is cheap to
+        pass between processes.
+
+        :param response: FeedFetchResponse of RSS page download.
+        :param parser: Parser backend, FEED_PARSER setting if not set.
+        :return: Parsed RSS data.
+        """
+        feed_data = cls._parse_content(response, parser)
+        compact_data = cls._get_compact_data(
+            feed_data,
+            ['bozo', 'encoding', 'version']
+        )
+
+        try:
+            # Streamed entries are compacted one by one
+            compact_data['entries'] = [
+                cls._get_compact_entry(entry)
+                for entry in feed_data.get('entries', [])
+            ]
+        except FeedStreamParserError:
+            # Document is RSS, but it's invalid after the channel start
+            return FeedParserDict(bozo=True, entries=[], version='rss')
 
-        if feed_data.get('bozo'):
+        compact_data['feed'] = cls._get_compact_data(
+            feed_data.get('feed', FeedParserDict()),
+            cls.FEED_KEYS
+        )
+        return compact_data
+
+    @classmethod
+    def _get_fetch_failure_reason(cls, error: FeedFetcherError) -> str:
+        """
+        Get failure reason of a failed download.
+
+        :param error: FeedFetcherError of RSS page download.
+        :return: One of FeedSubscription.FAILURE_CHOICES values.
+        """
+        if isinstance(error, FeedFetcherTooLargeError):
+            return FeedSubscription.FAILURE_TOO_LARGE
+
+        if isinstance(error.__cause__, asyncio.TimeoutError):
+            return FeedSubscription.FAILURE_TIMEOUT
+
+        # Connection errors keep the original OSError
+        if isinstance(
+                getattr(error.__cause__, 'os_error', None),
+                socket.gaierror
+        ):
+            return FeedSubscription.FAILURE_DNS
+
+        return FeedSubscription.FAILURE_NETWORK
+
+    @classmethod
+    def _get_status_failure_reason(cls, status: int) -> str:
+        """
+        Get failure reason of an error HTTP status.
+
+        :param status: HTTP status code of RSS page download.
+        :return: One of FeedSubscription.FAILURE_CHOICES values.
+        """
+        if status == HTTPStatus.GONE:
+            return FeedSubscription.FAILURE_GONE
+
+        if status == HTTPStatus.NOT_FOUND:
+            return FeedSubscription.FAILURE_NOT_FOUND
+
+        if (
+                status == HTTPStatus.TOO_MANY_REQUESTS
+                or status >= HTTPStatus.INTERNAL_SERVER_ERROR
+        ):
+            return FeedSubscription.FAILURE_SERVER
+
+        return FeedSubscription.FAILURE_HTTP
+
+    @classmethod
+    def _get_failure_reason(cls, error: Exception) -> str:
+        """
+        Get failure reason of a failed update.
+
+        :param error: Exception raised by update.
+        :return: One of FeedSubscription.FAILURE_CHOICES values.
+        """
+        if isinstance(error, SoftTimeLimitExceeded):
+            return FeedSubscription.FAILURE_TIMEOUT
+
+        return getattr(error, 'reason', FeedSubscription.FAILURE_UNKNOWN)
+
+    @classmethod
+    def _get_digest(cls, response: FeedFetchResponse) -> Optional[str]:
+        """
+        Get digest of downloaded RSS page content.
+
+        :param response: FeedFetchResponse of RSS page download.
+        :return: sha256 hex digest or None for 304 (Not Modified) response.
+        """
+        # Empty body of 304 (Not Modified) response has no digest
+        if response.status == HTTPStatus.NOT_MODIFIED:
+            return
+
+        return hashlib.sha256(response.content).hexdigest()
+
+    @classmethod
+    def _is_parsed(
+            cls,
+            response: Union[FeedFetchResponse, FeedFetcherError],
+            content_hash: Optional[str] = None
+    ) -> bool:
+        """
+        Check if downloaded RSS page content has to be parsed.
+
+        :param response: FeedFetchResponse or FeedFetcherError of RSS page
+        download.
+        :param content_hash: Content digest of the previous fetch.
+        :return: Is content parsed.
+        """
+        if isinstance(response, FeedFetcherError):
+            return False
+
+        if response.status >= HTTPStatus.BAD_REQUEST:
+            return False
+
+        digest = cls._get_digest(response)
+        return bool(digest) and digest != content_hash
+
+    @classmethod
+    def _parse_feed_data(
+            cls,
+            url: str,
+            response: Union[FeedFetchResponse, FeedFetcherError],
+            parser: Optional[str] = None,
+            content_hash: Optional[str] = None,
+            parsed_data: Optional[FeedParserDict] = None
+    ) -> FeedParserDict:
+        """
+        Get parsed data from downloaded RSS page. Page which content digest
+        is equal to the one of the previous fetch is not parsed.
+
+        :param url: Url to RSS page.
+        :param response: FeedFetchResponse or FeedFetcherError of RSS page
+        download.
+        :param parser: Parser backend, FEED_PARSER setting if not set.
+        :param content_hash: Content digest of the previous fetch.
+        :param parsed_data: Content already parsed by FeedParserPool.
+        :return: Parsed RSS data.
+        """
+        message = _('Failed to load a valid RSS from {}.').format(url)
+
+        if isinstance(response, FeedFetcherError):
+            raise FeedUpdaterInvalidRSSError(
+                message,
+                cls._get_fetch_failure_reason(response)
+            ) from response
+
+        if response.status >= HTTPStatus.BAD_REQUEST:
             raise FeedUpdaterInvalidRSSError(
-                _('Failed to load a valid RSS from {}.').format(url)
+                message,
+                cls._get_status_failure_reason(response.status)
+            )
+
+        digest = cls._get_digest(response)
+
+        if digest and digest == content_hash:
+            feed_data = FeedParserDict(is_unchanged=True)
+        elif parsed_data is not None:
+            feed_data = parsed_data
+        else:
+            feed_data = cls._parse_compact_content(response, parser)
+
+        if digest:
+            feed_data['content_hash'] = digest
+
+        feed_data['href'] = response.url
+        feed_data['status'] = response.status
+
+        if response.headers.get('etag'):
+            feed_data['etag'] = response.headers['etag']
+
+        if response.headers.get('last-modified'):
+            feed_data['modified'] = response.headers['last-modified']
+
+        if response.redirect_url:
+            feed_data['redirect_url'] = response.redirect_url
+
+        # Parsed content without a recognised feed version is not a feed
+        is_not_feed = digest and not feed_data.get('version', True)
+
+        if feed_data.get('bozo') or is_not_feed:
+            raise FeedUpdaterInvalidRSSError(
+                message,
+                FeedSubscription.FAILURE_PARSE
+                if feed_data.get('version')
+                else FeedSubscription.FAILURE_NOT_FEED
             )
 
         return feed_data
 
+    @classmethod
+    def _is_not_modified(cls, feed_data: FeedParserDict) -> bool:
+        """
+        Check if server responded that RSS didn't change since the previous
+        fetch or responded with the same content.
+
+        :param feed_data: Parsed RSS data.
+        :return: Is RSS not modified.
+        """
+        return (
+            feed_data.get('status') == HTTPStatus.NOT_MODIFIED
+            or feed_data.get('is_unchanged', False)
+        )
+
+    @classmethod
+    def _update_validators(
+            cls,
+            feed_subscription: FeedSubscription,
+            feed_data: FeedParserDict
+    ) -> None:
+        """
+        Set ETag, Last-Modified and content digest values to
+        FeedSubscription to use them for the next fetch. Values are kept if
+        server didn't send new ones.
+
+        :param feed_subscription: FeedSubscription instance to update.
+        :param feed_data: Parsed RSS data.
+        """
+        feed_subscription.content_hash = feed_data.get(
+            'content_hash',
+            feed_subscription.content_hash
+        )
+        feed_subscription.etag = feed_data.get(
+            'etag',
+            feed_subscription.etag
+        )
+        feed_subscription.last_modified = feed_data.get(
+            'modified',
+            feed_subscription.last_modified
+        )
+
+    @classmethod
+    def _update_url(
+            cls,
+            feed_subscription: FeedSubscription,
+            feed_data: FeedParserDict
+    ) -> None:
+        """
+        Set the final url of a permanent redirect to FeedSubscription unless
+        the owner is already subscribed to it.
+
+        :param feed_subscription: FeedSubscription instance to update.
+        :param feed_data: Parsed RSS data.
+        """
+        url = feed_data.get('redirect_url')
+
+        if not url or url == feed_subscription.url:
+            return
+
+        is_subscribed = (
+            FeedSubscription
+            .objects
+            .filter(owner_id=feed_subscription.owner_id, url=url)
+            .exists()
+        )
+
+        if not is_subscribed:
+            feed_subscription.url = url
+
     @classmethod
     def _update_categories(cls, feed: Feed, feed_data: FeedParserDict) -> None:
         """
@@ -208,16 +1128,11 @@ class FeedUpdater(BaseFeedUpdater):
         :param feed: Feed instance to assign categories.
         :param feed_data: FeedParserDict that may include categories.
         """
-        feed.categories.all().delete()
-        categories = feed_data.feed.get('tags', [])
-
-        for category in categories:
-            FeedCategory.objects.create(
-                domain=category.get('scheme'),
-                feed=feed,
-                keyword=category.get('term'),
-                label=category.get('label')
-            )
+        cls._sync_categories(
+            FeedCategory,
+            'feed',
+            {feed.id: cls.get_categories(feed_data.feed)}
+        )
 
     @classmethod
     def _update_feed(
@@ -258,6 +1173,12 @@ class FeedUpdater(BaseFeedUpdater):
             'link': feed_data.feed.get('link'),
             'managing_editor': feed_data.feed.get('author'),
             'pub_date': cls.get_pub_date(feed_data.feed),
+            'skip_days': (
+                ','.join(feed_data.feed.get('skip_days', [])) or None
+            ),
+            'skip_hours': (
+                ','.join(feed_data.feed.get('skip_hours', [])) or None
+            ),
             'subscription': feed_subscription,
             'text_input_description': text_input.get('description'),
             'text_input_link': text_input.get('link'),
@@ -283,25 +1204,387 @@ class FeedUpdater(BaseFeedUpdater):
         return feed
 
     @classmethod
-    def update(cls, feed_subscription_id: int) -> Tuple[Feed, FeedParserDict]:
+    def _update_schedule(
+            cls,
+            feed_subscription: FeedSubscription,
+            feed_data: FeedParserDict
+    ) -> None:
+        """
+        Set the next fetch time to FeedSubscription based on feed hints and
+        publish cadence of fetched items.
+
+        :param feed_subscription: FeedSubscription instance to update.
+        :param feed_data: Parsed RSS data.
+        """
+        try:
+            feed = feed_subscription.feed
+        except FeedSubscription.feed.RelatedObjectDoesNotExist:
+            feed = None
+
+        interval = FeedScheduler.get_interval(
+            feed,
+            map(cls.get_pub_date, feed_data.get('entries', [])),
+            feed_subscription.fetch_interval,
+            not cls._is_not_modified(feed_data)
+        )
+        feed_subscription.fetch_interval = interval
+        feed_subscription.next_fetch_at = FeedScheduler.get_next_fetch_at(
+            feed,
+            interval
+        )
+
+    @classmethod
+    def _save(
+            cls,
+            feed_subscription: FeedSubscription,
+            feed_data: FeedParserDict,
+            commit: bool = True
+    ) -> Tuple[Optional[Feed], FeedParserDict]:
+        """
+        Create/update Feed and related instances of FeedCategory based on
+        parsed data and mark FeedSubscription as successfully updated.
+
+        :param feed_subscription: FeedSubscription related instance.
+        :param feed_data: Parsed RSS data.
+        :param commit: Save FeedSubscription changes to db.
+        :return: Tuple with Feed instance and parsed RSS items data or None
+        and empty data if RSS is not modified.
+        """
+        cls._update_validators(feed_subscription, feed_data)
+        cls._update_url(feed_subscription, feed_data)
+        # Subscription is leased, so counters are not changed concurrently
+        feed_subscription.fetch_count += 1
+
+        if feed_data.get('is_unchanged'):
+            feed_subscription.unchanged_count += 1
+
+        if cls._is_not_modified(feed_data):
+            cls._update_schedule(feed_subscription, feed_data)
+            feed_subscription.success(commit)
+            return None, FeedParserDict()
+
+        feed = cls._update_feed(feed_subscription, feed_data)
+        cls._update_categories(feed, feed_data)
+        cls._update_schedule(feed_subscription, feed_data)
+        feed_subscription.success(commit)
+        return feed, feed_data.get('entries', FeedParserDict())
+
+    @classmethod
+    def update(
+            cls,
+            feed_subscription_id: int
+    ) -> Tuple[Optional[Feed], FeedParserDict]:
         """
         Parse feed from RSS page, create/update Feed and related instances of
-        FeedCategory.
+        FeedCategory. Only the persist step runs in a transaction, download
+        and parsing don't hold it open. If RSS is not modified since the
+        previous fetch nothing is updated. If the host limits are reached
+        the update is postponed and FeedUpdaterPostponedError is raised.
 
         :param feed_subscription_id: FeedSubscription id to update RSS.
-        :return: Tuple with Feed instance and parsed RSS data.
+        :return: Tuple with Feed instance and parsed RSS items data or None
+        and empty data if RSS is not modified.
         """
         feed_subscription = cls._get_feed_subscription(feed_subscription_id)
         feed_subscription.in_progress()
 
         try:
+            # Download and parse without holding a transaction open
+            response = cls._get_response(
+                feed_subscription.url,
+                feed_subscription.etag,
+                feed_subscription.last_modified
+            )
+            # Saved with the rest of FeedSubscription changes
+            feed_subscription.bytes_transferred += response.size
+            FeedArchive.archive([(feed_subscription, response)])
+            feed_data = cls._parse_feed_data(
+                feed_subscription.url,
+                response,
+                feed_subscription.get_parser(),
+                feed_subscription.content_hash
+            )
+
             with transaction.atomic():
-                feed_data = cls._get_feed_data(feed_subscription.url)
-                feed = cls._update_feed(feed_subscription, feed_data)
-                cls._update_categories(feed, feed_data)
-                feed_subscription.success()
+                return cls._save(feed_subscription, feed_data)
+        except FeedUpdaterPostponedError as e:
+            feed_subscription.postpone()
+            raise e
         except Exception as e:
-            feed_subscription.failure()
+            feed_subscription.failure(cls._get_failure_reason(e))
             raise e
 
+    @classmethod
+    def reingest(
+            cls,
+            feed_payload_id: int
+    ) -> Tuple[Feed, FeedParserDict]:
+        """
+        Parse archived RSS page again and create/update Feed and related
+        instances of FeedCategory, e.g. after a parsing fix. The page is
+        not fetched and FeedSubscription schedule and validators are not
+        changed.
+
+        :param feed_payload_id: FeedPayload id of the archived fetch.
+        :return: Tuple with Feed instance and parsed RSS items data.
+        """
+        try:
+            feed_payload = (
+                FeedPayload
+                .objects
+                .select_related('subscription')
+                .get(id=feed_payload_id)
+            )
+        except FeedPayload.DoesNotExist:
+            raise FeedUpdaterDoesntExistError(
+                _('FeedPayload with id={} does not exist.')
+                .format(feed_payload_id)
+            )
+
+        feed_subscription = feed_payload.subscription
+        feed_data = cls._parse_feed_data(
+            feed_payload.url,
+            FeedArchive.get_response(feed_payload),
+            feed_subscription.get_parser()
+        )
+
+        with transaction.atomic():
+            feed = cls._update_feed(feed_subscription, feed_data)
+            cls._update_categories(feed, feed_data)
+
         return feed, feed_data.get('entries', FeedParserDict())
+
+    @classmethod
+    def _fetch_many(
+            cls,
+            feed_subscriptions: List[FeedSubscription]
+    ) -> List[Union[FeedFetchResponse, FeedFetcherError]]:
+        """
+        Download RSS pages of FeedSubscription objects concurrently holding
+        their host limiter slots.
+
+        :param feed_subscriptions: List of FeedSubscription to download.
+        :return: List of FeedFetchResponse or FeedFetcherError in the order
+        of feed_subscriptions.
+        """
+        try:
+            return FeedFetcher.fetch_many(
+                FeedFetchRequest(
+                    feed_subscription.url,
+                    feed_subscription.etag,
+                    feed_subscription.last_modified
+                )
+                for feed_subscription in feed_subscriptions
+            )
+        finally:
+            FeedHostLimiter.release(
+                feed_subscription.url
+                for feed_subscription in feed_subscriptions
+            )
+
+    @classmethod
+    def _parse_many(
+            cls,
+            feed_subscriptions: List[FeedSubscription],
+            responses: List[Union[FeedFetchResponse, FeedFetcherError]]
+    ) -> Dict[int, FeedParserDict]:
+        """
+        Parse downloaded RSS pages of FeedSubscription objects in
+        FeedParserPool. Failed downloads and pages which content is equal to
+        the one of the previous fetch are not parsed.
+
+        :param feed_subscriptions: List of downloaded FeedSubscription.
+        :param responses: List of FeedFetchResponse or FeedFetcherError in
+        the order of feed_subscriptions.
+        :return: Dict in feed_subscription_id:parsed RSS data format.
+        """
+        parsed = [
+            (feed_subscription, response)
+            for feed_subscription, response
+            in zip(feed_subscriptions, responses)
+            if cls._is_parsed(response, feed_subscription.content_hash)
+        ]
+        feeds_data = FeedParserPool.map(
+            cls._parse_compact_content,
+            [response for _, response in parsed],
+            [feed_subscription.get_parser() for feed_subscription, _ in parsed]
+        )
+        # Pages which parsing failed are parsed again one by one to fail
+        # only their own updates
+        return {
+            feed_subscription.id: feed_data
+            for (feed_subscription, _), feed_data in zip(parsed, feeds_data)
+            if not isinstance(feed_data, Exception)
+        }
+
+    @classmethod
+    def update_many(
+            cls,
+            feed_subscription_ids: Iterable[int]
+    ) -> Dict[int, Union[Tuple[Optional[Feed], FeedParserDict], Exception]]:
+        """
+        Download RSS pages of multiple FeedSubscription objects concurrently,
+        parse them in FeedParserPool and create/update their Feed and
+        FeedCategory objects one by one.
+        FeedSubscription status changes are written with set-based queries
+        for the whole batch. Updates over the host limits are postponed.
+        If task soft time limit is exceeded, unfinished updates are released
+        as timed out failures.
+
+        :param feed_subscription_ids: FeedSubscription ids to update RSS.
+        :return: Dict in feed_subscription_id:result format where result is
+        the same as update() returns or an exception if update failed or
+        was postponed.
+        """
+        feed_subscriptions = list(
+            FeedSubscription
+            .objects
+            .prefetch_related('feed')
+            .filter(id__in=feed_subscription_ids)
+        )
+        FeedSubscription.objects.filter(
+            id__in=[
+                feed_subscription.id
+                for feed_subscription in feed_subscriptions
+            ]
+        ).in_progress()
+        acquired = FeedHostLimiter.acquire(
+            feed_subscription.url
+            for feed_subscription in feed_subscriptions
+        )
+        postponed = [
+            feed_subscription
+            for feed_subscription, is_acquired
+            in zip(feed_subscriptions, acquired)
+            if not is_acquired
+        ]
+        feed_subscriptions = [
+            feed_subscription
+            for feed_subscription, is_acquired
+            in zip(feed_subscriptions, acquired)
+            if is_acquired
+        ]
+
+        succeeded = []
+        failed_ids_by_reason = {}
+        results = {
+            feed_subscription.id: cls._get_postponed_error(
+                feed_subscription.url
+            )
+            for feed_subscription in postponed
+        }
+
+        try:
+            responses = cls._fetch_many(feed_subscriptions)
+            FeedSubscription.objects.add_bytes_transferred({
+                feed_subscription.id: response.size
+                for feed_subscription, response
+                in zip(feed_subscriptions, responses)
+            })
+            FeedArchive.archive(zip(feed_subscriptions, responses))
+
+            parsed_data = cls._parse_many(feed_subscriptions, responses)
+
+            for feed_subscription, response in zip(
+                    feed_subscriptions,
+                    responses
+            ):
+                try:
+                    feed_data = cls._parse_feed_data(
+                        feed_subscription.url,
+                        response,
+                        feed_subscription.get_parser(),
+                        feed_subscription.content_hash,
+                        parsed_data.get(feed_subscription.id)
+                    )
+
+                    with transaction.atomic():
+                        result = cls._save(
+                            feed_subscription,
+                            feed_data,
+                            False
+                        )
+
+                    succeeded.append(feed_subscription)
+                except SoftTimeLimitExceeded:
+                    raise
+                except Exception as e:
+                    failed_ids_by_reason.setdefault(
+                        cls._get_failure_reason(e),
+                        []
+                    ).append(feed_subscription.id)
+                    result = e
+
+                results[feed_subscription.id] = result
+        except Exception as e:
+            # Release subscriptions which update is not finished in time or
+            # which batch step, e.g. archiving, failed
+            unfinished_ids = [
+                feed_subscription.id
+                for feed_subscription in feed_subscriptions
+                if feed_subscription.id not in results
+            ]
+            failed_ids_by_reason.setdefault(
+                cls._get_failure_reason(e),
+                []
+            ).extend(unfinished_ids)
+            results.update({
+                feed_subscription_id: e
+                for feed_subscription_id in unfinished_ids
+            })
+
+        cls._save_many(succeeded, failed_ids_by_reason, postponed, results)
+        return results
+
+    @classmethod
+    def _save_many(
+            cls,
+            succeeded: List[FeedSubscription],
+            failed_ids_by_reason: Dict[str, List[int]],
+            postponed: List[FeedSubscription],
+            results: Dict[int, Union[Tuple, Exception]]
+    ) -> None:
+        """
+        Write status changes of a batch of FeedSubscription objects. If the
+        batch write of successful updates fails, e.g. on a url conflict
+        after a redirect, they are saved one by one and the ones which
+        can't be saved are released as failures, so none of them stays in
+        progress.
+
+        :param succeeded: List of successfully updated FeedSubscription.
+        :param failed_ids_by_reason: Dict in failure reason:list of
+        FeedSubscription ids format, changed in place.
+        :param postponed: List of postponed FeedSubscription.
+        :param results: Dict of update_many results, changed in place.
+        """
+        try:
+            with transaction.atomic():
+                FeedSubscription.objects.bulk_update(
+                    succeeded,
+                    cls.SUBSCRIPTION_FIELDS
+                )
+        except DatabaseError:
+            for feed_subscription in succeeded:
+                try:
+                    with transaction.atomic():
+                        FeedSubscription.objects.bulk_update(
+                            [feed_subscription],
+                            cls.SUBSCRIPTION_FIELDS
+                        )
+                except DatabaseError as e:
+                    failed_ids_by_reason.setdefault(
+                        cls._get_failure_reason(e),
+                        []
+                    ).append(feed_subscription.id)
+                    results[feed_subscription.id] = e
+
+        with transaction.atomic():
+            for reason, ids in failed_ids_by_reason.items():
+                FeedSubscription.objects.filter(id__in=ids).failure(reason)
+
+            FeedSubscription.objects.filter(
+                id__in=[
+                    feed_subscription.id
+                    for feed_subscription in postponed
+                ]
+            ).postpone()
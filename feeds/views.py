@@ -15,7 +15,8 @@ from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
 from feeds.mixins import FeedSubscriptionViewMixin
-from feeds.models import Feed, FeedItem, FeedSubscription
+from feeds.models import Feed, FeedCounter, FeedItem, FeedSubscription
+from feeds.pagination import FeedItemCursorPagination
 from feeds.permissions import (
     FeedItemPermission,
     FeedPermission,
@@ -25,7 +26,8 @@ from feeds.serializers import (
     FeedItemSerializer,
     FeedSerializer,
     FeedSubscriptionEmptySerializer,
-    FeedSubscriptionSerializer
+    FeedSubscriptionSerializer,
+    FeedSummarySerializer
 )
 from feeds.tasks import update_feed
 
@@ -61,7 +63,7 @@ class FeedSubscriptionRetryView(FeedSubscriptionViewMixin, UpdateAPIView):
     ) -> Response:
         """
         Update FeedSubscription to start update attempts after it has been
-        stopped.
+        stopped. Update is forced unless it's already running.
 
         :param request: Request with contextual information.
         :param args: Arguments.
@@ -73,10 +75,22 @@ class FeedSubscriptionRetryView(FeedSubscriptionViewMixin, UpdateAPIView):
         if not feed_subscription.is_stopped:
             raise Http404
 
-        # Reset is_stopped and retries values.
-        feed_subscription.success()
+        feed_subscriptions = FeedSubscription.objects.filter(
+            id=feed_subscription.id
+        )
+        claimed_ids = feed_subscriptions.claimable().claim()
+        # Reset is_stopped and retries values, status and lease are kept
+        feed_subscriptions.update(
+            failure_reason=None,
+            is_stopped=False,
+            next_retry_at=None,
+            retries=0
+        )
+
         # Force update
-        update_feed.delay(feed_subscription.id)
+        if claimed_ids:
+            update_feed.delay(feed_subscription.id)
+
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -100,7 +114,7 @@ class FeedSubscriptionForceUpdateView(
             **kwargs: Dict
     ) -> Response:
         """
-        Force async update of FeedSubscription.
+        Force async update of FeedSubscription unless it's already running.
 
         :param request: Request with contextual information.
         :param args: Arguments.
@@ -108,8 +122,18 @@ class FeedSubscriptionForceUpdateView(
         :return: Response with 204 (No Content) status.
         """
         feed_subscription = self.get_object()
+        claimed_ids = (
+            FeedSubscription
+            .objects
+            .filter(id=feed_subscription.id)
+            .claimable()
+            .claim()
+        )
+
         # Force update
-        update_feed.delay(feed_subscription.id)
+        if claimed_ids:
+            update_feed.delay(feed_subscription.id)
+
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -139,6 +163,35 @@ class FeedViewSet(
             .filter(subscription__owner=self.request.user)
         )
 
+    @swagger_auto_schema(
+        'get',
+        operation_description='Get numbers of feeds, feed items and unread '
+                              'feed items of current user.',
+        responses={status.HTTP_200_OK: FeedSummarySerializer}
+    )
+    @action(detail=False, methods=['get'], pagination_class=None)
+    def summary(
+            self,
+            request: Request,
+            *args: Tuple,
+            **kwargs: Dict
+    ) -> Response:
+        """
+        Get FeedCounter of current user. Counters are maintained with the
+        counters of Feed, so neither Feed nor FeedItem rows are counted.
+
+        :param request: Request with contextual information.
+        :param args: Arguments.
+        :param kwargs: Keyword arguments.
+        :return: Response with FeedSummarySerializer data.
+        """
+        # User without feeds has no FeedCounter yet
+        feed_counter = (
+            FeedCounter.objects.filter(owner=request.user).first()
+            or FeedCounter()
+        )
+        return Response(FeedSummarySerializer(feed_counter).data)
+
 
 @method_decorator(
     name='list',
@@ -150,6 +203,13 @@ class FeedViewSet(
                 description='(optional) Order feeds by created, pub_date '
                             'or updated.',
                 type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'count',
+                openapi.IN_QUERY,
+                description='(optional) Return total count of feed items '
+                            'if true.',
+                type=openapi.TYPE_BOOLEAN
             )
         ]
     )
@@ -163,6 +223,7 @@ class FeedItemViewSet(
     filterset_fields = ['feed', 'is_read']
     http_method_names = ['get', 'head', 'patch']
     ordering_fields = ['created', 'pub_date', 'updated']
+    pagination_class = FeedItemCursorPagination
     permission_classes = [FeedItemPermission]
     serializer_class = FeedItemSerializer
 
@@ -180,7 +241,7 @@ class FeedItemViewSet(
             FeedItem
             .objects
             .prefetch_related('categories')
-            .filter(feed__subscription__owner=self.request.user)
+            .filter(owner=self.request.user)
         )
 
     @swagger_auto_schema(
@@ -205,9 +266,7 @@ class FeedItemViewSet(
         """
         feed_item = self.get_object()
 
-        if feed_item.is_read:
+        if not feed_item.mark_read():
             raise Http404
 
-        feed_item.is_read = True
-        feed_item.save()
         return Response(status=status.HTTP_204_NO_CONTENT)
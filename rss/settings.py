@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.1/ref/settings/
 """
 
+import os
+from datetime import timedelta
 from pathlib import Path
 
 from celery.schedules import crontab
@@ -167,7 +169,11 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_BEAT_SCHEDULE = {
     'update_feeds': {
         'task': 'feeds.tasks.update_feeds',
-        'schedule': crontab('*/10'),  # execute every 10 minutes
+        'schedule': crontab(),  # execute every minute
+    },
+    'prune_feed_archive': {
+        'task': 'feeds.tasks.prune_feed_archive',
+        'schedule': crontab(hour=3, minute=0),  # execute daily
     },
 }
 
@@ -176,6 +182,44 @@ CELERY_BEAT_SCHEDULE = {
 
 MAX_RETRIES = 5
 
+FEED_ARCHIVE_COMPRESS_LEVEL = 6  # zlib level of archived bodies
+FEED_ARCHIVE_DIR = None  # directory of archived fetched bodies, off if not set
+FEED_ARCHIVE_RETENTION = timedelta(days=30)
+
+FEED_FETCH_CONCURRENCY = 100  # max open connections of a worker process
+FEED_FETCH_CONCURRENCY_PER_HOST = 4  # max open connections to a single host
+FEED_FETCH_CONNECT_TIMEOUT = 10  # seconds
+FEED_FETCH_DNS_CACHE_TTL = 300  # seconds
+FEED_FETCH_HOST_CONCURRENCY = 8  # max concurrent requests to a single host from all workers
+FEED_FETCH_HOST_LIMITER_URL = 'redis://redis:6379/1'
+FEED_FETCH_HOST_POSTPONE = timedelta(minutes=1)  # delay of fetches over host limits
+FEED_FETCH_HOST_RATE = 60  # max requests to a single host per period
+FEED_FETCH_HOST_RATE_PERIOD = 60  # seconds
+FEED_FETCH_KEEPALIVE_TIMEOUT = 15  # seconds
+FEED_FETCH_MAX_SIZE = 20 * 1024 * 1024  # max bytes of a decoded feed body
+FEED_FETCH_READ_TIMEOUT = 30  # seconds between received chunks
+FEED_FETCH_TOTAL_TIMEOUT = 60  # seconds of a single request
+FEED_FETCH_USER_AGENT = 'rss/1.0 (+https://github.com/stalavitski/sendcloud-test)'
+
+FEED_ITEMS_COMPRESS_SIZE = 64 * 1024  # min bytes of a compressed update_feed_items message
+
+FEED_PARSER = 'feedparser'  # default parser backend: feedparser or stream
+FEED_PARSE_PROCESSES = os.cpu_count()  # parser processes of non-daemonic callers, 0 parses in caller
+
+FEED_UPDATE_BACKOFF_FACTOR = 1.5  # interval growth for not modified feeds
+FEED_UPDATE_BATCH_SIZE = 50  # subscriptions updated by a single task
+FEED_UPDATE_CADENCE_FACTOR = 0.5  # part of publish cadence between fetches
+FEED_UPDATE_HARD_TIME_LIMIT = 300  # seconds before feed task is killed
+FEED_UPDATE_LEASE = timedelta(minutes=15)  # claimed subscription timeout, longer than hard time limit
+FEED_UPDATE_MAX_INTERVAL = timedelta(days=1)
+FEED_UPDATE_MAX_PARSE_FAILURES = 3  # consecutive parse errors that stop a subscription
+FEED_UPDATE_MIN_INTERVAL = timedelta(minutes=10)
+FEED_UPDATE_RETRY_BASE = timedelta(minutes=10)  # delay after the first failure
+FEED_UPDATE_RETRY_JITTER = 0.2  # part of retry delay randomised in both directions
+FEED_UPDATE_RETRY_MAX = timedelta(hours=12)
+FEED_UPDATE_RETRY_PROBE_INTERVAL = timedelta(days=1)  # retry delay of stopped subscriptions
+FEED_UPDATE_SOFT_TIME_LIMIT = 240  # seconds before feed task is asked to stop
+
 
 # drf-yasg (API Specification)
 